@@ -0,0 +1,339 @@
+"""
+회원탈퇴 데이터 정리 (집합 단위 삭제)
+
+사용자가 남긴 데이터를 행마다 지우지 않고 테이블마다
+DELETE ... WHERE ... IN (SELECT ...) 한 번으로 지운다. 자식 테이블부터 부모 순서로 지우므로
+FK 가 걸린 DB 에서도 순서 때문에 실패하지 않는다.
+
+지우는 범위:
+- 본인 알림/가능 시간/개인 일정/수강 정보
+- 본인이 만든 팀 모집글과 그 참여자/팀 가능 시간 제출 기록, 본인이 참여한 팀 (인원 수 다시 계산)
+- 본인이 작성한 게시글과 그 댓글/좋아요/투표(선택지, 표 포함), 첨부파일
+- 본인이 작성한 댓글과 그 답글, 그 댓글들에 달린 좋아요
+- 본인이 누른 좋아요/댓글 좋아요/투표
+
+작성한 글과 댓글이 ACCOUNT_DELETE_ASYNC_THRESHOLD 개를 넘는 계정은 요청 안에서 지우지 않는다.
+로그인할 수 없도록 비밀번호 해시를 DELETING_PASSWORD_HASH 로 바꾸고
+리프레시 토큰을 모두 폐기(token_service.revoke_user_tokens)해서 commit 한 뒤,
+워커의 백그라운드 스레드가 ACCOUNT_DELETE_BATCH_SIZE 행씩 나눠 지우고 배치마다 commit 한다.
+(긴 트랜잭션 하나로 테이블 잠금을 오래 잡지 않도록)
+서버가 중간에 재시작되면 기동할 때 표시가 남아 있는 계정의 삭제를 이어서 한다.
+삭제 중인 계정('!' 로 시작하는 해시)은 토큰 갱신과 알림 디스패치 대상에서 빠진다.
+각 배치는 여러 워커가 같은 계정을 동시에 처리해도 결과가 같다.
+
+- ACCOUNT_DELETE_ASYNC_THRESHOLD: 백그라운드로 넘길 작성 글/댓글 수 (기본 1000, 0 이면 항상 요청 안에서 삭제)
+- ACCOUNT_DELETE_BATCH_SIZE: 백그라운드 삭제 시 한 번에 지울 행 수 (기본 500)
+"""
+import logging
+import os
+import queue
+import threading
+
+from sqlalchemy import delete, func, or_, select, union, update
+
+from attachments import attachment_filenames, remove_attachments
+from extensions import db
+from models import (
+    AvailableTime,
+    CourseBoardComment,
+    CourseBoardCommentLike,
+    CourseBoardLike,
+    CourseBoardPost,
+    Enrollment,
+    Notification,
+    Poll,
+    PollOption,
+    PollVote,
+    Schedule,
+    TeamAvailabilitySubmission,
+    TeamRecruitment,
+    TeamRecruitmentMember,
+    User,
+)
+from poll_service import invalidate_tallies
+from resource_version import bump_versions, USERS_KEY
+from token_service import revoke_user_tokens
+from user_cache import invalidate_user
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드 삭제 중인 계정 표시: '!' 로 시작하므로 로그인/비밀번호 재설정/토큰 갱신이 모두 거절된다
+# (password_service.is_unusable_hash). 재설정으로 덮어쓰이면 재시작 후 삭제를 이어갈 수 없다.
+DELETING_PASSWORD_HASH = "!deleting"
+
+_jobs = queue.Queue()
+_worker_thread = None
+_worker_lock = threading.Lock()
+
+
+def _steps(user_id):
+    """(모델, 삭제 조건, 훅) 목록, 자식 테이블부터
+
+    훅: (종류, 지우기 전에 읽을 값 쿼리, 지운 뒤 읽은 값으로 실행할 함수)
+    """
+    my_posts = select(CourseBoardPost.id).where(CourseBoardPost.author_id == user_id)
+    my_recruits = select(TeamRecruitment.id).where(TeamRecruitment.author_id == user_id)
+    my_polls = select(Poll.id).where(Poll.post_id.in_(my_posts))
+    my_comments = select(CourseBoardComment.id).where(CourseBoardComment.author_id == user_id)
+    # 지워질 댓글: 본인 댓글, 본인 글에 달린 댓글, 본인 댓글에 달린 답글
+    doomed_comments = select(CourseBoardComment.id).where(
+        or_(
+            CourseBoardComment.author_id == user_id,
+            CourseBoardComment.post_id.in_(my_posts),
+            CourseBoardComment.parent_comment_id.in_(my_comments),
+        )
+    )
+
+    def leave_teams(selector):
+        # 다른 사람 팀에서 빠지는 것이므로 인원 수는 남은 참여자 수로 다시 계산한다
+        # (감소 대신 재계산이라 같은 배치가 두 번 실행돼도 결과가 같다)
+        return select(TeamRecruitmentMember.recruitment_id).where(
+            selector, TeamRecruitmentMember.user_id == user_id
+        )
+
+    def recount_members(recruitment_ids):
+        if not recruitment_ids:
+            return
+        member_count = (
+            select(func.count(TeamRecruitmentMember.id))
+            .where(TeamRecruitmentMember.recruitment_id == TeamRecruitment.id)
+            .scalar_subquery()
+        )
+        db.session.execute(
+            update(TeamRecruitment)
+            .where(TeamRecruitment.id.in_(recruitment_ids))
+            .values(member_count=member_count)
+            .execution_options(synchronize_session=False)
+        )
+
+    def voted_polls(selector):
+        return select(PollVote.poll_id).where(selector).distinct()
+
+    def post_files(selector):
+        return select(CourseBoardPost.files).where(selector, CourseBoardPost.files.isnot(None))
+
+    return [
+        (Notification, Notification.user_id == user_id, None),
+        (AvailableTime, or_(AvailableTime.user_id == user_id, AvailableTime.team_id.in_(my_recruits)), None),
+        (Schedule, Schedule.user_id == user_id, None),
+        (Enrollment, Enrollment.student_id == user_id, None),
+        (
+            TeamAvailabilitySubmission,
+            or_(TeamAvailabilitySubmission.user_id == user_id, TeamAvailabilitySubmission.team_id.in_(my_recruits)),
+            None,
+        ),
+        (
+            TeamRecruitmentMember,
+            or_(TeamRecruitmentMember.user_id == user_id, TeamRecruitmentMember.recruitment_id.in_(my_recruits)),
+            ("recount", leave_teams, recount_members),
+        ),
+        (TeamRecruitment, TeamRecruitment.author_id == user_id, None),
+        (
+            PollVote,
+            or_(PollVote.user_id == user_id, PollVote.poll_id.in_(my_polls)),
+            ("polls", voted_polls, None),
+        ),
+        (PollOption, PollOption.poll_id.in_(my_polls), None),
+        (Poll, Poll.post_id.in_(my_posts), ("polls", lambda selector: select(Poll.id).where(selector), None)),
+        (
+            CourseBoardCommentLike,
+            or_(CourseBoardCommentLike.user_id == user_id, CourseBoardCommentLike.comment_id.in_(doomed_comments)),
+            None,
+        ),
+        (CourseBoardLike, or_(CourseBoardLike.user_id == user_id, CourseBoardLike.post_id.in_(my_posts)), None),
+        # 답글을 부모 댓글보다 먼저 지운다 (부모가 먼저 지워지면 답글을 찾을 수 없으므로)
+        (CourseBoardComment, CourseBoardComment.parent_comment_id.in_(my_comments), None),
+        (CourseBoardComment, or_(CourseBoardComment.author_id == user_id, CourseBoardComment.post_id.in_(my_posts)), None),
+        (CourseBoardPost, CourseBoardPost.author_id == user_id, ("files", post_files, None)),
+    ]
+
+
+class _Cleanup:
+    """삭제 중에 모은 후처리 대상 (commit 후에 실행)"""
+
+    def __init__(self):
+        self.poll_ids = set()
+        self.filenames = []
+        self.removed_files = 0
+
+    def collect(self, kind, rows):
+        if kind == "polls":
+            self.poll_ids.update(rows)
+        elif kind == "files":
+            for files_json in rows:
+                self.filenames.extend(attachment_filenames(files_json))
+
+    def run(self):
+        for poll_id in self.poll_ids:
+            invalidate_tallies(poll_id)
+        self.removed_files += remove_attachments(self.filenames)
+        self.poll_ids.clear()
+        self.filenames = []
+
+
+def _delete_step(model, condition, hook, cleanup, batch_size=None):
+    """조건에 맞는 행 삭제 (batch_size 가 있으면 나눠서 지우고 배치마다 commit)"""
+    total = 0
+    while True:
+        if batch_size:
+            # 최근 행부터: 답글(큰 id)이 부모 댓글보다 먼저 지워진다
+            ids = db.session.scalars(
+                select(model.id).where(condition).order_by(model.id.desc()).limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            selector = model.id.in_(ids)
+        else:
+            selector = condition
+
+        after = None
+        if hook is not None:
+            kind, query, after = hook
+            rows = db.session.scalars(query(selector)).all()
+            if kind != "recount":
+                cleanup.collect(kind, rows)
+
+        deleted = db.session.execute(
+            delete(model).where(selector).execution_options(synchronize_session=False)
+        ).rowcount
+        if after is not None:
+            after(set(rows))
+        total += deleted
+
+        if not batch_size:
+            break
+        db.session.commit()
+        cleanup.run()
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+def _version_keys(user_id):
+    """삭제로 바뀌는 목록의 버전 키 (게시판/팀 모집 목록의 ETag 갱신용)"""
+    keys = [USERS_KEY, f"notifications:{user_id}"]
+
+    touched_posts = union(
+        select(CourseBoardComment.post_id).where(CourseBoardComment.author_id == user_id),
+        select(CourseBoardLike.post_id).where(CourseBoardLike.user_id == user_id),
+        select(Poll.post_id).join(PollVote, PollVote.poll_id == Poll.id).where(PollVote.user_id == user_id),
+    )
+    posts = db.session.execute(
+        select(CourseBoardPost.id, CourseBoardPost.course_id).where(
+            or_(CourseBoardPost.author_id == user_id, CourseBoardPost.id.in_(touched_posts))
+        )
+    ).all()
+    keys.extend({f"board:{course_id}" for _, course_id in posts})
+    keys.extend(f"post:{post_id}" for post_id, _ in posts)
+
+    teams = db.session.execute(
+        select(TeamRecruitment.id, TeamRecruitment.course_id).where(
+            or_(
+                TeamRecruitment.author_id == user_id,
+                TeamRecruitment.id.in_(
+                    select(TeamRecruitmentMember.recruitment_id).where(TeamRecruitmentMember.user_id == user_id)
+                ),
+            )
+        )
+    ).all()
+    keys.extend({f"recruit:{course_id}" for _, course_id in teams})
+    keys.extend(f"team:{team_id}" for team_id, _ in teams)
+    return keys
+
+
+def content_count(user_id):
+    """작성한 글 + 댓글 수 (백그라운드 삭제 여부 판단용, 쿼리 1번)"""
+    return db.session.execute(
+        select(
+            select(func.count(CourseBoardPost.id)).where(CourseBoardPost.author_id == user_id).scalar_subquery()
+            + select(func.count(CourseBoardComment.id)).where(CourseBoardComment.author_id == user_id).scalar_subquery()
+        )
+    ).scalar()
+
+
+def delete_account_data(user_id, batch_size=None):
+    """사용자와 관련 데이터를 모두 삭제
+
+    batch_size 가 없으면 현재 트랜잭션 하나로 지우고 commit 한다.
+    있으면 테이블마다 batch_size 행씩 나눠 지우고 배치마다 commit 한다.
+    반환값: 테이블별 삭제 행 수
+    """
+    cleanup = _Cleanup()
+    version_keys = _version_keys(user_id)
+    counts = {}
+
+    for model, condition, hook in _steps(user_id):
+        deleted = _delete_step(model, condition, hook, cleanup, batch_size)
+        counts[model.__tablename__] = counts.get(model.__tablename__, 0) + deleted
+
+    # 삭제 도중 디스패처가 만든 알림이 있을 수 있으므로 사용자와 같은 트랜잭션에서 한 번 더 지운다
+    db.session.execute(
+        delete(Notification).where(Notification.user_id == user_id).execution_options(synchronize_session=False)
+    )
+    db.session.execute(delete(User).where(User.id == user_id).execution_options(synchronize_session=False))
+    bump_versions(*version_keys)
+    db.session.commit()
+    # 세션에 남아 있던 객체(요청 안에서 읽은 User 등)는 더 이상 쓰지 않는다
+    db.session.expunge_all()
+
+    invalidate_user(user_id)
+    cleanup.run()
+    counts["attachments"] = cleanup.removed_files
+    return counts
+
+
+def should_delete_in_background(user_id, config):
+    threshold = config["ACCOUNT_DELETE_ASYNC_THRESHOLD"]
+    return threshold > 0 and content_count(user_id) > threshold
+
+
+def schedule_account_deletion(app, user):
+    """로그인/토큰 갱신을 막고 백그라운드 삭제 작업 등록 (commit 포함)"""
+    user.password_hash = DELETING_PASSWORD_HASH
+    revoke_user_tokens(user.id)
+    db.session.commit()
+    invalidate_user(user.id)
+    _submit(app, user.id)
+
+
+def _submit(app, user_id):
+    global _worker_thread
+
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(
+                target=_run_jobs, args=(app,), name="account-deletion", daemon=True
+            )
+            _worker_thread.start()
+    _jobs.put(user_id)
+
+
+def _run_jobs(app):
+    while True:
+        user_id = _jobs.get()
+        with app.app_context():
+            try:
+                counts = delete_account_data(user_id, app.config["ACCOUNT_DELETE_BATCH_SIZE"])
+                logger.info("백그라운드 회원탈퇴 완료 user=%s %s", user_id, counts)
+            except Exception:
+                db.session.rollback()
+                logger.exception("백그라운드 회원탈퇴 실패 user=%s (재시작 시 다시 시도)", user_id)
+            finally:
+                db.session.remove()
+                _jobs.task_done()
+
+
+def resume_account_deletions(app):
+    """삭제 도중 서버가 재시작된 계정 이어서 삭제 (기동 시 호출)"""
+    user_ids = db.session.scalars(select(User.id).where(User.password_hash == DELETING_PASSWORD_HASH)).all()
+    for user_id in user_ids:
+        _submit(app, user_id)
+    if user_ids:
+        logger.info("회원탈퇴 데이터 정리 재개: %d명", len(user_ids))
+
+
+def init_account_deletion(app):
+    app.config.setdefault(
+        "ACCOUNT_DELETE_ASYNC_THRESHOLD", int(os.getenv("ACCOUNT_DELETE_ASYNC_THRESHOLD", "1000"))
+    )
+    app.config.setdefault("ACCOUNT_DELETE_BATCH_SIZE", int(os.getenv("ACCOUNT_DELETE_BATCH_SIZE", "500")))
@@ -1,7 +1,7 @@
 import os
 from flask import Flask, request
 from flask_cors import CORS
-from extensions import db, bcrypt, jwt
+from extensions import db, jwt, migrate
 from routes.auth import auth_bp
 from routes.profile import profile_bp
 from routes.available import available_bp
@@ -10,28 +10,74 @@ from routes.course import course_bp
 from routes.recruit import recruit_bp
 from routes.schedule import schedule_bp
 from routes.notification import notification_bp
+from logging_config import init_logging
+from json_provider import init_json_provider
+from compression import init_compression
+from query_stats import init_query_stats
+from password_service import init_password_service
+from user_cache import init_user_cache
+from account_deletion import init_account_deletion, resume_account_deletions
+from course_catalog import init_course_catalog
+from enrollment_service import init_enrollment_service
+from schedule_service import init_schedule_service
+from token_service import init_token_service
+from metrics import init_metrics
+from database import BASE_DIR, configure_database, ensure_schema_version
+from outbox import start_dispatcher
+from sqlite_profile import init_sqlite_profile, report_sqlite_settings
 
 def create_app():
     app = Flask(__name__)
 
-    # 데이터베이스 설정
-    BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-    DB_PATH = os.path.join(BASE_DIR, "instance", "project.db")
-    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_PATH}"
+    # 비밀번호 해시 (bcrypt cost, 해시 전용 프로세스 풀)
+    # 풀 프로세스를 fork 하므로 로깅/디스패처 스레드를 시작하기 전에 가장 먼저 만든다
+    init_password_service(app)
+
+    # 로깅 설정 (레벨, text/json 형식, 요청 ID, 큐 기반 비동기 출력)
+    init_logging(app)
+
+    # 데이터베이스 설정 (DATABASE_URL 이 없으면 instance/project.db SQLite)
+    configure_database(app)
 
     # 기본 설정
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "super-secret-key")
 
+    # 액세스/리프레시 토큰 유효 시간, 폐기 목록 정리 주기
+    init_token_service(app)
+
     # JWT 헤더 인식 설정 추가
     app.config["JWT_TOKEN_LOCATION"] = ["headers"]
     app.config["JWT_HEADER_NAME"] = "Authorization"
     app.config["JWT_HEADER_TYPE"] = "Bearer"
 
+    # 알림 아웃박스 디스패처 설정
+    app.config["OUTBOX_DISPATCHER_ENABLED"] = os.getenv("OUTBOX_DISPATCHER_ENABLED", "1") != "0"
+    app.config["OUTBOX_DISPATCH_INTERVAL"] = float(os.getenv("OUTBOX_DISPATCH_INTERVAL", "2"))
+    app.config["OUTBOX_BATCH_SIZE"] = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+
+    # JWT 사용자 캐시 (요청 단위 + 짧은 TTL 프로세스 캐시)
+    init_user_cache(app)
+
+    # 회원탈퇴 (많은 데이터를 가진 계정은 백그라운드에서 나눠 삭제)
+    init_account_deletion(app)
+
+    # 강의 카탈로그 페이지 캐시 (TTL)
+    init_course_catalog(app)
+
+    # 학생별 수강 강의 목록 캐시 (TTL)
+    init_enrollment_service(app)
+
+    # 일정 .ics 내보내기 (스트리밍)
+    init_schedule_service(app)
+
+    # 응답 JSON 직렬화 (orjson 이 있으면 사용, datetime 은 ISO UTC 문자열로)
+    init_json_provider(app)
+
     # 확장 기능 초기화
     db.init_app(app)
-    bcrypt.init_app(app)
     jwt.init_app(app)
+    migrate.init_app(app, db, directory=os.path.join(BASE_DIR, "migrations"))
 
     # CORS 설정 - 환경 변수와 기본값 결합
     # 환경 변수에서 허용된 origin을 가져오거나 기본값 사용
@@ -97,6 +143,15 @@ def create_app():
                 response.headers['Access-Control-Expose-Headers'] = 'Content-Type, Authorization'
         return response
 
+    # 응답 압축 (gzip/brotli, Accept-Encoding 협상)
+    init_compression(app)
+
+    # 요청별 SQL 쿼리 수/DB 시간 계측 (Server-Timing 헤더, 느린 요청 로그)
+    init_query_stats(app)
+
+    # Prometheus 메트릭 (/metrics, 응답 시간/쿼리 수/알림 팬아웃/자동 추천 시간)
+    init_metrics(app)
+
     # 🔥 블루프린트 등록 (prefix는 각 파일에서 설정)
     app.register_blueprint(auth_bp)
     app.register_blueprint(profile_bp)
@@ -108,6 +163,9 @@ def create_app():
     app.register_blueprint(notification_bp)
 
     with app.app_context():
+        # SQLite 연결 튜닝 (WAL, busy_timeout 등) - 첫 연결 전에 등록
+        init_sqlite_profile(app)
+
         from models import (
             User,
             Course,
@@ -120,6 +178,7 @@ def create_app():
             TeamRecruitmentMember,
             Schedule,
             Notification,
+            NotificationOutbox,
             Poll,
             PollOption,
             PollVote,
@@ -127,41 +186,18 @@ def create_app():
             TeamAvailabilitySubmission,
         )
 
-        db.create_all()
-        
-        # is_pinned 컬럼 마이그레이션 (기존 데이터베이스 호환성)
-        try:
-            import sqlite3
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            # 기존 컬럼 확인
-            cursor.execute("PRAGMA table_info(course_board_posts)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'is_pinned' not in columns:
-                print("🔄 is_pinned 컬럼을 추가하는 중...")
-                cursor.execute("ALTER TABLE course_board_posts ADD COLUMN is_pinned BOOLEAN DEFAULT 0")
-                conn.commit()
-                print("✅ is_pinned 컬럼이 추가되었습니다!")
-            
-            # available_times 테이블에 team_id 컬럼 추가 마이그레이션
-            cursor.execute("PRAGMA table_info(available_times)")
-            available_times_columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'team_id' not in available_times_columns:
-                print("🔄 available_times 테이블에 team_id 컬럼을 추가하는 중...")
-                cursor.execute("ALTER TABLE available_times ADD COLUMN team_id INTEGER")
-                # 외래 키 제약조건은 SQLite에서 ALTER TABLE로 직접 추가할 수 없으므로,
-                # 필요시 별도로 처리 (일단 컬럼만 추가)
-                conn.commit()
-                print("✅ team_id 컬럼이 추가되었습니다!")
-            
-            conn.close()
-        except Exception as e:
-            print(f"⚠️ 마이그레이션 확인 중 오류 (무시 가능): {e}")
+        # 스키마는 migrations/ 리비전으로 관리 (기동 시에는 버전만 확인)
+        schema_ready = ensure_schema_version(app, db.engine)
         
         print("✅ Database initialized successfully!")
+        report_sqlite_settings(app)
+
+        # 삭제 도중 재시작된 회원탈퇴 작업 재개 (스키마가 최신일 때만)
+        if schema_ready:
+            resume_account_deletions(app)
+
+    # 🔔 알림 아웃박스 디스패처 시작 (워커별 백그라운드 스레드)
+    start_dispatcher(app)
 
     @app.route("/")
     def index():
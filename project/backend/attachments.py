@@ -0,0 +1,42 @@
+"""
+게시글 첨부파일 저장 위치와 정리
+
+게시글의 files 컬럼은 [{"filename": ..., "original_name": ...}, ...] 형식의 JSON 문자열이다.
+파일은 DB commit 이 끝난 뒤에 지운다 (commit 이 실패했는데 파일만 사라지지 않도록).
+"""
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
+
+
+def attachment_filenames(files_json):
+    """게시글 files 컬럼에서 저장된 파일 이름 목록 추출 (형식이 깨졌으면 빈 목록)"""
+    if not files_json:
+        return []
+    try:
+        files_data = json.loads(files_json)
+        return [f["filename"] for f in files_data if isinstance(f, dict) and f.get("filename")]
+    except (TypeError, ValueError):
+        logger.warning("첨부파일 정보를 읽을 수 없음: %r", files_json[:100])
+        return []
+
+
+def remove_attachments(filenames):
+    """업로드 폴더에서 파일 삭제 (이미 없는 파일은 건너뜀), 삭제한 개수 반환"""
+    removed = 0
+    for filename in filenames:
+        # 저장된 이름은 secure_filename 을 거쳤지만 경로 이탈은 한 번 더 막는다
+        file_path = os.path.join(UPLOAD_FOLDER, os.path.basename(filename))
+        try:
+            os.remove(file_path)
+            removed += 1
+            logger.debug("파일 삭제됨: %s", filename)
+        except FileNotFoundError:
+            continue
+        except OSError:
+            logger.warning("첨부파일 삭제 실패: %s", filename, exc_info=True)
+    return removed
@@ -0,0 +1,146 @@
+"""
+JSON 직렬화 벤치마크 (표준 json vs orjson)
+
+임시 SQLite DB 에 게시글/댓글/좋아요/투표/팀 모집 데이터를 만든 뒤,
+게시판 목록(/board/course/<id>)과 팀 모집 목록(/recruit/<id>)이 만드는 응답 데이터를
+각 JSON 프로바이더의 response() 로 반복 인코딩해서 시간을 비교한다.
+(DB 조회/to_dict 시간은 제외하고 인코딩 시간만 측정)
+
+사용법: python benchmark_json.py [반복 횟수]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+TEMP_DIR = tempfile.mkdtemp(prefix="benchmark_json_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEMP_DIR, 'benchmark.db')}"
+os.environ["OUTBOX_DISPATCHER_ENABLED"] = "0"
+
+from app import app
+from extensions import db
+from json_provider import OrjsonProvider, UtcJSONProvider, orjson
+from models import (
+    CourseBoardComment,
+    CourseBoardLike,
+    CourseBoardPost,
+    Poll,
+    PollOption,
+    PollVote,
+    TeamRecruitment,
+    TeamRecruitmentMember,
+    User,
+)
+
+COURSE_CODE = "BENCH101"
+USERS = 60
+POSTS = 100
+COMMENTS_PER_POST = 10
+RECRUITMENTS = 40
+
+
+def seed():
+    users = [
+        User(student_id=f"2025{i:04d}", name=f"학생{i}", email=f"user{i}@example.com",
+             username=f"user{i}", password_hash="-", user_type="student")
+        for i in range(USERS)
+    ]
+    db.session.add_all(users)
+    db.session.flush()
+
+    for i in range(POSTS):
+        post = CourseBoardPost(
+            course_id=COURSE_CODE, author_id=users[i % USERS].id, title=f"게시글 {i}",
+            content="내용 " * 50, category="notice" if i % 10 == 0 else "free",
+            files='[{"filename": "a.pdf", "original_name": "과제.pdf"}]',
+        )
+        db.session.add(post)
+        db.session.flush()
+
+        for j in range(COMMENTS_PER_POST):
+            db.session.add(CourseBoardComment(post_id=post.id, author_id=users[j].id, content=f"댓글 {j}"))
+        for j in range(i % 20):
+            db.session.add(CourseBoardLike(post_id=post.id, user_id=users[j].id))
+
+        if i % 10 == 0:
+            poll = Poll(post_id=post.id, question="언제 만날까요?")
+            db.session.add(poll)
+            db.session.flush()
+            options = [PollOption(poll_id=poll.id, text=day) for day in ("월", "화", "수", "목")]
+            db.session.add_all(options)
+            db.session.flush()
+            for j, user in enumerate(users):
+                db.session.add(PollVote(poll_id=poll.id, option_id=options[j % 4].id, user_id=user.id))
+
+    for i in range(RECRUITMENTS):
+        recruitment = TeamRecruitment(
+            course_id=COURSE_CODE, author_id=users[i % USERS].id, title=f"팀원 모집 {i}",
+            description="설명 " * 30, team_board_name=f"{i}팀", max_members=6, member_count=5,
+        )
+        db.session.add(recruitment)
+        db.session.flush()
+        for j in range(5):
+            db.session.add(TeamRecruitmentMember(recruitment_id=recruitment.id, user_id=users[(i + j) % USERS].id))
+
+    db.session.commit()
+    return users[0].id
+
+
+def build_payloads(user_id):
+    posts = CourseBoardPost.query.filter_by(course_id=COURSE_CODE).order_by(
+        CourseBoardPost.is_pinned.desc(), CourseBoardPost.id.desc()
+    ).all()
+    recruitments = TeamRecruitment.eager_query().filter_by(course_id=COURSE_CODE).order_by(
+        TeamRecruitment.id.desc()
+    ).all()
+    return {
+        "board posts": [p.to_dict(user_id=user_id) for p in posts],
+        "recruitments": [r.to_dict(user_id=user_id) for r in recruitments],
+    }
+
+
+def measure(provider, payload, iterations):
+    provider.response(payload)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = provider.response(payload)
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1000, len(response.get_data())
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with app.app_context():
+        user_id = seed()
+        with app.test_request_context():
+            payloads = build_payloads(user_id)
+
+        providers = [("stdlib json", UtcJSONProvider(app))]
+        if orjson is not None:
+            providers.append(("orjson", OrjsonProvider(app)))
+        else:
+            print("⚠️ orjson 이 설치되어 있지 않아 표준 json 만 측정합니다.")
+
+        print(f"📊 반복 {iterations}회, 1회 평균 인코딩 시간")
+        for name, payload in payloads.items():
+            baseline = None
+            for provider_name, provider in providers:
+                ms, size = measure(provider, payload, iterations)
+                note = ""
+                if baseline is None:
+                    baseline = ms
+                else:
+                    note = f"  ({baseline / ms:.1f}배 빠름)"
+                print(f"   {name:<13} {provider_name:<12} {ms:8.3f} ms  {size / 1024:7.1f} KiB{note}")
+
+        db.engine.dispose()
+    shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+로그인 처리량 벤치마크 (bcrypt cost x 해시 풀 크기)
+
+임시 SQLite DB 에 사용자를 만든 뒤, 여러 스레드가 동시에 /auth/login 을 호출해서
+cost 와 PASSWORD_HASH_POOL_SIZE 조합별 초당 로그인 수와 응답 시간(p50/p95)을 비교한다.
+(풀 크기 0 은 요청 스레드에서 바로 해시하는 기존 방식)
+
+사용법: python benchmark_password.py [동시 스레드 수] [스레드당 로그인 횟수]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+# 해시 풀을 다시 만들 때(forkserver) 풀 프로세스가 이 파일을 __mp_main__ 으로 다시 import 하므로
+# 임시 DB 와 앱은 직접 실행한 프로세스에서만 만든다
+if __name__ == "__main__":
+    TEMP_DIR = tempfile.mkdtemp(prefix="benchmark_password_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEMP_DIR, 'benchmark.db')}"
+    os.environ["OUTBOX_DISPATCHER_ENABLED"] = "0"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("SLOW_REQUEST_MS", "600000")  # 로그인은 원래 느리므로 느린 요청 로그 끔
+
+    from app import app
+    from extensions import db
+    from models import User
+    from password_service import hash_password, shutdown_pool
+
+COSTS = (10, 12)
+POOL_SIZES = (0, 1, 2, 4)
+PASSWORD = "benchmark-password"
+
+
+def seed(count):
+    with app.test_request_context():
+        password_hash = hash_password(PASSWORD)
+    users = [
+        User(student_id=f"2025{i:04d}", name=f"학생{i}", email=f"user{i}@example.com",
+             username=f"user{i}", password_hash=password_hash, user_type="student")
+        for i in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+
+
+def configure(cost, pool_size):
+    shutdown_pool()
+    app.config["BCRYPT_LOG_ROUNDS"] = cost
+    app.config["PASSWORD_HASH_POOL_SIZE"] = pool_size
+    app.config["PASSWORD_HASH_MAX_PENDING"] = max(1, pool_size * 4)
+
+
+def run(threads, logins):
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def worker(index):
+        client = app.test_client()
+        body = {"email": f"user{index}", "password": PASSWORD}
+        for _ in range(logins):
+            start = time.perf_counter()
+            response = client.post("/auth/login", json=body)
+            elapsed = time.perf_counter() - start
+            with lock:
+                if response.status_code == 200:
+                    latencies.append(elapsed)
+                else:
+                    failures.append(response.status_code)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - start, latencies, failures
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with app.app_context():
+        seed(threads)
+
+    print(f"📊 동시 스레드 {threads}개 x 로그인 {logins}회 (CPU {os.cpu_count()}개)")
+    for cost in COSTS:
+        for pool_size in POOL_SIZES:
+            configure(cost, pool_size)
+            # 워밍업: 저장된 해시를 현재 cost 로 재해시 + 풀 프로세스 기동
+            run(threads, 1)
+
+            elapsed, latencies, failures = run(threads, logins)
+            if not latencies:
+                print(f"   cost={cost:<2} pool={pool_size}  모든 요청 실패 {failures[:5]}")
+                continue
+            latencies.sort()
+            p50 = statistics.median(latencies) * 1000
+            p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+            note = f"  실패 {len(failures)}건" if failures else ""
+            print(
+                f"   cost={cost:<2} pool={pool_size}  {len(latencies) / elapsed:7.1f} 로그인/초"
+                f"  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms{note}"
+            )
+
+    shutdown_pool()
+    with app.app_context():
+        db.engine.dispose()
+    shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+응답 압축 (gzip / brotli)
+
+Accept-Encoding 을 보고 br(brotli 설치 시) → gzip 순으로 선택해서 JSON/텍스트 응답을 압축한다.
+게시판/모집/강의 목록 JSON 은 작성자 이름, 프로필 이미지 URL, 카테고리 문자열이 반복되어 압축률이 높다.
+
+- 본문이 COMPRESS_MIN_SIZE 보다 작으면 압축하지 않는다 (압축 헤더/CPU 비용이 더 큼)
+- 스트리밍 응답은 청크마다 flush 하면서 압축해서 그대로 흘려보낸다
+- 이미 압축된 미디어(/board/files/*)와 send_file 응답은 건드리지 않는다
+
+- COMPRESS_ENABLED: 1(기본) / 0
+- COMPRESS_MIN_SIZE: 압축할 최소 바이트 수 (기본 500)
+- COMPRESS_GZIP_LEVEL: gzip 압축 레벨 1~9 (기본 6)
+- COMPRESS_BROTLI_QUALITY: brotli 품질 0~11 (기본 4, 동적 응답이라 낮게)
+"""
+import gzip
+import os
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "text/calendar",
+}
+EXCLUDED_PATH_PREFIXES = ("/board/files/",)
+
+
+def choose_encoding(accept_encodings):
+    """클라이언트가 받을 수 있는 인코딩 중 사용할 것 선택 (없으면 None)"""
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_body(data, encoding, config):
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BROTLI_QUALITY"])
+    return gzip.compress(data, compresslevel=config["COMPRESS_GZIP_LEVEL"])
+
+
+def compress_stream(chunks, encoding, config):
+    """스트리밍 응답용: 청크마다 압축 후 flush 해서 바로 내보낸다"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=config["COMPRESS_BROTLI_QUALITY"])
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    # wbits=31: gzip 헤더/트레일러 포함
+    compressor = zlib.compressobj(config["COMPRESS_GZIP_LEVEL"], zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _is_compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return False
+    if request.method == "HEAD" or request.path.startswith(EXCLUDED_PATH_PREFIXES):
+        return False
+    return response.mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def init_compression(app):
+    app.config.setdefault("COMPRESS_ENABLED", os.getenv("COMPRESS_ENABLED", "1") != "0")
+    app.config.setdefault("COMPRESS_MIN_SIZE", int(os.getenv("COMPRESS_MIN_SIZE", "500")))
+    app.config.setdefault("COMPRESS_GZIP_LEVEL", int(os.getenv("COMPRESS_GZIP_LEVEL", "6")))
+    app.config.setdefault("COMPRESS_BROTLI_QUALITY", int(os.getenv("COMPRESS_BROTLI_QUALITY", "4")))
+
+    if not app.config["COMPRESS_ENABLED"]:
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if not _is_compressible(response):
+            return response
+
+        # 같은 URL 이라도 Accept-Encoding 에 따라 본문이 달라짐 (캐시/CDN 용)
+        response.vary.add("Accept-Encoding")
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        config = app.config
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, config)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < config["COMPRESS_MIN_SIZE"]:
+                return response
+            response.set_data(compress_body(data, encoding, config))
+
+        response.headers["Content-Encoding"] = encoding
+        # 압축된 표현은 바이트가 다르므로 강한 ETag 는 약한 ETag 로 바꾼다
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
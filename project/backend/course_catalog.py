@@ -0,0 +1,144 @@
+"""
+강의 카탈로그 (학생이 참여할 강의를 찾는 목록)
+
+GET /course/catalog?q=검색어&cursor=마지막 id&limit=20
+
+- 최신 강의부터 id 내림차순 keyset 페이지네이션: WHERE id < cursor ORDER BY id DESC LIMIT n.
+  OFFSET 과 달리 뒤 페이지로 갈수록 느려지지 않고, 중간에 강의가 추가돼도 항목이 밀리지 않는다.
+- q 는 강의 코드 앞부분 또는 강의명 일부와 대소문자 구분 없이 비교한다. (인덱스: 마이그레이션 0013)
+  SQLite: 코드는 lower(code) 인덱스 범위 조건, 강의명은 FTS5 trigram 테이블(courses_title_fts) MATCH.
+          trigram 은 3글자 이상만 찾을 수 있으므로 더 짧은 검색어는 강의명을 LIKE 로 비교한다.
+  PostgreSQL: 코드/강의명 모두 ILIKE 를 pg_trgm GIN 인덱스로 처리한다.
+  그 밖의 DB: ILIKE (인덱스 없음)
+- 교수 이름은 같은 쿼리에서 JOIN 으로 가져온다 (강의마다 User 를 따로 읽지 않음).
+- 강의 목록은 자주 바뀌지 않으므로 페이지를 워커 메모리에 짧은 TTL 동안 캐시한다.
+  캐시는 courses/users 리소스 버전과 함께 저장해서, 강의 생성/삭제나 교수 이름 변경 후에는
+  다른 워커에서도 바로 새로 계산한다.
+
+- COURSE_CATALOG_CACHE_TTL: 페이지 캐시 유지 시간(초) (기본 60, 0 이면 캐시 안 함)
+- COURSE_CATALOG_CACHE_MAX_SIZE: 캐시할 최대 페이지 수 (기본 1000)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import and_, func, inspect, literal_column, select, table
+
+from extensions import db
+from models import Course, User
+from resource_version import COURSES_KEY, USERS_KEY, current_version
+
+CATALOG_PAGE_SIZE = 20
+MAX_CATALOG_PAGE_SIZE = 100
+MAX_QUERY_LENGTH = 50
+
+TITLE_FTS_TABLE = "courses_title_fts"
+TRIGRAM_MIN_LENGTH = 3
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+_cache = OrderedDict()  # (q, cursor, limit) -> (만료 시각, 버전, 페이지)
+_cache_lock = threading.Lock()
+_title_fts_available = None
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _has_title_fts():
+    """SQLite FTS5 테이블이 있는지 (FTS5 없이 빌드된 SQLite 면 마이그레이션이 만들지 않음, 프로세스당 한 번 확인)"""
+    global _title_fts_available
+
+    if _title_fts_available is None:
+        _title_fts_available = inspect(db.engine).has_table(TITLE_FTS_TABLE)
+    return _title_fts_available
+
+
+def _sqlite_search_filter(q):
+    # SQLite lower() 는 ASCII 만 바꾸므로 범위 경계도 같은 규칙으로 만든다
+    # (UTF-8 바이트 순서 = 코드 포인트 순서라서 마지막 글자 +1 이 앞부분 일치의 상한)
+    prefix = q.translate(_ASCII_LOWER)
+    code_lower = func.lower(Course.code)
+    code_match = and_(code_lower >= prefix, code_lower < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+    if len(q) < TRIGRAM_MIN_LENGTH or not _has_title_fts():
+        return code_match | Course.title.ilike(f"%{_escape_like(q)}%", escape="\\")
+
+    fts = table(TITLE_FTS_TABLE, literal_column("rowid"))
+    phrase = '"' + q.replace('"', '""') + '"'
+    title_match = Course.id.in_(
+        select(fts.c.rowid).where(literal_column(TITLE_FTS_TABLE).op("MATCH")(phrase))
+    )
+    return code_match | title_match
+
+
+def _search_filter(q):
+    if db.engine.dialect.name == "sqlite":
+        return _sqlite_search_filter(q)
+    pattern = _escape_like(q)
+    return Course.code.ilike(f"{pattern}%", escape="\\") | Course.title.ilike(f"%{pattern}%", escape="\\")
+
+
+def _load_page(q, cursor, limit):
+    query = db.session.query(
+        Course.id, Course.title, Course.code, Course.professor_id, Course.created_at, User.name
+    ).outerjoin(User, User.id == Course.professor_id)
+
+    if q:
+        query = query.filter(_search_filter(q))
+    if cursor:
+        query = query.filter(Course.id < cursor)
+
+    # 다음 페이지가 있는지 알기 위해 하나 더 읽는다
+    rows = query.order_by(Course.id.desc()).limit(limit + 1).all()
+    courses = [
+        {
+            "id": course_id,
+            "title": title,
+            "code": code,
+            "professor_id": professor_id,
+            "professor_name": professor_name,
+            "created_at": created_at,
+        }
+        for course_id, title, code, professor_id, created_at, professor_name in rows[:limit]
+    ]
+    next_cursor = courses[-1]["id"] if len(rows) > limit else None
+    return {"courses": courses, "next_cursor": next_cursor}
+
+
+def get_catalog_page(q=None, cursor=None, limit=CATALOG_PAGE_SIZE):
+    """검색어/커서 기준 강의 한 페이지 {"courses": [...], "next_cursor": id 또는 None}"""
+    q = (q or "").strip()[:MAX_QUERY_LENGTH]
+    limit = max(1, min(limit or CATALOG_PAGE_SIZE, MAX_CATALOG_PAGE_SIZE))
+
+    ttl = current_app.config["COURSE_CATALOG_CACHE_TTL"]
+    if ttl <= 0:
+        return _load_page(q, cursor, limit)
+
+    # ETag 계산에 쓴 버전과 같은 버전으로 만든 캐시만 사용
+    version = (current_version(COURSES_KEY), current_version(USERS_KEY))
+    key = (q.lower(), cursor, limit)
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > now and entry[1] == version:
+            _cache.move_to_end(key)
+            return entry[2]
+
+    page = _load_page(q, cursor, limit)
+
+    with _cache_lock:
+        _cache[key] = (now + ttl, version, page)
+        _cache.move_to_end(key)
+        while len(_cache) > current_app.config["COURSE_CATALOG_CACHE_MAX_SIZE"]:
+            _cache.popitem(last=False)
+    return page
+
+
+def init_course_catalog(app):
+    app.config.setdefault("COURSE_CATALOG_CACHE_TTL", float(os.getenv("COURSE_CATALOG_CACHE_TTL", "60")))
+    app.config.setdefault(
+        "COURSE_CATALOG_CACHE_MAX_SIZE", int(os.getenv("COURSE_CATALOG_CACHE_MAX_SIZE", "1000"))
+    )
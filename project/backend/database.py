@@ -0,0 +1,131 @@
+"""
+데이터베이스 백엔드 설정
+
+DATABASE_URL 이 있으면 해당 DB(PostgreSQL 등)를 사용하고,
+없으면 기존처럼 instance/project.db SQLite 파일을 사용한다.
+여러 앱 노드가 같은 DB 를 쓰려면 DATABASE_URL 로 PostgreSQL 을 지정하면 된다.
+
+- DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_POOL_RECYCLE / DB_POOL_PRE_PING
+  : SQLite 가 아닌 DB 의 커넥션 풀 설정
+- AUTO_MIGRATE: 기동 시 스키마 버전이 뒤처져 있으면 flask db upgrade 를 대신 실행 (기본 1)
+"""
+import logging
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask_migrate import upgrade
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_SQLITE_PATH = os.path.join(BASE_DIR, "instance", "project.db")
+
+
+def get_database_uri():
+    """DATABASE_URL 또는 기본 SQLite 경로"""
+    url = os.getenv("DATABASE_URL", "").strip()
+    if not url:
+        os.makedirs(os.path.dirname(DEFAULT_SQLITE_PATH), exist_ok=True)
+        return f"sqlite:///{DEFAULT_SQLITE_PATH}"
+
+    # Heroku/Render 등은 postgres:// 로 주지만 SQLAlchemy 는 postgresql:// 만 인식
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def get_engine_options(uri):
+    """DB 종류별 create_engine 옵션 (SQLite 는 파일 DB 라서 풀 설정 불필요)"""
+    if uri.startswith("sqlite"):
+        return {}
+
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") != "0",
+    }
+
+
+def configure_database(app):
+    uri = get_database_uri()
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = get_engine_options(uri)
+
+
+# =====================================================
+# 스키마 버전 확인 (Alembic / Flask-Migrate)
+# 스키마 변경은 migrations/versions 의 리비전으로만 한다. (flask db migrate / flask db upgrade)
+# =====================================================
+MIGRATION_LOCK_PATH = os.path.join(BASE_DIR, "instance", "migrate.lock")
+MIGRATION_ADVISORY_LOCK_ID = 720331  # pg_advisory_lock 키 (임의의 고정 값)
+
+
+def get_schema_versions(app, engine):
+    """(DB 에 기록된 리비전, 코드의 head 리비전) 반환 - alembic_version 한 줄만 읽는다"""
+    config = app.extensions["migrate"].migrate.get_config()
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    return current, heads
+
+
+@contextmanager
+def migration_lock(engine):
+    """여러 워커가 동시에 기동해도 업그레이드는 한 프로세스만 실행하도록 잠금"""
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.exec_driver_sql(f"SELECT pg_advisory_lock({MIGRATION_ADVISORY_LOCK_ID})")
+            try:
+                yield
+            finally:
+                conn.exec_driver_sql(f"SELECT pg_advisory_unlock({MIGRATION_ADVISORY_LOCK_ID})")
+                conn.commit()
+        return
+
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(MIGRATION_LOCK_PATH), exist_ok=True)
+    with open(MIGRATION_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def ensure_schema_version(app, engine):
+    """기동 시 스키마 버전 확인 (app_context 안에서 호출)
+
+    최신이면 alembic_version 조회 한 번으로 끝난다.
+    뒤처져 있으면 AUTO_MIGRATE=1 일 때 잠금을 잡고 upgrade, 아니면 경고만 남긴다.
+    """
+    current, heads = get_schema_versions(app, engine)
+    if current == heads:
+        return True
+
+    if os.getenv("AUTO_MIGRATE", "1") == "0":
+        logger.warning(
+            "DB 스키마가 최신이 아닙니다 (현재: %s, 최신: %s). flask db upgrade 를 실행해주세요.",
+            sorted(current) or "없음", sorted(heads),
+        )
+        return False
+
+    with migration_lock(engine):
+        # 잠금을 기다리는 동안 다른 워커가 이미 업그레이드했을 수 있음
+        current, heads = get_schema_versions(app, engine)
+        if current != heads:
+            logger.info("DB 스키마 업그레이드 중... (%s → %s)", sorted(current) or "없음", sorted(heads))
+            upgrade()
+            logger.info("DB 스키마 업그레이드 완료")
+    return True
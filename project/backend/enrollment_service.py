@@ -0,0 +1,184 @@
+"""
+수강 등록 서비스
+
+학생 본인 참여(enroll_course)와 교수의 명단 일괄 등록(bulk_enroll)이 같은 경로로 등록한다.
+- 명단 전체를 INSERT ... ON CONFLICT DO NOTHING RETURNING student_id 한 번으로 넣는다.
+- (student_id, course_id) 유니크 인덱스로 동시에 같은 학생을 등록해도(더블 클릭, 명단 중복 업로드)
+  중복 행이 생기지 않고, 새로 등록된 학생은 실제로 INSERT 된 행(RETURNING)으로만 판단하므로
+  동시 요청 두 개가 같은 학생을 둘 다 "새로 등록" 으로 세거나 알림을 두 번 보내지 않는다.
+
+명단은 JSON {"student_ids": ["20251234", ...]} 또는 CSV(본문이나 file 필드) 로 받는다.
+CSV 는 첫 줄에 student_id / studentId / 학번 열이 있으면 그 열을, 없으면 첫 번째 열을 학번으로 읽는다.
+
+수강 강의 목록(GET /course/enrolled)은 사이드바가 페이지마다 부르므로
+강의 + 교수 이름을 JOIN 쿼리 한 번으로 읽고, 학생별로 워커 메모리에 짧은 TTL 동안 캐시한다.
+캐시는 enrolled:<user id> / courses / users 리소스 버전과 함께 저장해서
+수강 등록(본인/일괄), 강의 삭제, 교수 이름 변경 후에는 다른 워커에서도 바로 새로 계산한다.
+
+- ENROLLED_COURSES_CACHE_TTL: 수강 강의 목록 캐시 유지 시간(초) (기본 60, 0 이면 캐시 안 함)
+- ENROLLED_COURSES_CACHE_MAX_SIZE: 캐시할 최대 학생 수 (기본 10000)
+"""
+import csv
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import select
+
+from extensions import db
+from models import Course, Enrollment, User, utcnow
+from resource_version import COURSES_KEY, USERS_KEY, bump_versions, current_version
+from upsert import insert_ignore
+
+MAX_ROSTER_SIZE = 2000
+STUDENT_ID_HEADERS = {"student_id", "studentid", "학번"}
+
+_cache = OrderedDict()  # user_id -> (만료 시각, 버전, 강의 목록)
+_cache_lock = threading.Lock()
+
+
+def enrolled_version_key(user_id):
+    return f"enrolled:{user_id}"
+
+
+class RosterError(ValueError):
+    """명단 형식 오류 (메시지는 그대로 응답에 사용)"""
+
+
+def _clean(values):
+    """공백 제거, 빈 값/중복 제거 (순서 유지)"""
+    seen = []
+    for value in values:
+        value = str(value).strip()
+        if value and value not in seen:
+            seen.append(value)
+    return seen
+
+
+def _parse_csv(text):
+    rows = [row for row in csv.reader(io.StringIO(text.lstrip("﻿"))) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    for index, name in enumerate(header):
+        if name in STUDENT_ID_HEADERS:
+            return [row[index] for row in rows[1:] if len(row) > index]
+    return [row[0] for row in rows]
+
+
+def parse_roster(request):
+    """요청에서 학번 목록 추출 (JSON / CSV 본문 / CSV 파일 업로드)"""
+    if "file" in request.files:
+        raw = request.files["file"].read()
+        try:
+            student_ids = _parse_csv(raw.decode("utf-8"))
+        except UnicodeDecodeError:
+            # 엑셀에서 저장한 한글 CSV
+            student_ids = _parse_csv(raw.decode("cp949", errors="replace"))
+    elif request.is_json:
+        data = request.get_json(silent=True) or {}
+        student_ids = data.get("student_ids")
+        if not isinstance(student_ids, list):
+            raise RosterError("student_ids 목록이 필요합니다.")
+    else:
+        student_ids = _parse_csv(request.get_data(as_text=True))
+
+    student_ids = _clean(student_ids)
+    if not student_ids:
+        raise RosterError("등록할 학번이 없습니다.")
+    if len(student_ids) > MAX_ROSTER_SIZE:
+        raise RosterError(f"한 번에 최대 {MAX_ROSTER_SIZE}명까지 등록할 수 있습니다.")
+    return student_ids
+
+
+def resolve_students(student_numbers):
+    """학번 → 학생 사용자 id (쿼리 1번), 반환값: ({학번: [user id, ...]}, 찾지 못한 학번 목록)"""
+    rows = db.session.execute(
+        select(User.id, User.student_id).where(
+            User.student_id.in_(student_numbers), User.user_type == "student"
+        )
+    ).all()
+    found = {}
+    for user_id, student_number in rows:
+        found.setdefault(student_number, []).append(user_id)
+    missing = [number for number in student_numbers if number not in found]
+    return found, missing
+
+
+def enroll_students(course_id, user_ids):
+    """수강 등록 (commit 은 호출한 쪽에서, 수강 강의 목록 버전도 함께 올림), 반환값: 새로 등록된 user id 목록"""
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    if not user_ids:
+        return []
+
+    now = utcnow()
+    # 이미 수강 중이거나 동시 요청이 먼저 넣은 학생은 RETURNING 에 나오지 않는다
+    new_ids = insert_ignore(
+        Enrollment,
+        [{"student_id": user_id, "course_id": course_id, "enrolled_at": now} for user_id in user_ids],
+        index_elements=[Enrollment.student_id, Enrollment.course_id],
+        returning=Enrollment.student_id,
+    )
+    if not new_ids:
+        return []
+
+    bump_versions(*(enrolled_version_key(user_id) for user_id in new_ids))
+    return new_ids
+
+
+def _load_enrolled_courses(user_id):
+    rows = db.session.execute(
+        select(Course.id, Course.title, Course.code, Course.professor_id, Course.created_at, User.name)
+        .join(Enrollment, Enrollment.course_id == Course.id)
+        .outerjoin(User, User.id == Course.professor_id)
+        .where(Enrollment.student_id == user_id)
+        .order_by(Enrollment.enrolled_at.desc())
+    ).all()
+    return [
+        {
+            "id": course_id,
+            "title": title,
+            "code": code,
+            "professor_id": professor_id,
+            "professor_name": professor_name,
+            "created_at": created_at,
+        }
+        for course_id, title, code, professor_id, created_at, professor_name in rows
+    ]
+
+
+def list_enrolled_courses(user_id):
+    """학생의 수강 강의 목록 (최근 등록 순, Course.to_dict 와 같은 형태)"""
+    user_id = int(user_id)
+    ttl = current_app.config["ENROLLED_COURSES_CACHE_TTL"]
+    if ttl <= 0:
+        return _load_enrolled_courses(user_id)
+
+    # ETag 계산에 쓴 버전과 같은 버전으로 만든 캐시만 사용
+    version = tuple(current_version(key) for key in (enrolled_version_key(user_id), COURSES_KEY, USERS_KEY))
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(user_id)
+        if entry is not None and entry[0] > now and entry[1] == version:
+            _cache.move_to_end(user_id)
+            return entry[2]
+
+    courses = _load_enrolled_courses(user_id)
+
+    with _cache_lock:
+        _cache[user_id] = (now + ttl, version, courses)
+        _cache.move_to_end(user_id)
+        while len(_cache) > current_app.config["ENROLLED_COURSES_CACHE_MAX_SIZE"]:
+            _cache.popitem(last=False)
+    return courses
+
+
+def init_enrollment_service(app):
+    app.config.setdefault("ENROLLED_COURSES_CACHE_TTL", float(os.getenv("ENROLLED_COURSES_CACHE_TTL", "60")))
+    app.config.setdefault(
+        "ENROLLED_COURSES_CACHE_MAX_SIZE", int(os.getenv("ENROLLED_COURSES_CACHE_MAX_SIZE", "10000"))
+    )
@@ -0,0 +1,161 @@
+"""
+라우트 쿼리 실행 계획 점검 스크립트 (SQLite EXPLAIN QUERY PLAN)
+
+임시 SQLite DB 에 마이그레이션을 적용하고 샘플 데이터를 만든 뒤,
+주요 라우트를 test_client 로 호출하면서 실행된 SELECT 문을 모은다.
+모은 쿼리마다 EXPLAIN QUERY PLAN 을 실행해서 인덱스를 타지 않는 테이블 스캔(SCAN)을 찾아 출력한다.
+
+사용법: python explain_queries.py
+  - 스캔이 남아 있으면 종료 코드 1 (ALLOWED_SCANS 에 등록된 의도적인 전체 조회는 제외)
+  - 실제 DB 는 건드리지 않는다 (DATABASE_URL 을 임시 파일로 덮어씀)
+"""
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+TEMP_DIR = tempfile.mkdtemp(prefix="explain_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEMP_DIR, 'explain.db')}"
+os.environ["OUTBOX_DISPATCHER_ENABLED"] = "0"
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from app import app
+from extensions import db
+from outbox import drain
+
+# 의도적으로 전체를 읽는 쿼리 (endpoint, 테이블)
+ALLOWED_SCANS = {
+    ("course.get_all_courses", "courses"),  # 전체 강의 목록
+}
+
+FTS_MATCH_PLAN = re.compile(r"VIRTUAL TABLE INDEX \d+:M")
+
+captured = {}  # statement -> (endpoint, parameters)
+
+
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if executemany or not has_request_context():
+        return
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return
+    captured.setdefault(statement, (request.endpoint, parameters))
+
+
+def run_scenario(client):
+    """수강/게시판/투표/댓글/팀 모집/일정/가능 시간 흐름을 한 번씩 실행"""
+    def register(username, user_type="student"):
+        client.post("/auth/register", json={
+            "studentId": f"{username}01", "name": username, "email": f"{username}@example.com",
+            "username": username, "password": "password", "userType": user_type,
+        })
+        token = client.post("/auth/login", json={"email": username, "password": "password"}).get_json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    professor = register("professor", "professor")
+    students = [register(f"student{i}") for i in range(3)]
+
+    course_id = client.post("/course/", json={"title": "운영체제", "code": "CS101"}, headers=professor).get_json()["course"]["id"]
+    for headers in students:
+        client.post(f"/course/enroll/{course_id}", headers=headers)
+
+    post = client.post("/board/", json={
+        "course_id": "CS101", "title": "공지", "content": "내용", "category": "notice",
+        "poll": {"question": "언제?", "options": [{"text": "월"}, {"text": "화"}]},
+    }, headers=professor).get_json()["post"]
+    option_id = post["poll"]["options"][0]["id"]
+    client.post(f"/board/post/{post['id']}/poll/vote", json={"option_id": option_id}, headers=students[0])
+    client.post(f"/board/post/{post['id']}/like", headers=students[1])
+    comment = client.post(f"/board/post/{post['id']}/comments", json={"content": "댓글"}, headers=students[0]).get_json()["comment"]
+    client.post(f"/board/post/{post['id']}/comments", json={"content": "답글", "parent_comment_id": comment["id"]}, headers=students[1])
+    client.post(f"/board/comment/{comment['id']}/like", headers=students[2])
+
+    recruitment = client.post("/recruit/", json={
+        "course_id": "CS101", "title": "팀원 모집", "description": "설명", "team_board_name": "A팀", "max_members": 3,
+    }, headers=students[0]).get_json()["recruitment"]
+    for headers in students[1:]:
+        client.post(f"/recruit/{recruitment['id']}/join", headers=headers)
+
+    client.post("/schedule/", json={"title": "과제", "date": 1, "month": 3, "year": 2025, "color": "#a8d5e2"}, headers=students[0])
+    client.post("/available/", json={"day_of_week": "월", "start_time": "09:00", "end_time": "11:00"}, headers=students[0])
+
+    with app.app_context():
+        drain()
+
+    # 조회 라우트
+    for headers in (professor, students[0]):
+        client.get("/board/course/CS101", headers=headers)
+        client.get(f"/board/post/{post['id']}/comments", headers=headers)
+        client.get(f"/board/post/{post['id']}/poll/options/{option_id}/voters", headers=headers)
+        client.get("/recruit/CS101", headers=headers)
+        client.get("/recruit/CS101/team-boards", headers=headers)
+        client.get("/notification/", headers=headers)
+        client.get("/course/my", headers=headers)
+        client.get("/course/all", headers=headers)
+        client.get("/course/enrolled", headers=headers)
+        client.get("/course/catalog?q=CS1", headers=headers)
+        client.get("/course/catalog?q=운영체제", headers=headers)
+        client.get("/schedule/?year=2025&month=3", headers=headers)
+        client.get("/schedule/?from=2025-02-15&to=2025-04-15", headers=headers)
+        client.get("/schedule/export.ics", headers=headers)
+        client.get("/available/", headers=headers)
+        client.get(f"/available/team/{recruitment['id']}", headers=headers)
+        client.get("/profile/", headers=headers)
+
+
+def find_scans(conn, statement, parameters):
+    """실행 계획에서 인덱스 없는 SCAN 단계와 임시 정렬 단계를 찾는다"""
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans, sorts = [], []
+    for row in rows:
+        detail = row[-1]
+        # FTS5 가상 테이블의 MATCH 는 전문 검색 인덱스 조회 (계획에는 "VIRTUAL TABLE INDEX 0:M1" 처럼 표시됨)
+        if detail.startswith("SCAN ") and "USING" not in detail and not FTS_MATCH_PLAN.search(detail):
+            scans.append(detail)
+        elif "TEMP B-TREE" in detail:
+            sorts.append(detail)
+    return scans, sorts
+
+
+def main():
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            print("❌ SQLite 에서만 실행할 수 있습니다.")
+            return 1
+        event.listen(db.engine, "before_cursor_execute", _capture)
+
+    run_scenario(app.test_client())
+
+    problems = 0
+    with app.app_context():
+        event.remove(db.engine, "before_cursor_execute", _capture)
+        with db.engine.connect() as conn:
+            for statement, (endpoint, parameters) in captured.items():
+                scans, sorts = find_scans(conn, statement, parameters)
+                scans = [
+                    detail for detail in scans
+                    if (endpoint, detail.split()[1]) not in ALLOWED_SCANS
+                ]
+                if not scans and not sorts:
+                    continue
+
+                print(f"\n[{endpoint}] {' '.join(statement.split())[:200]}")
+                for detail in scans:
+                    print(f"   ❌ {detail}")
+                for detail in sorts:
+                    print(f"   ⚠️ {detail}")
+                problems += len(scans)
+        db.engine.dispose()
+    shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    print(f"\n🔍 쿼리 {len(captured)}개 점검, 인덱스 없는 스캔 {problems}개")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
 
 db = SQLAlchemy()
-bcrypt = Bcrypt()
 jwt = JWTManager()
+migrate = Migrate()
@@ -0,0 +1,49 @@
+"""
+gunicorn 설정 (backend 디렉터리에서 gunicorn app:app 실행 시 자동으로 읽힘)
+
+Prometheus 메트릭을 워커 여러 개에서 합쳐 보기 위해 멀티 프로세스 모드를 켠다.
+PROMETHEUS_MULTIPROC_DIR 이 없으면 임시 디렉터리를 기본값으로 쓰고,
+마스터 기동 시 이전 실행의 값을 지우고, 죽은 워커의 값은 정리한다.
+
+--preload 로 마스터에서 앱을 먼저 만든 경우 비밀번호 해시 풀은 워커가 fork 된 직후
+(아직 다른 스레드가 없을 때) 워커마다 새로 만든다.
+로그 리스너, 알림 아웃박스 디스패처 스레드도 fork 로 복사되지 않으므로 워커마다 다시 띄운다.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "allmeet-prometheus"),
+)
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # 해시 풀을 먼저 만든다 (다른 스레드가 생기기 전이어야 fork 로 띄울 수 있음)
+    password_service = sys.modules.get("password_service")
+    if password_service is not None:
+        password_service.start_pool_after_fork()
+
+    logging_config = sys.modules.get("logging_config")
+    if logging_config is not None:
+        logging_config.start_listener_after_fork()
+
+    outbox = sys.modules.get("outbox")
+    if outbox is not None:
+        outbox.start_dispatcher_after_fork()
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,84 @@
+"""
+API 응답 JSON 직렬화
+
+orjson 이 설치되어 있으면 orjson 으로, 없으면 Flask 기본(json 표준 라이브러리)으로 인코딩한다.
+datetime 은 어느 쪽이든 to_iso_utc 와 같은 형식(naive 는 UTC 로 간주, "+00:00")으로 직렬화하므로
+to_dict 에서는 datetime 을 문자열로 바꾸지 않고 그대로 넣는다.
+
+- JSON_PROVIDER: auto(기본, orjson 있으면 사용) / orjson / stdlib
+"""
+import logging
+import os
+from datetime import datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+from models import to_iso_utc
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class UtcJSONProvider(DefaultJSONProvider):
+    """표준 라이브러리 json 사용 (datetime 만 ISO UTC 로 변환)"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, datetime):
+            return to_iso_utc(o)
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(UtcJSONProvider):
+    """orjson 사용 (datetime 은 C 코드에서 바로 직렬화)
+
+    sort_keys / compact 설정은 Flask 기본 프로바이더와 같게 동작한다.
+    한글은 \\uXXXX 로 이스케이프하지 않고 UTF-8 그대로 내보낸다.
+    """
+
+    def _options(self):
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # indent 등 json.dumps 전용 인자가 오면 표준 라이브러리로 처리
+        kwargs.pop("default", None)
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._options()
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        # str 로 디코딩하지 않고 bytes 그대로 응답 본문에 사용
+        body = orjson.dumps(obj, default=self.default, option=option) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def get_json_provider_class():
+    name = os.getenv("JSON_PROVIDER", "auto").strip().lower()
+    if name == "stdlib":
+        return UtcJSONProvider
+    if orjson is None:
+        if name == "orjson":
+            logger.warning("orjson 이 설치되어 있지 않아 표준 json 으로 직렬화합니다.")
+        return UtcJSONProvider
+    return OrjsonProvider
+
+
+def init_json_provider(app):
+    app.json = get_json_provider_class()(app)
@@ -0,0 +1,157 @@
+"""
+구조화 로깅 설정
+
+모듈에서는 logger = logging.getLogger(__name__) 로 로거를 만들고
+logger.debug("팀 %s 멤버 수: %d", team_id, count) 처럼 % 인자를 넘긴다.
+(f-string 을 쓰면 레벨이 꺼져 있어도 문자열을 만들기 때문에 쓰지 않는다)
+로그용으로만 쿼리/리스트를 만들어야 하면 logger.isEnabledFor(logging.DEBUG) 로 감싼다.
+
+- 요청마다 request_id 를 붙인다 (X-Request-ID 헤더가 있으면 그대로, 없으면 새로 생성, 응답 헤더로 돌려줌)
+- 요청 스레드는 QueueHandler 로 큐에 넣기만 하고, 포맷/출력은 QueueListener 스레드가 한다
+  (gunicorn 워커가 stdout 쓰기에서 막히지 않도록)
+- 리스너 스레드는 fork 로 복사되지 않으므로 gunicorn --preload 에서는 워커마다
+  start_listener_after_fork() 로 다시 띄운다 (gunicorn.conf.py 의 post_fork)
+
+- LOG_LEVEL: DEBUG / INFO(기본) / WARNING / ERROR
+- LOG_FORMAT: text(기본) / json (한 줄에 JSON 객체 하나, 로그 수집기용)
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# LogRecord 기본 속성 (이외의 속성은 extra= 로 넘긴 값으로 보고 JSON 에 포함)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_listener = None
+
+
+def get_request_id():
+    if has_request_context():
+        return g.get("request_id", "-")
+    return "-"
+
+
+class RequestIdFilter(logging.Filter):
+    """레코드에 request_id 추가 (요청 스레드에서 실행되어야 하므로 QueueHandler 에 붙인다)"""
+
+    def filter(self, record):
+        record.request_id = get_request_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _RequestQueueHandler(QueueHandler):
+    """메시지 % 치환과 traceback 문자열화만 요청 스레드에서 하고 나머지 포맷은 리스너에 맡긴다
+
+    (인자로 넘긴 객체가 나중에 바뀌거나 DB 세션이 닫혀도 로그 내용이 달라지지 않도록)
+    """
+
+    def prepare(self, record):
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(vars(record))
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _build_formatter(log_format):
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+
+
+def configure_logging(level="INFO", log_format="text"):
+    """루트 로거를 큐 핸들러 + 백그라운드 리스너로 구성 (여러 번 호출해도 리스너는 하나)"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(_build_formatter(log_format))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _RequestQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def start_listener_after_fork():
+    """fork 된 워커에서 리스너를 새로 시작 (마스터의 리스너 스레드는 워커에 없어서 큐를 아무도 비우지 않는다)"""
+    global _listener
+
+    if _listener is None:
+        return
+    # 복사된 리스너는 스레드가 없으므로 stop() 하지 않고, 같은 큐/핸들러로 새 리스너를 띄운다
+    _listener = QueueListener(_listener.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    # 종료 시 큐에 남은 로그를 모두 출력
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+
+
+def init_logging(app):
+    app.config.setdefault("LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO").upper())
+    app.config.setdefault("LOG_FORMAT", os.getenv("LOG_FORMAT", "text").lower())
+
+    configure_logging(app.config["LOG_LEVEL"], app.config["LOG_FORMAT"])
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        g.request_id = incoming if _REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+
+    @app.after_request
+    def add_request_id_header(response):
+        request_id = g.get("request_id")
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        return response
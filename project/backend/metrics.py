@@ -0,0 +1,189 @@
+"""
+Prometheus 메트릭 (/metrics)
+
+- http_request_duration_seconds: 블루프린트/엔드포인트/메서드/상태 코드별 응답 시간 히스토그램
+- http_requests_in_progress: 처리 중인 요청 수
+- db_queries_per_request / db_time_per_request_seconds: 요청당 SQL 쿼리 수와 DB 시간 (query_stats 값 사용)
+- notification_fanout_recipients: 알림 이벤트 하나가 전달되는 사람 수 (알림 종류별)
+- notifications_dispatched_total: 아웃박스 디스패처가 만든 알림 행 수
+- auto_recommend_duration_seconds: 팀 시간 자동 추천 계산/게시글 생성 시간 (trigger=submit|manual)
+
+gunicorn 처럼 워커 프로세스가 여러 개면 PROMETHEUS_MULTIPROC_DIR 을 지정해야
+워커마다 따로 쌓인 값이 /metrics 에서 합쳐진다 (gunicorn.conf.py 가 기본 디렉터리를 만들어 준다).
+prometheus_client 가 설치되어 있지 않으면 메트릭 수집은 아무 동작도 하지 않는다.
+
+- METRICS_ENABLED: 1(기본) / 0
+- METRICS_AUTH_TOKEN: /metrics 요청에 필요한 Authorization: Bearer <토큰>
+  지정하지 않으면 /metrics 는 404 (수집은 하지만 외부에 노출하지 않음)
+  (역방향 프록시 뒤에서는 모든 요청이 127.0.0.1 에서 오므로 주소로는 허용하지 않는다)
+"""
+import hmac
+import logging
+import os
+import time
+from functools import wraps
+
+from flask import abort, g, request
+
+logger = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:
+    prometheus_client = None
+
+METRICS_PATH = "/metrics"
+
+# 응답 시간 버킷 (초): 캐시 히트 304 ~ 자동 추천 같은 무거운 요청까지
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 30, 50, 100, 200)
+FANOUT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class _NoopMetric:
+    """prometheus_client 가 없을 때 쓰는 빈 메트릭"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "HTTP 요청 처리 시간",
+        ["blueprint", "endpoint", "method", "status"],
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUESTS_IN_PROGRESS = Gauge(
+        "http_requests_in_progress",
+        "처리 중인 HTTP 요청 수",
+        multiprocess_mode="livesum",
+    )
+    DB_QUERIES = Histogram(
+        "db_queries_per_request",
+        "요청 하나가 실행한 SQL 쿼리 수",
+        ["blueprint", "endpoint"],
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+    DB_TIME = Histogram(
+        "db_time_per_request_seconds",
+        "요청 하나의 SQL 실행 시간 합계",
+        ["blueprint", "endpoint"],
+        buckets=LATENCY_BUCKETS,
+    )
+    NOTIFICATION_FANOUT = Histogram(
+        "notification_fanout_recipients",
+        "알림 이벤트 하나의 수신자 수",
+        ["type"],
+        buckets=FANOUT_BUCKETS,
+    )
+    NOTIFICATIONS_DISPATCHED = Counter(
+        "notifications_dispatched_total",
+        "아웃박스 디스패처가 생성한 알림 수",
+    )
+    AUTO_RECOMMEND_DURATION = Histogram(
+        "auto_recommend_duration_seconds",
+        "팀 공통 시간 자동 추천 처리 시간",
+        ["trigger"],
+        buckets=LATENCY_BUCKETS,
+    )
+else:
+    REQUEST_LATENCY = REQUESTS_IN_PROGRESS = DB_QUERIES = DB_TIME = _NoopMetric()
+    NOTIFICATION_FANOUT = NOTIFICATIONS_DISPATCHED = AUTO_RECOMMEND_DURATION = _NoopMetric()
+
+
+def timed(histogram, **labels):
+    """함수 실행 시간을 히스토그램에 기록하는 데코레이터 (예외가 나도 기록)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.labels(**labels).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def render_metrics():
+    """Prometheus 텍스트 형식 (body, content_type)
+
+    멀티 프로세스 모드면 모든 워커가 남긴 값을 합쳐서 내보낸다.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def _authorized(token):
+    header = request.headers.get("Authorization", "")
+    return hmac.compare_digest(header, f"Bearer {token}")
+
+
+def init_metrics(app):
+    app.config.setdefault("METRICS_ENABLED", os.getenv("METRICS_ENABLED", "1") != "0")
+    app.config.setdefault("METRICS_AUTH_TOKEN", os.getenv("METRICS_AUTH_TOKEN", ""))
+
+    if not app.config["METRICS_ENABLED"]:
+        return
+    if prometheus_client is None:
+        logger.warning("prometheus_client 가 설치되어 있지 않아 /metrics 를 비활성화합니다.")
+        return
+
+    @app.before_request
+    def start_metrics():
+        if request.path == METRICS_PATH:
+            return
+        g.metrics_started = time.perf_counter()
+        REQUESTS_IN_PROGRESS.inc()
+
+    @app.after_request
+    def record_metrics(response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        REQUESTS_IN_PROGRESS.dec()
+
+        # URL 대신 엔드포인트 이름을 라벨로 사용 (id 가 들어간 경로로 라벨이 폭증하지 않도록)
+        blueprint = request.blueprint or ""
+        endpoint = request.endpoint or "<unmatched>"
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+
+        stats = g.get("query_stats")
+        if stats is not None:
+            DB_QUERIES.labels(blueprint, endpoint).observe(stats["count"])
+            DB_TIME.labels(blueprint, endpoint).observe(stats["db_ms"] / 1000)
+        return response
+
+    @app.teardown_request
+    def finish_metrics(exc):
+        # after_request 까지 가지 못하고 끝난 요청도 처리 중 수에서 빼준다
+        if g.pop("metrics_started", None) is not None:
+            REQUESTS_IN_PROGRESS.dec()
+
+    @app.route(METRICS_PATH, methods=["GET"])
+    def metrics():
+        token = app.config["METRICS_AUTH_TOKEN"]
+        if not token:
+            # 없는 경로와 같은 응답
+            abort(404)
+        if not _authorized(token):
+            return {"msg": "인증이 필요합니다."}, 401
+        body, content_type = render_metrics()
+        return app.response_class(body, content_type=content_type)
@@ -0,0 +1,242 @@
+"""baseline schema
+
+add_pinned_column.py / fix_poll_column.py / init_poll_tables.py 로 하던
+기존 스키마 보정을 한 번에 처리한다.
+이미 테이블이 있는 DB(마이그레이션 도입 전 DB)에서도 실행할 수 있도록 전부 존재 여부를 확인한다.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 18:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table_if_missing(name, *columns):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+
+
+def _column_names(table):
+    return [c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)]
+
+
+def upgrade():
+    _create_table_if_missing('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('user_type', sa.String(length=20), nullable=False),
+    sa.Column('profile_image', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('username')
+    )
+    _create_table_if_missing('course_board_posts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.String(length=20), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('team_board_name', sa.String(length=100), nullable=True),
+    sa.Column('files', sa.Text(), nullable=True),
+    sa.Column('is_pinned', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('courses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('code', sa.String(length=20), nullable=False),
+    sa.Column('professor_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['professor_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('code')
+    )
+    _create_table_if_missing('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('content', sa.String(length=500), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=True),
+    sa.Column('comment_id', sa.Integer(), nullable=True),
+    sa.Column('course_id', sa.String(length=20), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('date', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('color', sa.String(length=20), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('team_recruitments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.String(length=20), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('team_board_name', sa.String(length=100), nullable=True),
+    sa.Column('max_members', sa.Integer(), nullable=False),
+    sa.Column('is_board_activated', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('available_times',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=True),
+    sa.Column('day_of_week', sa.String(length=10), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['team_recruitments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('course_board_comments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('parent_comment_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['parent_comment_id'], ['course_board_comments.id'], ),
+    sa.ForeignKeyConstraint(['post_id'], ['course_board_posts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('course_board_likes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['course_board_posts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('enrollments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('enrolled_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('polls',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('question', sa.String(length=500), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['course_board_posts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('team_availability_submissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('submitted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['team_recruitments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('team_id', 'user_id', name='uq_team_user_submission')
+    )
+    _create_table_if_missing('team_recruitment_members',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recruitment_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['recruitment_id'], ['team_recruitments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('course_board_comment_likes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('comment_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['comment_id'], ['course_board_comments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('poll_options',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('poll_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.String(length=200), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['poll_id'], ['polls.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table_if_missing('poll_votes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('poll_id', sa.Integer(), nullable=False),
+    sa.Column('option_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['option_id'], ['poll_options.id'], ),
+    sa.ForeignKeyConstraint(['poll_id'], ['polls.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('poll_id', 'user_id', name='unique_poll_user_vote')
+    )
+
+    # 마이그레이션 도입 전 DB 보정
+    # is_pinned 컬럼 (add_pinned_column.py)
+    if "is_pinned" not in _column_names("course_board_posts"):
+        with op.batch_alter_table("course_board_posts") as batch_op:
+            batch_op.add_column(sa.Column("is_pinned", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    # 예전 course_board_posts.poll 컬럼 제거 (fix_poll_column.py, 투표는 polls 테이블 사용)
+    if "poll" in _column_names("course_board_posts"):
+        with op.batch_alter_table("course_board_posts") as batch_op:
+            batch_op.drop_column("poll")
+
+    # available_times.team_id 컬럼
+    if "team_id" not in _column_names("available_times"):
+        with op.batch_alter_table("available_times") as batch_op:
+            batch_op.add_column(sa.Column("team_id", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_table('poll_votes')
+    op.drop_table('poll_options')
+    op.drop_table('course_board_comment_likes')
+    op.drop_table('team_recruitment_members')
+    op.drop_table('team_availability_submissions')
+    op.drop_table('polls')
+    op.drop_table('enrollments')
+    op.drop_table('course_board_likes')
+    op.drop_table('course_board_comments')
+    op.drop_table('available_times')
+    op.drop_table('team_recruitments')
+    op.drop_table('schedules')
+    op.drop_table('notifications')
+    op.drop_table('courses')
+    op.drop_table('course_board_posts')
+    op.drop_table('user')
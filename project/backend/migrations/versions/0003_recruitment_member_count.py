@@ -0,0 +1,56 @@
+"""team recruitment member uniqueness and member_count
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 18:42:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def _has_unique(inspector, table, columns):
+    wanted = sorted(columns)
+    for constraint in inspector.get_unique_constraints(table):
+        if sorted(constraint['column_names']) == wanted:
+            return True
+    for index in inspector.get_indexes(table):
+        if index.get('unique') and sorted(index['column_names']) == wanted:
+            return True
+    return False
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # 중복 참여 정리 (가장 먼저 참여한 행만 유지) 후 유니크 인덱스
+    if not _has_unique(inspector, 'team_recruitment_members', ['recruitment_id', 'user_id']):
+        op.execute(
+            "DELETE FROM team_recruitment_members WHERE id NOT IN ("
+            "SELECT MIN(id) FROM team_recruitment_members GROUP BY recruitment_id, user_id)"
+        )
+        op.create_index('uq_recruitment_member', 'team_recruitment_members', ['recruitment_id', 'user_id'], unique=True)
+
+    # member_count 컬럼 추가 후 현재 인원으로 채우기
+    if 'member_count' not in [c['name'] for c in inspector.get_columns('team_recruitments')]:
+        with op.batch_alter_table('team_recruitments', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+        op.execute(
+            "UPDATE team_recruitments SET member_count = ("
+            "SELECT COUNT(*) FROM team_recruitment_members "
+            "WHERE team_recruitment_members.recruitment_id = team_recruitments.id)"
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('team_recruitments', schema=None) as batch_op:
+        batch_op.drop_column('member_count')
+
+    op.drop_index('uq_recruitment_member', table_name='team_recruitment_members')
@@ -0,0 +1,46 @@
+"""poll vote uniqueness
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:43:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def _has_unique(inspector, table, columns):
+    wanted = sorted(columns)
+    for constraint in inspector.get_unique_constraints(table):
+        if sorted(constraint['column_names']) == wanted:
+            return True
+    for index in inspector.get_indexes(table):
+        if index.get('unique') and sorted(index['column_names']) == wanted:
+            return True
+    return False
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # 중복 투표 정리 (가장 최근 투표만 유지) 후 유니크 인덱스 (ON CONFLICT 업서트 대상)
+    if not _has_unique(inspector, 'poll_votes', ['poll_id', 'user_id']):
+        op.execute(
+            "DELETE FROM poll_votes WHERE id NOT IN ("
+            "SELECT MAX(id) FROM poll_votes GROUP BY poll_id, user_id)"
+        )
+        op.create_index('unique_poll_user_vote', 'poll_votes', ['poll_id', 'user_id'], unique=True)
+
+
+def downgrade():
+    # 0001 에서 테이블 제약으로 만들어진 경우에는 인덱스가 없으므로 그대로 둔다
+    inspector = sa.inspect(op.get_bind())
+    if 'unique_poll_user_vote' in [index['name'] for index in inspector.get_indexes('poll_votes')]:
+        op.drop_index('unique_poll_user_vote', table_name='poll_votes')
@@ -0,0 +1,120 @@
+"""hot path indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 19:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('available_times', schema=None) as batch_op:
+        batch_op.create_index('ix_available_times_user_team', ['user_id', 'team_id'], unique=False)
+
+    with op.batch_alter_table('course_board_comment_likes', schema=None) as batch_op:
+        batch_op.create_index('ix_course_board_comment_likes_comment_user', ['comment_id', 'user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_course_board_comment_likes_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('course_board_comments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_course_board_comments_author_id'), ['author_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_course_board_comments_parent_comment_id'), ['parent_comment_id'], unique=False)
+        batch_op.create_index('ix_course_board_comments_post_created', ['post_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('course_board_likes', schema=None) as batch_op:
+        batch_op.create_index('ix_course_board_likes_post_user', ['post_id', 'user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_course_board_likes_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('course_board_posts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_course_board_posts_author_id'), ['author_id'], unique=False)
+        batch_op.create_index('ix_course_board_posts_course_pinned', ['course_id', 'is_pinned', 'id'], unique=False)
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_courses_professor_id'), ['professor_id'], unique=False)
+
+    with op.batch_alter_table('enrollments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_enrollments_course_id'), ['course_id'], unique=False)
+        batch_op.create_index('ix_enrollments_student_course', ['student_id', 'course_id'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_created', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('poll_options', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_poll_options_poll_id'), ['poll_id'], unique=False)
+
+    with op.batch_alter_table('poll_votes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_poll_votes_option_id'), ['option_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_poll_votes_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('polls', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_polls_post_id'), ['post_id'], unique=False)
+
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.create_index('ix_schedules_user_year_month', ['user_id', 'year', 'month'], unique=False)
+
+    with op.batch_alter_table('team_recruitment_members', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_team_recruitment_members_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('team_recruitments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_team_recruitments_course_id'), ['course_id'], unique=False)
+
+
+
+def downgrade():
+    with op.batch_alter_table('team_recruitments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_team_recruitments_course_id'))
+
+    with op.batch_alter_table('team_recruitment_members', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_team_recruitment_members_user_id'))
+
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_index('ix_schedules_user_year_month')
+
+    with op.batch_alter_table('polls', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_polls_post_id'))
+
+    with op.batch_alter_table('poll_votes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_poll_votes_user_id'))
+        batch_op.drop_index(batch_op.f('ix_poll_votes_option_id'))
+
+    with op.batch_alter_table('poll_options', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_poll_options_poll_id'))
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_created')
+
+    with op.batch_alter_table('enrollments', schema=None) as batch_op:
+        batch_op.drop_index('ix_enrollments_student_course')
+        batch_op.drop_index(batch_op.f('ix_enrollments_course_id'))
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_courses_professor_id'))
+
+    with op.batch_alter_table('course_board_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_course_board_posts_course_pinned')
+        batch_op.drop_index(batch_op.f('ix_course_board_posts_author_id'))
+
+    with op.batch_alter_table('course_board_likes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_course_board_likes_user_id'))
+        batch_op.drop_index('ix_course_board_likes_post_user')
+
+    with op.batch_alter_table('course_board_comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_course_board_comments_post_created')
+        batch_op.drop_index(batch_op.f('ix_course_board_comments_parent_comment_id'))
+        batch_op.drop_index(batch_op.f('ix_course_board_comments_author_id'))
+
+    with op.batch_alter_table('course_board_comment_likes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_course_board_comment_likes_user_id'))
+        batch_op.drop_index('ix_course_board_comment_likes_comment_user')
+
+    with op.batch_alter_table('available_times', schema=None) as batch_op:
+        batch_op.drop_index('ix_available_times_user_team')
+
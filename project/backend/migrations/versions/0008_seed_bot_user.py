@@ -0,0 +1,47 @@
+"""seed bot user
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 21:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# routes/available.py 의 봇 계정 상수와 같아야 함
+BOT_USERNAME = 'allmeet_bot'
+BOT_EMAIL = 'bot@allmeet.system'
+BOT_NAME = 'All Meet 🤖'
+BOT_STUDENT_ID = 'BOT000'
+UNUSABLE_PASSWORD_HASH = '!'
+
+
+def upgrade():
+    # 자동 추천 게시글 작성자 봇 계정 (이미 있으면 그대로 둠)
+    op.get_bind().execute(
+        sa.text(
+            'INSERT INTO "user" (student_id, name, email, username, password_hash, user_type, created_at) '
+            'SELECT :student_id, :name, :email, :username, :password_hash, :user_type, CURRENT_TIMESTAMP '
+            'WHERE NOT EXISTS (SELECT 1 FROM "user" WHERE username = :username OR email = :email)'
+        ),
+        {
+            'student_id': BOT_STUDENT_ID,
+            'name': BOT_NAME,
+            'email': BOT_EMAIL,
+            'username': BOT_USERNAME,
+            'password_hash': UNUSABLE_PASSWORD_HASH,
+            'user_type': 'bot',
+        },
+    )
+
+
+def downgrade():
+    # 봇이 작성한 게시글이 남아 있을 수 있으므로 계정은 지우지 않는다
+    pass
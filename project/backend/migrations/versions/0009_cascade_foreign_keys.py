@@ -0,0 +1,70 @@
+"""foreign keys on delete cascade
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 22:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# (테이블, 컬럼, 참조 테이블): 부모가 지워지면 함께 지워지는 자식 행
+CASCADE_FOREIGN_KEYS = [
+    ('available_times', 'team_id', 'team_recruitments'),
+    ('enrollments', 'course_id', 'courses'),
+    ('course_board_comments', 'post_id', 'course_board_posts'),
+    ('course_board_comments', 'parent_comment_id', 'course_board_comments'),
+    ('course_board_likes', 'post_id', 'course_board_posts'),
+    ('course_board_comment_likes', 'comment_id', 'course_board_comments'),
+    ('team_recruitment_members', 'recruitment_id', 'team_recruitments'),
+    ('polls', 'post_id', 'course_board_posts'),
+    ('poll_options', 'poll_id', 'polls'),
+    ('poll_votes', 'poll_id', 'polls'),
+    ('poll_votes', 'option_id', 'poll_options'),
+    ('team_availability_submissions', 'team_id', 'team_recruitments'),
+]
+
+# SQLite 는 이름 없는 FK 로 만들어져 있어서 batch 모드가 이 규칙으로 이름을 붙여 찾는다
+NAMING_CONVENTION = {
+    'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s',
+}
+
+
+def _foreign_key_name(inspector, table, column, referred):
+    for fk in inspector.get_foreign_keys(table):
+        if fk['constrained_columns'] == [column] and fk['referred_table'] == referred and fk['name']:
+            return fk['name']
+    return NAMING_CONVENTION['fk'] % {
+        'table_name': table, 'column_0_name': column, 'referred_table_name': referred,
+    }
+
+
+def _replace_foreign_keys(ondelete):
+    inspector = sa.inspect(op.get_bind())
+
+    tables = {}
+    for table, column, referred in CASCADE_FOREIGN_KEYS:
+        tables.setdefault(table, []).append((column, referred))
+
+    # 테이블마다 한 번만 다시 만든다 (SQLite batch 모드)
+    for table, foreign_keys in tables.items():
+        names = [_foreign_key_name(inspector, table, column, referred) for column, referred in foreign_keys]
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            for name, (column, referred) in zip(names, foreign_keys):
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade():
+    _replace_foreign_keys(None)
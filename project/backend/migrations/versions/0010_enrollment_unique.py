@@ -0,0 +1,33 @@
+"""enrollment uniqueness
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 22:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 중복 수강 정리 (가장 먼저 등록한 행만 유지) 후 유니크 인덱스 (일괄 등록의 ON CONFLICT 대상)
+    op.execute(
+        "DELETE FROM enrollments WHERE id NOT IN ("
+        "SELECT MIN(id) FROM enrollments GROUP BY student_id, course_id)"
+    )
+    with op.batch_alter_table('enrollments', schema=None) as batch_op:
+        batch_op.drop_index('ix_enrollments_student_course')
+        batch_op.create_index('uq_enrollment_student_course', ['student_id', 'course_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('enrollments', schema=None) as batch_op:
+        batch_op.drop_index('uq_enrollment_student_course')
+        batch_op.create_index('ix_enrollments_student_course', ['student_id', 'course_id'], unique=False)
@@ -0,0 +1,29 @@
+"""schedule date range index
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (user_id, year, month) → (user_id, year, month, date): 기간 조회 범위 스캔 + 날짜순 정렬
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_index('ix_schedules_user_year_month')
+        batch_op.create_index('ix_schedules_user_date', ['user_id', 'year', 'month', 'date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_index('ix_schedules_user_date')
+        batch_op.create_index('ix_schedules_user_year_month', ['user_id', 'year', 'month'], unique=False)
@@ -0,0 +1,85 @@
+"""course catalog search indexes
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-20 01:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+# DB 종류별 검색 객체라 모델에는 선언하지 않는다 (migrations/env.py 에서 autogenerate 비교 제외)
+# SQLite: batch_alter_table('courses') 는 테이블을 다시 만들면서 트리거를 지우므로
+#         courses 를 batch 로 바꾸는 마이그레이션은 트리거를 다시 만들어야 한다.
+SQLITE_TRIGGERS = {
+    'courses_title_fts_ai': (
+        "AFTER INSERT ON courses BEGIN "
+        "INSERT INTO courses_title_fts(rowid, title) VALUES (new.id, new.title); END"
+    ),
+    'courses_title_fts_ad': (
+        "AFTER DELETE ON courses BEGIN "
+        "INSERT INTO courses_title_fts(courses_title_fts, rowid, title) VALUES ('delete', old.id, old.title); END"
+    ),
+    'courses_title_fts_au': (
+        "AFTER UPDATE OF title ON courses BEGIN "
+        "INSERT INTO courses_title_fts(courses_title_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+        "INSERT INTO courses_title_fts(rowid, title) VALUES (new.id, new.title); END"
+    ),
+}
+
+
+def _sqlite_has_fts5(bind):
+    options = {row[0] for row in bind.exec_driver_sql("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in options
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        # 강의 코드 앞부분/강의명 일부 ILIKE 검색을 trigram GIN 인덱스로 처리
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_courses_code_trgm ON courses USING gin (code gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_courses_title_trgm ON courses USING gin (title gin_trgm_ops)")
+        return
+
+    if bind.dialect.name != 'sqlite':
+        return
+
+    # 강의 코드 앞부분: lower(code) 범위 조건으로 인덱스 범위 스캔
+    op.execute("CREATE INDEX ix_courses_code_lower ON courses (lower(code))")
+
+    # 강의명 일부: FTS5 trigram (외부 콘텐츠 테이블 = courses, 트리거로 동기화)
+    if not _sqlite_has_fts5(bind):
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE courses_title_fts USING fts5("
+        "title, content='courses', content_rowid='id', tokenize='trigram')"
+    )
+    for name, body in SQLITE_TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+    op.execute("INSERT INTO courses_title_fts(courses_title_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_courses_title_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_courses_code_trgm")
+        return
+
+    if bind.dialect.name != 'sqlite':
+        return
+
+    for name in SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS courses_title_fts")
+    op.execute("DROP INDEX IF EXISTS ix_courses_code_lower")
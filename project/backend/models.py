@@ -1,5 +1,9 @@
+import logging
+
 from extensions import db
 from datetime import datetime, timezone
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload
 
 # UTC로 현재 시간을 가져오는 함수
 def utcnow():
@@ -7,6 +11,7 @@ def utcnow():
     return datetime.now(timezone.utc)
 
 # UTC 시간을 ISO 형식으로 반환하는 헬퍼 함수 (프론트엔드에서 변환)
+# to_dict 에서는 datetime 을 그대로 넣고, 응답 직렬화 시 JSON 프로바이더가 같은 형식으로 변환한다 (json_provider.py)
 def to_iso_utc(dt):
     """UTC 시간을 ISO 형식 문자열로 반환
     프론트엔드에서 한국 시간으로 변환해서 표시합니다.
@@ -38,6 +43,10 @@ def to_iso_utc(dt):
                 return dt.isoformat() if hasattr(dt, 'isoformat') else str(dt)
         return None
 
+# 게시글/댓글/투표/팀 모집/강의의 자식 행은 FK ondelete="CASCADE" 로 DB 가 함께 지운다.
+# (SQLite 는 연결마다 PRAGMA foreign_keys=ON 이 필요 - sqlite_profile.py)
+# 관계(backref)에는 passive_deletes=True 를 둬서 ORM 이 자식 행을 읽어 FK 를 NULL 로 바꾸려 하지 않게 한다.
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.String(20), nullable=False)
@@ -48,6 +57,8 @@ class User(db.Model):
     user_type = db.Column(db.String(20), nullable=False, default='student')  # 'student' or 'professor'
     profile_image = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=utcnow)
+    # 리프레시 토큰 세대 (비밀번호 변경/재설정/탈퇴 시 +1 → 이전에 발급한 리프레시 토큰 전부 무효)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     def to_dict(self):
         return {
@@ -67,13 +78,15 @@ class AvailableTime(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    team_id = db.Column(db.Integer, db.ForeignKey("team_recruitments.id"), nullable=True)  # null이면 대시보드용, 값이 있으면 해당 팀용
+    team_id = db.Column(db.Integer, db.ForeignKey("team_recruitments.id", ondelete="CASCADE"), nullable=True)  # null이면 대시보드용, 값이 있으면 해당 팀용
     day_of_week = db.Column(db.String(10), nullable=False)
     start_time = db.Column(db.Time, nullable=False)
     end_time = db.Column(db.Time, nullable=False)
 
     user = db.relationship("User", backref=db.backref("available_times", lazy=True))
-    team = db.relationship("TeamRecruitment", backref=db.backref("team_available_times", lazy=True))
+    team = db.relationship("TeamRecruitment", backref=db.backref("team_available_times", lazy=True, passive_deletes=True))
+
+    __table_args__ = (db.Index("ix_available_times_user_team", "user_id", "team_id"),)
 
     def to_dict(self):
         return {
@@ -92,7 +105,7 @@ class Course(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     code = db.Column(db.String(20), nullable=False, unique=True)
-    professor_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    professor_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=utcnow)
 
     professor = db.relationship("User", backref=db.backref("courses", lazy=True))
@@ -104,7 +117,7 @@ class Course(db.Model):
             "code": self.code,
             "professor_id": self.professor_id,
             "professor_name": self.professor.name if self.professor else None,
-            "created_at": to_iso_utc(self.created_at)
+            "created_at": self.created_at
         }
 
 # 수강 신청 (학생-강의 관계)
@@ -113,11 +126,14 @@ class Enrollment(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey("courses.id"), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
     enrolled_at = db.Column(db.DateTime, default=utcnow)
 
     student = db.relationship("User", backref=db.backref("enrollments", lazy=True))
-    course = db.relationship("Course", backref=db.backref("enrollments", lazy=True))
+    course = db.relationship("Course", backref=db.backref("enrollments", lazy=True, passive_deletes=True))
+
+    # 학생별 수강 목록 조회 + 중복 등록 방지 (일괄 등록의 ON CONFLICT 대상)
+    __table_args__ = (db.Index("uq_enrollment_student_course", "student_id", "course_id", unique=True),)
 
     def to_dict(self):
         return {
@@ -125,7 +141,7 @@ class Enrollment(db.Model):
             "student_id": self.student_id,
             "course_id": self.course_id,
             "course": self.course.to_dict() if self.course else None,
-            "enrolled_at": to_iso_utc(self.enrolled_at)
+            "enrolled_at": self.enrolled_at
         }
 
 # 게시판
@@ -134,7 +150,7 @@ class CourseBoardPost(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     course_id = db.Column(db.String(20), nullable=False)
-    author_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), index=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
     category = db.Column(db.String(50), nullable=False)
@@ -145,16 +161,59 @@ class CourseBoardPost(db.Model):
 
     author = db.relationship("User")
 
-    def to_dict(self, user_id=None):
-        # 좋아요 개수 계산
-        likes_count = CourseBoardLike.query.filter_by(post_id=self.id).count()
-        # 현재 사용자가 좋아요 했는지 확인
-        is_liked = False
+    # 강의별 목록: WHERE course_id = ? ORDER BY is_pinned DESC, id DESC 를 인덱스 순서대로 읽음
+    __table_args__ = (db.Index("ix_course_board_posts_course_pinned", "course_id", "is_pinned", "id"),)
+
+    @staticmethod
+    def load_list_extras(posts, user_id=None):
+        """게시글 목록의 좋아요/댓글 수, 내 좋아요, 투표를 게시글 수와 관계없이 한 번에 조회
+
+        좋아요 수 1번 + 내 좋아요 1번 + 댓글 수 1번 + 투표 3번 (poll_service.build_poll_results)
+        """
+        from poll_service import build_poll_results
+        from resource_version import current_version
+
+        post_ids = [post.id for post in posts]
+        if not post_ids:
+            return {"likes": {}, "liked": set(), "comments": {}, "polls": {}}
+
+        likes = dict(
+            db.session.query(CourseBoardLike.post_id, func.count(CourseBoardLike.id))
+            .filter(CourseBoardLike.post_id.in_(post_ids))
+            .group_by(CourseBoardLike.post_id)
+            .all()
+        )
+        liked = set()
         if user_id:
-            is_liked = CourseBoardLike.query.filter_by(post_id=self.id, user_id=user_id).first() is not None
-        
-        # 댓글 개수 계산
-        comments_count = CourseBoardComment.query.filter_by(post_id=self.id).count()
+            liked = {
+                post_id for (post_id,) in db.session.query(CourseBoardLike.post_id)
+                .filter(CourseBoardLike.post_id.in_(post_ids), CourseBoardLike.user_id == user_id)
+            }
+        comments = dict(
+            db.session.query(CourseBoardComment.post_id, func.count(CourseBoardComment.id))
+            .filter(CourseBoardComment.post_id.in_(post_ids))
+            .group_by(CourseBoardComment.post_id)
+            .all()
+        )
+
+        # Poll 데이터 조회 (득표 수는 poll_service 에서 GROUP BY 한 번 + TTL 캐시)
+        polls = {}
+        try:
+            # 목록 ETag 와 같은 버전의 집계만 사용 (한 목록은 같은 강의의 게시글)
+            polls = build_poll_results(post_ids, user_id, version=current_version(f"board:{posts[0].course_id}"))
+        except Exception:
+            logging.getLogger(__name__).exception("Poll 데이터 조회 오류 (게시글 ID: %s)", post_ids)
+
+        return {"likes": likes, "liked": liked, "comments": comments, "polls": polls}
+
+    def to_dict(self, user_id=None, extras=None):
+        # 목록에서는 load_list_extras() 로 한 번에 읽은 값을 넘겨받는다
+        if extras is None:
+            extras = CourseBoardPost.load_list_extras([self], user_id)
+        likes_count = extras["likes"].get(self.id, 0)
+        is_liked = self.id in extras["liked"]
+        comments_count = extras["comments"].get(self.id, 0)
+        poll_data = extras["polls"].get(self.id)
         
         # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
         author_student_id = None
@@ -179,80 +238,6 @@ class CourseBoardPost(db.Model):
             except:
                 files_data = []
         
-        # Poll 데이터 조회 (Poll 모델이 파일 끝에 정의되어 있어서 동적으로 가져오기)
-        poll_data = None
-        try:
-            # Poll 모델이 정의되어 있는지 확인
-            import sys
-            current_module = sys.modules[__name__]
-            Poll = getattr(current_module, 'Poll', None)
-            PollOption = getattr(current_module, 'PollOption', None)
-            PollVote = getattr(current_module, 'PollVote', None)
-            
-            if Poll:
-                poll = Poll.query.filter_by(post_id=self.id).first()
-                if poll:
-                    # 현재 사용자의 투표 여부 확인
-                    user_vote = None
-                    if user_id and PollVote:
-                        vote = PollVote.query.filter_by(poll_id=poll.id, user_id=user_id).first()
-                        if vote:
-                            user_vote = vote.option_id
-                    
-                    # 투표 옵션과 득표 수, 투표한 사용자 정보
-                    options_data = []
-                    total_votes = 0
-                    if hasattr(poll, 'options_relation') and PollVote:
-                        for option in poll.options_relation:
-                            votes = PollVote.query.filter_by(option_id=option.id).all()
-                            votes_count = len(votes)
-                            total_votes += votes_count
-                            
-                            # 투표한 사용자 정보
-                            voters = []
-                            for vote in votes:
-                                user = User.query.get(vote.user_id)
-                                if user:
-                                    # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
-                                    author_student_id = None
-                                    user_type = getattr(user, "user_type", None)
-                                    if user_type == "student":
-                                        author_student_id = user.student_id
-                                    # 봇 계정의 경우 student_id 숨김
-                                    elif user_type == "bot":
-                                        author_student_id = None
-                                    
-                                    is_professor = user_type == "professor"
-                                    
-                                    voters.append({
-                                        "id": user.id,
-                                        "name": user.name,
-                                        "student_id": author_student_id,
-                                        "is_professor": is_professor,
-                                        "profile_image": user.profile_image
-                                    })
-                            
-                            options_data.append({
-                                "id": option.id,
-                                "text": option.text,
-                                "votes": votes_count,
-                                "voters": voters
-                            })
-                    
-                    poll_data = {
-                        "id": poll.id,
-                        "question": poll.question,
-                        "options": options_data,
-                        "total_votes": total_votes,
-                        "user_vote": user_vote,
-                        "expires_at": poll.expires_at.isoformat() if poll.expires_at else None
-                    }
-        except Exception as e:
-            # Poll 모델이 없거나 오류 발생 시 None 반환
-            import traceback
-            print(f"Poll 데이터 조회 오류 (게시글 ID: {self.id}): {str(e)}")
-            poll_data = None
-        
         return {
             "id": self.id,
             "course_id": self.course_id,
@@ -267,7 +252,7 @@ class CourseBoardPost(db.Model):
             "team_board_name": self.team_board_name,
             "files": files_data,
             "poll": poll_data,
-            "created_at": to_iso_utc(self.created_at),
+            "created_at": self.created_at,
             "likes": likes_count,
             "is_liked": is_liked,
             "comments_count": comments_count,
@@ -279,14 +264,18 @@ class CourseBoardComment(db.Model):
     __tablename__ = "course_board_comments"
 
     id = db.Column(db.Integer, primary_key=True)
-    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id"), nullable=False)
-    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    parent_comment_id = db.Column(db.Integer, db.ForeignKey("course_board_comments.id"), nullable=True)
+    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id", ondelete="CASCADE"), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    parent_comment_id = db.Column(
+        db.Integer, db.ForeignKey("course_board_comments.id", ondelete="CASCADE"), nullable=True, index=True
+    )
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=utcnow)
 
     author = db.relationship("User")
-    post = db.relationship("CourseBoardPost", backref=db.backref("board_comments", lazy=True))
+    post = db.relationship("CourseBoardPost", backref=db.backref("board_comments", lazy=True, passive_deletes=True))
+
+    __table_args__ = (db.Index("ix_course_board_comments_post_created", "post_id", "created_at"),)
 
     def to_dict(self, user_id=None):
         # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
@@ -324,7 +313,7 @@ class CourseBoardComment(db.Model):
             "content": self.content,
             "likes": likes_count,
             "is_liked": is_liked,
-            "created_at": to_iso_utc(self.created_at)
+            "created_at": self.created_at
         }
 
 # 게시판 좋아요
@@ -332,12 +321,14 @@ class CourseBoardLike(db.Model):
     __tablename__ = "course_board_likes"
 
     id = db.Column(db.Integer, primary_key=True)
-    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id"), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id", ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=utcnow)
 
     user = db.relationship("User")
-    post = db.relationship("CourseBoardPost", backref=db.backref("board_likes", lazy=True))
+    post = db.relationship("CourseBoardPost", backref=db.backref("board_likes", lazy=True, passive_deletes=True))
+
+    __table_args__ = (db.Index("ix_course_board_likes_post_user", "post_id", "user_id"),)
 
 
 # 댓글 좋아요
@@ -345,12 +336,14 @@ class CourseBoardCommentLike(db.Model):
     __tablename__ = "course_board_comment_likes"
 
     id = db.Column(db.Integer, primary_key=True)
-    comment_id = db.Column(db.Integer, db.ForeignKey("course_board_comments.id"), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    comment_id = db.Column(db.Integer, db.ForeignKey("course_board_comments.id", ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=utcnow)
 
     user = db.relationship("User")
-    comment = db.relationship("CourseBoardComment", backref=db.backref("comment_likes", lazy=True))
+    comment = db.relationship("CourseBoardComment", backref=db.backref("comment_likes", lazy=True, passive_deletes=True))
+
+    __table_args__ = (db.Index("ix_course_board_comment_likes_comment_user", "comment_id", "user_id"),)
 
 
 # 팀 모집
@@ -359,20 +352,32 @@ class TeamRecruitment(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     # 강의 코드 사용 (CourseBoardPost.course_id 와 동일한 형태)
-    course_id = db.Column(db.String(20), nullable=False)
+    course_id = db.Column(db.String(20), nullable=False, index=True)
     author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     team_board_name = db.Column(db.String(100), nullable=True)
     max_members = db.Column(db.Integer, nullable=False, default=3)
+    member_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # 현재 참여 인원 (비정규화, 조건부 UPDATE 로만 증감)
     is_board_activated = db.Column(db.Boolean, default=False)  # 팀 게시판 활성화 여부
     created_at = db.Column(db.DateTime, default=utcnow)
 
     author = db.relationship("User")
 
+    @classmethod
+    def eager_query(cls):
+        """목록 직렬화용 쿼리
+        작성자는 joinedload, 멤버와 멤버 유저는 selectinload 로 한꺼번에 로드해서
+        to_dict 를 여러 번 호출해도 모집글 수와 상관없이 쿼리 3번으로 끝난다.
+        """
+        return cls.query.options(
+            joinedload(cls.author),
+            selectinload(cls.members).selectinload(TeamRecruitmentMember.user),
+        )
+
     def to_dict(self, user_id=None):
-        # 현재 모집에 참여한 멤버들
-        members = TeamRecruitmentMember.query.filter_by(recruitment_id=self.id).all()
+        # 현재 모집에 참여한 멤버들 (eager_query 로 로드된 경우 추가 쿼리 없음)
+        members = self.members
         members_list = [m.user.name for m in members if m.user]
         members_data = []
         for m in members:
@@ -410,9 +415,7 @@ class TeamRecruitment(db.Model):
         # 현재 유저가 참여 중인지 확인
         is_joined = False
         if user_id is not None:
-            is_joined = TeamRecruitmentMember.query.filter_by(
-                recruitment_id=self.id, user_id=user_id
-            ).first() is not None
+            is_joined = any(m.user_id == int(user_id) for m in members)
 
         # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
         author_student_id = None
@@ -446,7 +449,7 @@ class TeamRecruitment(db.Model):
             "members": members_data,
             "is_joined": is_joined,
             "is_board_activated": self.is_board_activated,
-            "created_at": to_iso_utc(self.created_at),
+            "created_at": self.created_at,
         }
 
 
@@ -455,15 +458,18 @@ class TeamRecruitmentMember(db.Model):
     __tablename__ = "team_recruitment_members"
 
     id = db.Column(db.Integer, primary_key=True)
-    recruitment_id = db.Column(db.Integer, db.ForeignKey("team_recruitments.id"), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    recruitment_id = db.Column(db.Integer, db.ForeignKey("team_recruitments.id", ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     joined_at = db.Column(db.DateTime, default=utcnow)
 
     user = db.relationship("User")
     recruitment = db.relationship(
-        "TeamRecruitment", backref=db.backref("members", lazy=True)
+        "TeamRecruitment",
+        backref=db.backref("members", lazy=True, order_by="TeamRecruitmentMember.id", passive_deletes=True),
     )
 
+    __table_args__ = (db.Index("uq_recruitment_member", "recruitment_id", "user_id", unique=True),)
+
 
 # 개인 일정
 class Schedule(db.Model):
@@ -481,6 +487,9 @@ class Schedule(db.Model):
 
     user = db.relationship("User", backref=db.backref("schedules", lazy=True))
 
+    # 월 조회 + 여러 달 기간 조회/날짜순 정렬 (year, month, date) 행 값 비교
+    __table_args__ = (db.Index("ix_schedules_user_date", "user_id", "year", "month", "date"),)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -491,7 +500,7 @@ class Schedule(db.Model):
             "year": self.year,
             "color": self.color,
             "category": self.category,
-            "created_at": to_iso_utc(self.created_at)
+            "created_at": self.created_at
         }
 
 
@@ -511,6 +520,8 @@ class Notification(db.Model):
 
     user = db.relationship("User", backref=db.backref("notifications", lazy=True))
 
+    __table_args__ = (db.Index("ix_notifications_user_created", "user_id", "created_at"),)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -520,44 +531,74 @@ class Notification(db.Model):
             "comment_id": self.comment_id,
             "course_id": self.course_id,
             "is_read": self.is_read,
-            "created_at": to_iso_utc(self.created_at),
+            "created_at": self.created_at,
         }
 
+# 알림 아웃박스 (도메인 변경과 같은 트랜잭션에 기록 → 백그라운드 디스패처가 Notification 으로 변환)
+class NotificationOutbox(db.Model):
+    __tablename__ = "notification_outbox"
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient_ids = db.Column(db.Text, nullable=False)  # 받는 사람 user.id 목록 (JSON 배열)
+    type = db.Column(db.String(50), nullable=False)
+    content = db.Column(db.String(500), nullable=False)
+    related_id = db.Column(db.Integer, nullable=True)
+    comment_id = db.Column(db.Integer, nullable=True)
+    course_id = db.Column(db.String(20), nullable=True)
+    created_at = db.Column(db.DateTime, default=utcnow)
+    # 예전에는 전송 후 시각을 기록하고 행을 남겼다 (지금은 전송하면서 지움, 남은 행은 orphan_sweep 이 정리)
+    dispatched_at = db.Column(db.DateTime, nullable=True, index=True)  # null 이면 아직 전송 전
+
+# 리소스 버전 (ETag 용, 쓰기 라우트가 같은 트랜잭션에서 1씩 증가시킴)
+class ResourceVersion(db.Model):
+    __tablename__ = "resource_versions"
+
+    key = db.Column(db.String(100), primary_key=True)  # 예: "board:CS101", "notifications:3"
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# 폐기된 리프레시 토큰 (회전/로그아웃 시 기록, 토큰 만료 후에는 주기적으로 삭제)
+class RevokedToken(db.Model):
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(36), primary_key=True)  # JWT 고유 ID
+    user_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # 원래 토큰 만료 시각
+
 # 투표
 class Poll(db.Model):
     __tablename__ = "polls"
 
     id = db.Column(db.Integer, primary_key=True)
-    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id"), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id", ondelete="CASCADE"), nullable=False, index=True)
     question = db.Column(db.String(500), nullable=False)
     expires_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=utcnow)
 
-    post = db.relationship("CourseBoardPost", backref=db.backref("poll_relation", lazy=True))
+    post = db.relationship("CourseBoardPost", backref=db.backref("poll_relation", lazy=True, passive_deletes=True))
 
 # 투표 옵션
 class PollOption(db.Model):
     __tablename__ = "poll_options"
 
     id = db.Column(db.Integer, primary_key=True)
-    poll_id = db.Column(db.Integer, db.ForeignKey("polls.id"), nullable=False)
+    poll_id = db.Column(db.Integer, db.ForeignKey("polls.id", ondelete="CASCADE"), nullable=False, index=True)
     text = db.Column(db.String(200), nullable=False)
     created_at = db.Column(db.DateTime, default=utcnow)
 
-    poll = db.relationship("Poll", backref=db.backref("options_relation", lazy=True, cascade="all, delete-orphan"))
+    poll = db.relationship("Poll", backref=db.backref("options_relation", lazy=True, cascade="all, delete-orphan", passive_deletes=True))
 
 # 투표 기록
 class PollVote(db.Model):
     __tablename__ = "poll_votes"
 
     id = db.Column(db.Integer, primary_key=True)
-    poll_id = db.Column(db.Integer, db.ForeignKey("polls.id"), nullable=False)
-    option_id = db.Column(db.Integer, db.ForeignKey("poll_options.id"), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    poll_id = db.Column(db.Integer, db.ForeignKey("polls.id", ondelete="CASCADE"), nullable=False)
+    option_id = db.Column(db.Integer, db.ForeignKey("poll_options.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=utcnow)
 
-    poll = db.relationship("Poll", backref=db.backref("votes_relation", lazy=True))
-    option = db.relationship("PollOption", backref=db.backref("votes_relation", lazy=True))
+    poll = db.relationship("Poll", backref=db.backref("votes_relation", lazy=True, passive_deletes=True))
+    option = db.relationship("PollOption", backref=db.backref("votes_relation", lazy=True, passive_deletes=True))
     user = db.relationship("User", backref=db.backref("poll_votes", lazy=True))
 
     __table_args__ = (db.UniqueConstraint('poll_id', 'user_id', name='unique_poll_user_vote'),)
@@ -572,7 +613,7 @@ class TeamAvailabilitySubmission(db.Model):
     __tablename__ = "team_availability_submissions"
 
     id = db.Column(db.Integer, primary_key=True)
-    team_id = db.Column(db.Integer, db.ForeignKey("team_recruitments.id"), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey("team_recruitments.id", ondelete="CASCADE"), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     submitted_at = db.Column(db.DateTime, default=utcnow)
 
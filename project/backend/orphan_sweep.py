@@ -0,0 +1,164 @@
+"""
+고아 행 정리 작업
+
+ON DELETE CASCADE(마이그레이션 0009) 이전에는 게시글/댓글/모집글/강의/계정을 지울 때
+자식 행을 코드에서 직접 지웠고, 빠뜨린 것들(하위 답글의 좋아요, 삭제된 강의의 게시글,
+탈퇴한 사용자의 투표/댓글 좋아요 등)이 부모 없이 남아 있다.
+부모가 없는 행을 찾아 batch_size 개씩 지우고 배치마다 commit 한다.
+(한 번에 지우면 큰 테이블에서 쓰기 잠금을 오래 잡으므로)
+
+부모 쪽부터 정리하므로 한 번 실행하면 고아의 고아(삭제된 강의 → 게시글 → 댓글 → 좋아요)까지 모두 지운다.
+예전 디스패처가 전송 후 남겨 둔 알림 아웃박스 행(dispatched_at 이 있는 행)도 함께 지운다.
+여러 번 실행해도 안전하다.
+
+사용법: python orphan_sweep.py [배치 크기]
+"""
+import logging
+import os
+import sys
+
+from sqlalchemy import and_, delete, exists, func, select, update
+from sqlalchemy.orm import aliased
+
+from attachments import attachment_filenames, remove_attachments
+from extensions import db
+from models import (
+    AvailableTime,
+    Course,
+    CourseBoardComment,
+    CourseBoardCommentLike,
+    CourseBoardLike,
+    CourseBoardPost,
+    Enrollment,
+    Notification,
+    NotificationOutbox,
+    Poll,
+    PollOption,
+    PollVote,
+    Schedule,
+    TeamAvailabilitySubmission,
+    TeamRecruitment,
+    TeamRecruitmentMember,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# (자식 모델, 자식 컬럼 이름, 부모 모델, 부모 컬럼 이름) - 부모 쪽부터
+ORPHAN_CHECKS = [
+    # 게시글/팀 모집글은 강의 코드(문자열)로 연결되어 FK 가 없다
+    (CourseBoardPost, "course_id", Course, "code"),
+    (CourseBoardPost, "author_id", User, "id"),
+    (TeamRecruitment, "course_id", Course, "code"),
+    (TeamRecruitment, "author_id", User, "id"),
+    (CourseBoardComment, "post_id", CourseBoardPost, "id"),
+    (CourseBoardComment, "parent_comment_id", CourseBoardComment, "id"),
+    (CourseBoardComment, "author_id", User, "id"),
+    (CourseBoardCommentLike, "comment_id", CourseBoardComment, "id"),
+    (CourseBoardCommentLike, "user_id", User, "id"),
+    (CourseBoardLike, "post_id", CourseBoardPost, "id"),
+    (CourseBoardLike, "user_id", User, "id"),
+    (Poll, "post_id", CourseBoardPost, "id"),
+    (PollOption, "poll_id", Poll, "id"),
+    (PollVote, "poll_id", Poll, "id"),
+    (PollVote, "option_id", PollOption, "id"),
+    (PollVote, "user_id", User, "id"),
+    (Enrollment, "course_id", Course, "id"),
+    (Enrollment, "student_id", User, "id"),
+    (TeamRecruitmentMember, "recruitment_id", TeamRecruitment, "id"),
+    (TeamRecruitmentMember, "user_id", User, "id"),
+    (AvailableTime, "team_id", TeamRecruitment, "id"),
+    (AvailableTime, "user_id", User, "id"),
+    (TeamAvailabilitySubmission, "team_id", TeamRecruitment, "id"),
+    (TeamAvailabilitySubmission, "user_id", User, "id"),
+    (Schedule, "user_id", User, "id"),
+    (Notification, "user_id", User, "id"),
+]
+
+
+def _orphan_condition(model, column_name, parent_model, parent_column_name):
+    column = getattr(model, column_name)
+    # 댓글 → 부모 댓글처럼 같은 테이블을 가리킬 수 있으므로 부모는 별칭으로 조회
+    parent = aliased(parent_model)
+    return and_(column.isnot(None), ~exists().where(getattr(parent, parent_column_name) == column))
+
+
+def _sweep(model, condition, batch_size):
+    deleted = 0
+    while True:
+        ids = db.session.scalars(select(model.id).where(condition).limit(batch_size)).all()
+        if not ids:
+            return deleted
+
+        filenames = []
+        if model is CourseBoardPost:
+            for (files,) in db.session.execute(
+                select(CourseBoardPost.files).where(CourseBoardPost.id.in_(ids), CourseBoardPost.files.isnot(None))
+            ):
+                filenames.extend(attachment_filenames(files))
+
+        db.session.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+        db.session.commit()
+        remove_attachments(filenames)
+        deleted += len(ids)
+
+
+def _recount_members():
+    """참여자 행을 지웠으면 모집글 인원 수를 실제 참여자 수로 맞춘다"""
+    member_count = (
+        select(func.count(TeamRecruitmentMember.id))
+        .where(TeamRecruitmentMember.recruitment_id == TeamRecruitment.id)
+        .scalar_subquery()
+    )
+    fixed = db.session.execute(
+        update(TeamRecruitment)
+        .where(TeamRecruitment.member_count != member_count)
+        .values(member_count=member_count)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return fixed
+
+
+def sweep_orphans(batch_size=DEFAULT_BATCH_SIZE):
+    """부모가 없는 행 삭제 (app_context 안에서 호출), 반환값: {"테이블.컬럼": 삭제 행 수}"""
+    counts = {}
+    for model, column_name, parent_model, parent_column_name in ORPHAN_CHECKS:
+        condition = _orphan_condition(model, column_name, parent_model, parent_column_name)
+        deleted = _sweep(model, condition, batch_size)
+        if deleted:
+            counts[f"{model.__tablename__}.{column_name}"] = deleted
+            logger.info("고아 행 정리: %s.%s %d개", model.__tablename__, column_name, deleted)
+
+    deleted = _sweep(NotificationOutbox, NotificationOutbox.dispatched_at.isnot(None), batch_size)
+    if deleted:
+        counts[f"{NotificationOutbox.__tablename__}.dispatched_at"] = deleted
+        logger.info("전송된 알림 아웃박스 행 정리: %d개", deleted)
+
+    if any(key.startswith(TeamRecruitmentMember.__tablename__) for key in counts):
+        counts["team_recruitments.member_count"] = _recount_members()
+    return counts
+
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE
+
+    sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+    os.environ.setdefault("OUTBOX_DISPATCHER_ENABLED", "0")
+    from app import app
+
+    with app.app_context():
+        counts = sweep_orphans(batch_size)
+
+    if not counts:
+        print("✅ 정리할 고아 행이 없습니다.")
+        return
+    print("🧹 고아 행 정리 완료")
+    for key, count in counts.items():
+        print(f"   {key}: {count}")
+
+
+if __name__ == "__main__":
+    main()
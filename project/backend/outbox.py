@@ -0,0 +1,199 @@
+"""
+알림 아웃박스(transactional outbox)
+
+라우트는 enqueue_notification() 으로 알림 이벤트를 세션에 추가만 하고,
+도메인 변경과 함께 한 번만 commit 한다.
+실제 Notification 행은 백그라운드 디스패처가 배치 단위로 생성한다.
+전송한 이벤트 행은 Notification 을 만드는 트랜잭션에서 함께 지우므로 아웃박스에는 미전송 이벤트만 남는다.
+
+디스패처 스레드는 fork 로 복사되지 않으므로 gunicorn --preload 에서는 워커마다
+start_dispatcher_after_fork() 로 다시 띄운다 (gunicorn.conf.py 의 post_fork)
+"""
+import json
+import logging
+import threading
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session
+
+from extensions import db
+from metrics import NOTIFICATION_FANOUT, NOTIFICATIONS_DISPATCHED
+from models import Notification, NotificationOutbox, User
+from password_service import UNUSABLE_PASSWORD_HASH
+from resource_version import bump_versions
+
+logger = logging.getLogger(__name__)
+
+# 아웃박스에 새 이벤트가 commit 되면 디스패처를 바로 깨우기 위한 이벤트
+_wakeup = threading.Event()
+_dispatcher_thread = None
+_dispatcher_app = None
+
+
+def enqueue_notification(recipient_ids, type, content, related_id=None, comment_id=None, course_id=None):
+    """알림 이벤트를 현재 트랜잭션에 추가 (commit 은 호출한 쪽에서)"""
+    recipients = []
+    for recipient_id in recipient_ids:
+        if recipient_id is None:
+            continue
+        recipient_id = int(recipient_id)
+        if recipient_id not in recipients:
+            recipients.append(recipient_id)
+
+    if not recipients:
+        return None
+    NOTIFICATION_FANOUT.labels(type).observe(len(recipients))
+
+    outbox_event = NotificationOutbox(
+        recipient_ids=json.dumps(recipients),
+        type=type,
+        content=content,
+        related_id=related_id,
+        comment_id=comment_id,
+        course_id=course_id,
+    )
+    db.session.add(outbox_event)
+    db.session.info["outbox_pending"] = True
+    return outbox_event
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop("outbox_pending", False):
+        _wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_flag(session):
+    session.info.pop("outbox_pending", None)
+
+
+def _claim(event_ids):
+    """아직 아무도 가져가지 않은 이벤트를 지우면서 선점, 반환값: 이번에 선점한 id 집합
+
+    Notification 생성과 같은 트랜잭션이므로 실패하면 이벤트도 되살아난다.
+    RETURNING 을 지원하는 DB(PostgreSQL, SQLite 3.35+)는 DELETE 한 번으로 배치 전체를 선점한다.
+    지원하지 않는 DB 는 이벤트마다 DELETE 해서 지워진 행 수로 선점 여부를 판단한다.
+    """
+    not_dispatched = NotificationOutbox.dispatched_at.is_(None)
+    if db.engine.dialect.delete_returning:
+        return set(db.session.scalars(
+            delete(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(event_ids), not_dispatched)
+            .returning(NotificationOutbox.id)
+            .execution_options(synchronize_session=False)
+        ))
+
+    claimed = set()
+    for event_id in event_ids:
+        if db.session.execute(
+            delete(NotificationOutbox)
+            .where(NotificationOutbox.id == event_id, not_dispatched)
+            .execution_options(synchronize_session=False)
+        ).rowcount:
+            claimed.add(event_id)
+    return claimed
+
+
+def dispatch_pending(batch_size=100):
+    """미전송 이벤트를 최대 batch_size 개 꺼내 Notification 으로 변환 (1 commit)
+
+    여러 워커가 동시에 돌더라도 이벤트 행을 DELETE 로 선점하므로 (먼저 지운 쪽만 전송)
+    같은 이벤트가 두 번 전송되지 않는다. (배치 전체를 DELETE 한 번으로 선점)
+    """
+    events = (
+        NotificationOutbox.query.filter(NotificationOutbox.dispatched_at.is_(None))
+        .order_by(NotificationOutbox.id.asc())
+        .limit(batch_size)
+        .all()
+    )
+    if not events:
+        return 0
+
+    claimed = _claim([outbox_event.id for outbox_event in events])
+    rows = []
+    for outbox_event in events:
+        if outbox_event.id not in claimed:
+            continue
+
+        for recipient_id in json.loads(outbox_event.recipient_ids):
+            rows.append({
+                "user_id": recipient_id,
+                "type": outbox_event.type,
+                "content": outbox_event.content,
+                "related_id": outbox_event.related_id,
+                "comment_id": outbox_event.comment_id,
+                "course_id": outbox_event.course_id,
+                "is_read": False,
+                "created_at": outbox_event.created_at,
+            })
+
+    if rows:
+        # 이벤트가 쌓인 뒤 탈퇴한 사용자, 탈퇴 처리 중('!' 해시)인 사용자 몫은 버린다
+        # (FK 검사로 배치 전체가 실패하거나, 삭제 중인 사용자에게 알림이 다시 생기지 않도록)
+        recipient_ids = {row["user_id"] for row in rows}
+        existing = set(db.session.scalars(
+            select(User.id).where(
+                User.id.in_(recipient_ids), ~User.password_hash.startswith(UNUSABLE_PASSWORD_HASH)
+            )
+        ))
+        if len(existing) < len(recipient_ids):
+            rows = [row for row in rows if row["user_id"] in existing]
+
+    if rows:
+        db.session.execute(insert(Notification), rows)
+        # 받는 사람들의 알림 목록 ETag 갱신
+        bump_versions(*(f"notifications:{row['user_id']}" for row in rows))
+    db.session.commit()
+    NOTIFICATIONS_DISPATCHED.inc(len(rows))
+    return len(events)
+
+
+def drain(batch_size=100):
+    """아웃박스가 빌 때까지 배치 디스패치 반복"""
+    total = 0
+    while True:
+        count = dispatch_pending(batch_size)
+        total += count
+        if count < batch_size:
+            return total
+
+
+def start_dispatcher(app):
+    """워커 프로세스마다 하나의 데몬 스레드로 디스패처 실행"""
+    global _dispatcher_thread, _dispatcher_app
+
+    _dispatcher_app = app
+    if not app.config.get("OUTBOX_DISPATCHER_ENABLED", True):
+        return None
+    if _dispatcher_thread is not None and _dispatcher_thread.is_alive():
+        return _dispatcher_thread
+
+    interval = app.config.get("OUTBOX_DISPATCH_INTERVAL", 2.0)
+    batch_size = app.config.get("OUTBOX_BATCH_SIZE", 100)
+
+    def run():
+        while True:
+            _wakeup.wait(interval)
+            _wakeup.clear()
+            with app.app_context():
+                try:
+                    drain(batch_size)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("알림 아웃박스 디스패치 오류")
+
+    _dispatcher_thread = threading.Thread(target=run, name="notification-outbox", daemon=True)
+    _dispatcher_thread.start()
+    return _dispatcher_thread
+
+
+def start_dispatcher_after_fork():
+    """fork 된 워커에서 디스패처 스레드를 새로 시작 (마스터의 스레드는 워커에 없다)"""
+    global _wakeup
+
+    if _dispatcher_app is None:
+        return None
+    # fork 시점에 다른 스레드가 잡고 있던 내부 락을 물려받지 않도록 이벤트도 새로 만든다
+    _wakeup = threading.Event()
+    return start_dispatcher(_dispatcher_app)
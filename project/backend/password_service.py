@@ -0,0 +1,202 @@
+"""
+비밀번호 해시/검증 서비스 (bcrypt)
+
+bcrypt 는 일부러 느린 CPU 작업이라 학기 초 로그인이 몰리면 요청 워커가 해시 계산에 묶인다.
+해시/검증은 워커 프로세스마다 하나씩 두는 작은 프로세스 풀에서 실행하고,
+풀에 들어갈 수 있는 작업 수를 제한해서 넘치면 기다리다가 503 으로 빠르게 실패시킨다.
+(무한히 쌓이면 모든 요청의 응답 시간이 같이 늘어나므로)
+
+로그인할 때 저장된 해시의 cost 가 현재 설정과 다르면 새 cost 로 다시 해시해서 저장한다.
+cost 를 올리거나 내려도 사용자가 한 번 로그인하면 자연스럽게 옮겨간다.
+
+- BCRYPT_LOG_ROUNDS: bcrypt cost (기본 12, Flask-Bcrypt 와 같은 설정)
+풀은 앱을 만들 때(create_app 맨 앞, 다른 스레드가 시작되기 전) 워커 프로세스마다 미리 띄운다.
+
+- PASSWORD_HASH_POOL_SIZE: 해시 전용 프로세스 수 (기본 2, 0 이면 요청 스레드에서 바로 계산)
+- PASSWORD_HASH_MAX_PENDING: 풀에 동시에 맡길 수 있는 작업 수 (기본 풀 크기 x 4)
+- PASSWORD_HASH_TIMEOUT: 자리가 나기를 기다리는 최대 시간(초) (기본 5)
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt as _bcrypt
+from flask import current_app, jsonify
+
+logger = logging.getLogger(__name__)
+
+# bcrypt 는 72바이트까지만 사용한다 (이전 버전 bcrypt 가 조용히 자르던 것과 같은 결과)
+MAX_PASSWORD_BYTES = 72
+
+# 로그인할 수 없는 계정(봇 등)용 해시 값: bcrypt 형식이 아니므로 어떤 비밀번호와도 일치하지 않는다
+UNUSABLE_PASSWORD_HASH = "!"
+
+_executor = None
+_executor_pid = None
+_pending = None
+_pool_settings = None
+_lock = threading.Lock()
+
+
+class PasswordServiceBusy(Exception):
+    """해시 풀이 가득 차서 제한 시간 안에 작업을 맡기지 못함"""
+
+
+def _encode(password):
+    return password.encode("utf-8")[:MAX_PASSWORD_BYTES]
+
+
+# 아래 두 함수는 풀 프로세스에서 실행되므로 모듈 최상위에 둔다 (pickle 가능해야 함)
+def _hash(password_bytes, rounds):
+    return _bcrypt.hashpw(password_bytes, _bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password_bytes, hash_bytes):
+    try:
+        return _bcrypt.checkpw(password_bytes, hash_bytes)
+    except ValueError:
+        return False
+
+
+def _pool_context():
+    """풀 프로세스 시작 방식
+
+    다른 스레드(로그 QueueListener, 아웃박스 디스패처, 회원탈퇴 작업)가 없을 때만 fork 한다.
+    스레드가 도는 중에 fork 하면 그 스레드가 잡고 있던 락(로깅, DB 커넥션 풀 등)이
+    잠긴 채로 자식에 복사되어 자식이 멈출 수 있다.
+    그 외에는 forkserver(없으면 spawn)로 깨끗한 프로세스에서 시작한다.
+    (이때 풀 프로세스는 __main__ 모듈을 다시 import 하므로 시작 지점에서 미리 만드는 것이 좋다)
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    if "forkserver" in methods:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["password_service"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def start_pool(config):
+    """현재 프로세스의 풀을 만들고 풀 프로세스까지 바로 띄운다
+
+    create_app() 맨 앞(다른 스레드를 시작하기 전)과 gunicorn post_fork 훅에서 호출한다.
+    """
+    global _executor, _executor_pid, _pending, _pool_settings
+
+    _pool_settings = {key: config[key] for key in ("PASSWORD_HASH_POOL_SIZE", "PASSWORD_HASH_MAX_PENDING")}
+    with _lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            return _executor
+
+        executor = ProcessPoolExecutor(max_workers=config["PASSWORD_HASH_POOL_SIZE"], mp_context=_pool_context())
+        # 첫 작업을 맡길 때 프로세스가 만들어지므로 지금 한 번 실행해 둔다
+        executor.submit(os.getpid).result()
+        _executor = executor
+        _executor_pid = os.getpid()
+        _pending = threading.BoundedSemaphore(config["PASSWORD_HASH_MAX_PENDING"])
+    return _executor
+
+
+def start_pool_after_fork():
+    """gunicorn --preload 로 마스터에서 만든 풀은 워커에서 쓸 수 없으므로 워커에서 새로 만든다"""
+    if _pool_settings and _pool_settings["PASSWORD_HASH_POOL_SIZE"] > 0:
+        start_pool(_pool_settings)
+
+
+def _get_executor(config):
+    """현재 프로세스의 풀 (보통은 start_pool 로 미리 만들어져 있음)"""
+    if _executor is not None and _executor_pid == os.getpid():
+        return _executor
+    return start_pool(config)
+
+
+def shutdown_pool():
+    """풀 종료 (설정을 바꿔 다시 만들 때, 벤치마크 등)"""
+    global _executor, _executor_pid, _pending
+
+    with _lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=True)
+        _executor = None
+        _executor_pid = None
+        _pending = None
+
+
+def _run(func, *args):
+    config = current_app.config
+    if config["PASSWORD_HASH_POOL_SIZE"] <= 0:
+        return func(*args)
+
+    executor = _get_executor(config)
+    pending = _pending
+    if not pending.acquire(timeout=config["PASSWORD_HASH_TIMEOUT"]):
+        logger.warning("비밀번호 해시 풀이 가득 참 (%s)", func.__name__)
+        raise PasswordServiceBusy()
+    try:
+        return executor.submit(func, *args).result()
+    finally:
+        pending.release()
+
+
+def hash_password(password):
+    """현재 cost 로 해시한 문자열"""
+    return _run(_hash, _encode(password), current_app.config["BCRYPT_LOG_ROUNDS"])
+
+
+def verify_password(password_hash, password):
+    if not password_hash or not password or not password_hash.startswith("$2"):
+        return False
+    return _run(_verify, _encode(password), password_hash.encode("utf-8"))
+
+
+def is_unusable_hash(password_hash):
+    """로그인할 수 없는 계정의 해시인지 ('!' 로 시작: 봇, 탈퇴 처리 중인 계정)"""
+    return not password_hash or password_hash.startswith(UNUSABLE_PASSWORD_HASH)
+
+
+def get_hash_rounds(password_hash):
+    """$2b$12$... 형식에서 cost 추출 (bcrypt 형식이 아니면 None)"""
+    try:
+        return int(password_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash):
+    rounds = get_hash_rounds(password_hash)
+    return rounds is not None and rounds != current_app.config["BCRYPT_LOG_ROUNDS"]
+
+
+def check_and_upgrade(user, password):
+    """비밀번호 검증 후 cost 가 바뀌었으면 새 해시로 교체 (commit 은 호출한 쪽에서)
+
+    반환값: 검증 성공 여부
+    """
+    if not verify_password(user.password_hash, password):
+        return False
+    if needs_rehash(user.password_hash):
+        user.password_hash = hash_password(password)
+    return True
+
+
+def init_password_service(app):
+    app.config.setdefault("BCRYPT_LOG_ROUNDS", int(os.getenv("BCRYPT_LOG_ROUNDS", "12")))
+    app.config.setdefault("PASSWORD_HASH_POOL_SIZE", int(os.getenv("PASSWORD_HASH_POOL_SIZE", "2")))
+    app.config.setdefault(
+        "PASSWORD_HASH_MAX_PENDING",
+        int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(1, app.config["PASSWORD_HASH_POOL_SIZE"] * 4)))),
+    )
+    app.config.setdefault("PASSWORD_HASH_TIMEOUT", float(os.getenv("PASSWORD_HASH_TIMEOUT", "5")))
+
+    # 풀 프로세스 안에서 다시 import 된 경우(forkserver/spawn)에는 풀을 만들지 않는다
+    if app.config["PASSWORD_HASH_POOL_SIZE"] > 0 and multiprocessing.parent_process() is None:
+        start_pool(app.config)
+
+    @app.errorhandler(PasswordServiceBusy)
+    def password_service_busy(e):
+        response = jsonify({"message": "로그인 요청이 많아 잠시 후 다시 시도해주세요."})
+        response.headers["Retry-After"] = "1"
+        return response, 503
@@ -0,0 +1,192 @@
+"""
+투표 집계 서비스
+
+옵션별 득표 수는 LEFT JOIN + GROUP BY option_id 한 번으로 계산하고,
+짧은 TTL 동안 워커 메모리에 캐시한다. 게시글 목록은 페이지의 모든 투표를 한 번에 집계한다
+(투표 조회 1번 + 집계 1번 + 사용자 투표 1번, 게시글 수와 무관).
+
+캐시 무효화:
+- invalidate_tallies() 는 호출한 워커의 캐시만 지운다.
+- 게시글 목록/상세는 board:<강의 코드> 리소스 버전(투표/수정 시 bump)을 version 으로 넘기므로
+  다른 워커도 버전이 바뀐 캐시는 쓰지 않고 바로 다시 집계한다.
+- version 없이 조회하면 다른 워커에서 투표한 결과가 최대 TTL 만큼 늦게 보일 수 있다.
+
+투표자 목록은 게시글 응답에 포함하지 않고 옵션별 페이지 단위로 따로 조회한다.
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import func
+
+from extensions import db
+from models import Poll, PollOption, PollVote, User, utcnow
+from upsert import EXCLUDED, upsert
+
+POLL_TALLY_TTL_SECONDS = float(os.getenv("POLL_TALLY_TTL_SECONDS", "10"))
+VOTERS_PER_PAGE = 20
+MAX_VOTERS_PER_PAGE = 100
+
+_tally_cache = {}  # poll_id -> (만료 시각, 버전, [(option_id, text, votes), ...])
+_tally_lock = threading.Lock()
+
+
+def get_tallies(poll_ids, version=None):
+    """{poll_id: [(option_id, text, votes), ...]} (캐시에 없는 투표만 모아서 쿼리 1번, TTL 캐시)
+
+    version 을 주면 같은 버전으로 계산한 캐시만 사용한다 (ETag 와 본문이 어긋나지 않도록).
+    """
+    now = time.monotonic()
+    tallies = {}
+    with _tally_lock:
+        for poll_id in poll_ids:
+            cached = _tally_cache.get(poll_id)
+            if cached and cached[0] > now and (version is None or cached[1] == version):
+                tallies[poll_id] = cached[2]
+
+    missing = [poll_id for poll_id in poll_ids if poll_id not in tallies]
+    if not missing:
+        return tallies
+
+    rows = (
+        db.session.query(PollOption.poll_id, PollOption.id, PollOption.text, func.count(PollVote.id))
+        .outerjoin(PollVote, PollVote.option_id == PollOption.id)
+        .filter(PollOption.poll_id.in_(missing))
+        .group_by(PollOption.poll_id, PollOption.id, PollOption.text)
+        .order_by(PollOption.id.asc())
+        .all()
+    )
+    loaded = {poll_id: [] for poll_id in missing}
+    for poll_id, option_id, text, votes in rows:
+        loaded[poll_id].append((option_id, text, votes))
+
+    with _tally_lock:
+        for poll_id, options in loaded.items():
+            _tally_cache[poll_id] = (now + POLL_TALLY_TTL_SECONDS, version, options)
+    tallies.update(loaded)
+    return tallies
+
+
+def get_option_tallies(poll_id, version=None):
+    """옵션 목록과 득표 수를 [(option_id, text, votes), ...] 로 반환 (쿼리 1번, TTL 캐시)"""
+    return get_tallies([poll_id], version)[poll_id]
+
+
+def invalidate_tallies(poll_id):
+    """투표/옵션 변경 시 캐시 무효화"""
+    with _tally_lock:
+        _tally_cache.pop(poll_id, None)
+
+
+def cast_vote(poll_id, option_id, user_id):
+    """투표 (재투표면 옵션만 변경)
+
+    (poll_id, user_id) 유니크 인덱스를 기준으로 INSERT ... ON CONFLICT DO UPDATE 한 번에 처리하므로
+    더블 클릭/동시 요청에도 중복 투표가 생기지 않는다. commit 은 호출한 쪽에서.
+    ON CONFLICT 를 지원하지 않는 DB(MySQL 등)는 upsert() 가 UPDATE 후 없으면 INSERT 한다.
+    """
+    upsert(
+        PollVote,
+        [{
+            "poll_id": poll_id,
+            "option_id": option_id,
+            "user_id": int(user_id),
+            "created_at": utcnow(),
+        }],
+        index_elements=[PollVote.poll_id, PollVote.user_id],
+        set_={"option_id": EXCLUDED},
+    )
+
+
+_NOT_LOADED = object()
+
+
+def build_poll_result(poll, user_id=None, user_vote=_NOT_LOADED, version=None):
+    """게시글/투표 응답에 들어가는 poll 데이터 생성
+    user_vote 를 이미 알고 있으면 (방금 투표한 경우) 넘겨서 조회를 생략한다.
+    """
+    # 현재 사용자의 투표 여부 확인
+    if user_vote is _NOT_LOADED:
+        user_vote = None
+        if user_id:
+            user_vote = (
+                db.session.query(PollVote.option_id)
+                .filter_by(poll_id=poll.id, user_id=int(user_id))
+                .scalar()
+            )
+    return _poll_dict(poll, get_option_tallies(poll.id, version), user_vote)
+
+
+def build_poll_results(post_ids, user_id=None, version=None):
+    """게시글 목록용 {post_id: poll 데이터} (투표 조회 1번 + 집계 1번 + 사용자 투표 1번)"""
+    if not post_ids:
+        return {}
+    polls = Poll.query.filter(Poll.post_id.in_(post_ids)).all()
+    if not polls:
+        return {}
+
+    poll_ids = [poll.id for poll in polls]
+    tallies = get_tallies(poll_ids, version)
+    user_votes = {}
+    if user_id:
+        user_votes = dict(
+            db.session.query(PollVote.poll_id, PollVote.option_id)
+            .filter(PollVote.poll_id.in_(poll_ids), PollVote.user_id == int(user_id))
+            .all()
+        )
+    return {poll.post_id: _poll_dict(poll, tallies[poll.id], user_votes.get(poll.id)) for poll in polls}
+
+
+def _poll_dict(poll, tallies, user_vote):
+    options_data = []
+    total_votes = 0
+    for option_id, text, votes in tallies:
+        total_votes += votes
+        options_data.append({
+            "id": option_id,
+            "text": text,
+            "votes": votes,
+        })
+
+    return {
+        "id": poll.id,
+        "question": poll.question,
+        "options": options_data,
+        "total_votes": total_votes,
+        "user_vote": user_vote,
+        "expires_at": poll.expires_at.isoformat() if poll.expires_at else None
+    }
+
+
+def _voter_dict(user):
+    # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
+    user_type = getattr(user, "user_type", None)
+    return {
+        "id": user.id,
+        "name": user.name,
+        "student_id": user.student_id if user_type == "student" else None,
+        "is_professor": user_type == "professor",
+        "profile_image": user.profile_image
+    }
+
+
+def get_option_voters(option_id, page=1, per_page=VOTERS_PER_PAGE):
+    """옵션별 투표자 목록 (투표 순서대로, 페이지 단위)"""
+    per_page = max(1, min(per_page, MAX_VOTERS_PER_PAGE))
+    pagination = db.paginate(
+        db.select(User)
+        .join(PollVote, PollVote.user_id == User.id)
+        .filter(PollVote.option_id == option_id)
+        .order_by(PollVote.id.asc()),
+        page=page,
+        per_page=per_page,
+        error_out=False,
+    )
+    return {
+        "option_id": option_id,
+        "voters": [_voter_dict(user) for user in pagination.items],
+        "page": pagination.page,
+        "per_page": pagination.per_page,
+        "total": pagination.total,
+        "has_next": pagination.has_next,
+    }
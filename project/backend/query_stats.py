@@ -0,0 +1,160 @@
+"""
+요청별 SQL 쿼리 계측
+
+SQLAlchemy before/after_cursor_execute 이벤트로 요청마다 쿼리 수, DB 시간, 가장 느린 쿼리를 모은다.
+- 응답에 Server-Timing 헤더 추가 (브라우저 개발자 도구 Network → Timing 에서 확인)
+- 기준을 넘는 느린 요청/쿼리는 로그 출력
+- 엔드포인트별 누적 통계를 워커 메모리에 보관 (get_endpoint_stats)
+
+- QUERY_STATS_ENABLED: 1(기본) / 0
+- SLOW_REQUEST_MS: 이 시간(ms)을 넘는 요청 로그 (기본 500)
+- SLOW_REQUEST_QUERIES: 쿼리 수가 이보다 많은 요청 로그 (기본 30, N+1 탐지용)
+- SLOW_QUERY_MS: 이 시간(ms)을 넘는 개별 쿼리 로그 (기본 100)
+- QUERY_STATS_ENDPOINT: 1 이면 GET /debug/query-stats 로 누적 통계 조회 (기본 0)
+"""
+import logging
+import os
+import threading
+import time
+
+from flask import g, has_request_context, jsonify, request
+from sqlalchemy import event
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_KEPT = 3  # 요청별로 보관할 느린 쿼리 수
+
+_endpoint_stats = {}  # endpoint -> 누적 통계
+_stats_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # 실행 컨텍스트는 쿼리 실행마다 새로 만들어지므로 시작 시각을 여기에 둔다
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._query_start_time) * 1000
+
+    if not has_request_context():
+        return
+    stats = g.get("query_stats")
+    if stats is None:
+        return
+
+    stats["count"] += 1
+    stats["db_ms"] += elapsed_ms
+
+    slowest = stats["slowest"]
+    if len(slowest) < SLOWEST_KEPT or elapsed_ms > slowest[-1][0]:
+        slowest.append((elapsed_ms, statement))
+        slowest.sort(key=lambda item: item[0], reverse=True)
+        del slowest[SLOWEST_KEPT:]
+
+    if elapsed_ms > stats["slow_query_ms"]:
+        logger.warning("느린 쿼리 %.1fms [%s] %s", elapsed_ms, request.endpoint, _short(statement))
+
+
+def _short(statement, limit=200):
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _record(endpoint, total_ms, stats):
+    with _stats_lock:
+        entry = _endpoint_stats.setdefault(endpoint, {
+            "requests": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "db_ms": 0.0,
+            "queries": 0,
+            "max_queries": 0,
+        })
+        entry["requests"] += 1
+        entry["total_ms"] += total_ms
+        entry["max_ms"] = max(entry["max_ms"], total_ms)
+        entry["db_ms"] += stats["db_ms"]
+        entry["queries"] += stats["count"]
+        entry["max_queries"] = max(entry["max_queries"], stats["count"])
+
+
+def get_endpoint_stats():
+    """엔드포인트별 누적 통계 (평균 포함), 평균 응답 시간이 긴 순"""
+    with _stats_lock:
+        snapshot = {endpoint: dict(entry) for endpoint, entry in _endpoint_stats.items()}
+
+    result = []
+    for endpoint, entry in snapshot.items():
+        requests = entry["requests"]
+        result.append({
+            "endpoint": endpoint,
+            "requests": requests,
+            "avg_ms": round(entry["total_ms"] / requests, 2),
+            "max_ms": round(entry["max_ms"], 2),
+            "avg_db_ms": round(entry["db_ms"] / requests, 2),
+            "avg_queries": round(entry["queries"] / requests, 2),
+            "max_queries": entry["max_queries"],
+        })
+    result.sort(key=lambda item: item["avg_ms"], reverse=True)
+    return result
+
+
+def reset_endpoint_stats():
+    with _stats_lock:
+        _endpoint_stats.clear()
+
+
+def init_query_stats(app):
+    app.config.setdefault("QUERY_STATS_ENABLED", os.getenv("QUERY_STATS_ENABLED", "1") != "0")
+    app.config.setdefault("SLOW_REQUEST_MS", float(os.getenv("SLOW_REQUEST_MS", "500")))
+    app.config.setdefault("SLOW_REQUEST_QUERIES", int(os.getenv("SLOW_REQUEST_QUERIES", "30")))
+    app.config.setdefault("SLOW_QUERY_MS", float(os.getenv("SLOW_QUERY_MS", "100")))
+    app.config.setdefault("QUERY_STATS_ENDPOINT", os.getenv("QUERY_STATS_ENDPOINT", "0") == "1")
+
+    if not app.config["QUERY_STATS_ENABLED"]:
+        return
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db.engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_query_stats():
+        g.request_started = time.perf_counter()
+        g.query_stats = {
+            "count": 0,
+            "db_ms": 0.0,
+            "slowest": [],
+            "slow_query_ms": app.config["SLOW_QUERY_MS"],
+        }
+
+    @app.after_request
+    def finish_query_stats(response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        total_ms = (time.perf_counter() - g.request_started) * 1000
+        endpoint = request.endpoint or "<unmatched>"
+        _record(endpoint, total_ms, stats)
+
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats["db_ms"]:.1f};desc="{stats["count"]} queries", app;dur={total_ms:.1f}',
+        )
+
+        if total_ms > app.config["SLOW_REQUEST_MS"] or stats["count"] > app.config["SLOW_REQUEST_QUERIES"]:
+            logger.warning(
+                "느린 요청 %s %s [%s] %.1fms, 쿼리 %d개 (%.1fms)%s",
+                request.method, request.path, endpoint, total_ms, stats["count"], stats["db_ms"],
+                "".join(f"\n   - {elapsed_ms:.1f}ms {_short(statement)}" for elapsed_ms, statement in stats["slowest"]),
+                extra={"endpoint": endpoint, "duration_ms": round(total_ms, 1), "queries": stats["count"]},
+            )
+        return response
+
+    if app.config["QUERY_STATS_ENDPOINT"]:
+        @app.route("/debug/query-stats", methods=["GET"])
+        def query_stats():
+            return jsonify(get_endpoint_stats())
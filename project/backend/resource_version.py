@@ -0,0 +1,104 @@
+"""
+리소스 버전 기반 ETag (If-None-Match → 304)
+
+프론트엔드가 주기적으로 다시 불러오는 목록 라우트는 응답을 만들기 전에
+resource_versions 테이블에서 관련 키의 버전만 한 번에 읽어서 ETag 를 계산한다.
+요청의 If-None-Match 와 같으면 to_dict 직렬화 없이 바로 304 를 돌려준다.
+
+쓰기 라우트는 bump_versions() 로 관련 키를 같은 트랜잭션에서 1씩 올린다.
+키 규칙:
+- board:<강의 코드>          게시글 목록 (글/댓글 수/좋아요/투표/고정)
+- post:<게시글 id>           댓글 목록 (댓글/댓글 좋아요)
+- recruit:<강의 코드>        팀 모집 목록
+- team:<모집 id>             팀 공통 가능 시간 (멤버/제출/멤버의 가능 시간)
+- notifications:<user id>    알림 목록
+- enrolled:<user id>         학생의 수강 강의 목록 (수강 등록, 강의 삭제는 courses 로 반영)
+- courses                    강의 카탈로그 (강의 생성/삭제)
+- users                      이름/프로필 이미지 변경, 회원 탈퇴 (모든 목록에 영향)
+"""
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+from extensions import db
+from models import ResourceVersion
+from upsert import upsert
+
+USERS_KEY = "users"
+COURSES_KEY = "courses"
+
+
+def bump_versions(*keys):
+    """키별 버전 +1 (없으면 1 로 생성). commit 은 호출한 쪽에서."""
+    keys = sorted({key for key in keys if key})
+    if not keys:
+        return
+
+    upsert(
+        ResourceVersion,
+        [{"key": key, "version": 1} for key in keys],
+        index_elements=[ResourceVersion.key],
+        set_={"version": ResourceVersion.version + 1},
+    )
+
+
+def get_versions(keys):
+    """{key: version} (없는 키는 0) - 쿼리 1번"""
+    rows = db.session.query(ResourceVersion.key, ResourceVersion.version).filter(
+        ResourceVersion.key.in_(keys)
+    ).all()
+    versions = dict.fromkeys(keys, 0)
+    versions.update(rows)
+    return versions
+
+
+def current_version(key):
+    """이번 요청에서 ETag 계산에 쓴 버전 (없으면 None)
+
+    다른 캐시(투표 집계 등)가 ETag 보다 오래된 데이터를 돌려주지 않도록 확인할 때 쓴다.
+    """
+    return g.get("resource_versions", {}).get(key)
+
+
+def compute_etag(keys, user_id):
+    """엔드포인트 + 사용자 + 쿼리스트링 + 키 버전으로 ETag 계산
+
+    응답에 사용자별 필드(is_liked, user_vote 등)가 있으므로 사용자도 포함한다.
+    """
+    versions = get_versions(keys)
+    g.resource_versions = versions
+    raw = "|".join([
+        request.endpoint or "",
+        str(user_id),
+        request.query_string.decode("latin-1"),
+        *(f"{key}={versions[key]}" for key in sorted(versions)),
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def versioned_etag(keys_func):
+    """GET 라우트용 데코레이터 (@jwt_required() 아래에 붙인다)
+
+    keys_func(user_id=..., **view_args) 가 이 응답이 의존하는 버전 키 목록을 돌려준다.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = get_jwt_identity()
+            etag = compute_etag(keys_func(user_id=user_id, **kwargs), user_id)
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # 사용자별 응답이므로 공유 캐시 금지, 브라우저는 매번 재검증
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify
-from extensions import db, bcrypt
+from extensions import db
 from models import User
-from flask_jwt_extended import create_access_token
-from datetime import timedelta
+from password_service import check_and_upgrade, hash_password, is_unusable_hash
+from token_service import issue_tokens, revoke_token, revoke_user_tokens
+from user_cache import invalidate_user
+from flask_jwt_extended import get_jwt, jwt_required
 import secrets
 import string
 
@@ -28,7 +30,7 @@ def register():
     if User.query.filter_by(username=data["username"]).first():
         return jsonify({"message": "이미 존재하는 아이디입니다."}), 400
 
-    hashed_pw = bcrypt.generate_password_hash(data["password"]).decode("utf-8")
+    hashed_pw = hash_password(data["password"])
 
     new_user = User(
         student_id=data["studentId"],
@@ -61,19 +63,54 @@ def login():
         (User.email == username_or_email) | (User.username == username_or_email)
     ).first()
 
-    if not user or not bcrypt.check_password_hash(user.password_hash, password):
+    # '!' 로 시작하는 해시: 로그인할 수 없는 계정 (탈퇴 처리 중, 봇) - bcrypt 검증 없이 거절
+    if not user or is_unusable_hash(user.password_hash) or not check_and_upgrade(user, password):
         return jsonify({"message": "잘못된 이메일/아이디 또는 비밀번호입니다."}), 401
 
-    access_token = create_access_token(identity=str(user.id), expires_delta=timedelta(hours=1))
+    # bcrypt cost 가 바뀌어 다시 해시했으면 저장
+    if db.session.is_modified(user):
+        db.session.commit()
 
     return jsonify({
         "message": "로그인 성공",
-        "access_token": access_token,
+        **issue_tokens(user.id, user.token_version),
         "user": user.to_dict(),
         "userType": user.user_type
     }), 200
 
 
+# =====================================================
+# 토큰 갱신 (리프레시 토큰 → 새 액세스/리프레시 토큰, 비밀번호 검증 없음)
+# =====================================================
+@auth_bp.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    # 탈퇴했거나 탈퇴 처리 중인 사용자, 세대가 지난 토큰은 token_service.is_token_revoked 에서 거절 (401)
+    payload = get_jwt()
+
+    # 사용한 리프레시 토큰은 폐기 (동시에 같은 토큰으로 요청하면 한 쪽만 성공)
+    if not revoke_token(payload):
+        db.session.rollback()
+        return jsonify({"message": "이미 사용된 토큰입니다. 다시 로그인해주세요."}), 401
+
+    # 세대는 is_token_revoked 에서 현재 값과 같은지 확인했다
+    tokens = issue_tokens(payload["sub"], payload.get("ver", 0))
+    db.session.commit()
+
+    return jsonify({"message": "토큰 갱신 성공", **tokens}), 200
+
+
+# =====================================================
+# 로그아웃 (리프레시 토큰 폐기)
+# =====================================================
+@auth_bp.route("/logout", methods=["POST"])
+@jwt_required(refresh=True)
+def logout():
+    revoke_token(get_jwt())
+    db.session.commit()
+    return jsonify({"message": "로그아웃되었습니다."}), 200
+
+
 # =====================================================
 # 아이디 찾기
 # =====================================================
@@ -111,7 +148,8 @@ def reset_password():
 
     user = User.query.filter_by(username=username, email=email).first()
 
-    if not user:
+    # 탈퇴 처리 중인 계정(백그라운드 삭제 표시)과 봇은 재설정으로 해시를 덮어쓰면 안 된다
+    if not user or is_unusable_hash(user.password_hash):
         return jsonify({"message": "입력하신 정보와 일치하는 계정을 찾을 수 없습니다."}), 404
 
     # 임시 비밀번호 생성 (8자리 영문+숫자 조합)
@@ -119,9 +157,12 @@ def reset_password():
     temp_password = ''.join(secrets.choice(characters) for _ in range(8))
 
     # 비밀번호 해시화 및 저장
-    hashed_pw = bcrypt.generate_password_hash(temp_password).decode("utf-8")
+    hashed_pw = hash_password(temp_password)
     user.password_hash = hashed_pw
+    # 이전 비밀번호로 받은 리프레시 토큰은 모두 무효
+    revoke_user_tokens(user.id)
     db.session.commit()
+    invalidate_user(user.id)
 
     # TODO: 실제 이메일 전송 기능 추가 시 아래 주석 해제하고 이메일로 전송
     # send_password_reset_email(user.email, temp_password)
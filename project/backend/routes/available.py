@@ -1,6 +1,9 @@
+import logging
+import threading
+
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from extensions import db, bcrypt
+from extensions import db
 from models import (
     AvailableTime,
     User,
@@ -9,45 +12,69 @@ from models import (
     CourseBoardPost,
     Poll,
     PollOption,
-    Notification,
     Course,
+    utcnow,
 )
 from models import TeamAvailabilitySubmission
+from outbox import enqueue_notification
+from password_service import UNUSABLE_PASSWORD_HASH
+from resource_version import bump_versions, versioned_etag, USERS_KEY
+from metrics import AUTO_RECOMMEND_DURATION, timed
+from upsert import insert_ignore
 from datetime import datetime
 from collections import defaultdict
 
 available_bp = Blueprint("available", __name__, url_prefix="/available")
+logger = logging.getLogger(__name__)
 
-# 봇 계정 가져오기 또는 생성
-def get_or_create_bot_user():
-    """시스템 봇 계정을 가져오거나 생성"""
-    BOT_USERNAME = "allmeet_bot"
-    BOT_EMAIL = "bot@allmeet.system"
-    BOT_NAME = "All Meet 🤖"
-    BOT_STUDENT_ID = "BOT000"
-    
-    # 기존 봇 계정 찾기
-    bot_user = User.query.filter_by(username=BOT_USERNAME).first()
-    
-    if not bot_user:
-        # 봇 계정이 없으면 생성
-        # 봇은 로그인하지 않으므로 임의의 해시된 비밀번호 사용
-        bot_password_hash = bcrypt.generate_password_hash("bot_password_never_used").decode("utf-8")
-        
-        bot_user = User(
-            student_id=BOT_STUDENT_ID,
-            name=BOT_NAME,
-            email=BOT_EMAIL,
-            username=BOT_USERNAME,
-            password_hash=bot_password_hash,
-            user_type="bot"  # 봇 타입으로 설정
-        )
-        
-        db.session.add(bot_user)
-        db.session.commit()
-        db.session.refresh(bot_user)
-    
-    return bot_user
+# 봇 계정 (migrations 0008 에서 생성, 워커 프로세스마다 id 를 한 번만 조회해서 기억)
+BOT_USERNAME = "allmeet_bot"
+BOT_EMAIL = "bot@allmeet.system"
+BOT_NAME = "All Meet 🤖"
+BOT_STUDENT_ID = "BOT000"
+
+_bot_user_id = None
+_bot_user_lock = threading.Lock()
+
+
+def get_bot_user_id():
+    """시스템 봇 계정 id (없으면 생성)
+
+    봇 계정은 마이그레이션이 미리 만들어 두므로 보통은 첫 호출에서 SELECT 한 번만 한다.
+    없을 때는 insert_ignore (ON CONFLICT DO NOTHING) 로 만들어서 여러 워커가 동시에 만들어도 하나만 남고,
+    호출한 라우트의 트랜잭션을 중간에 commit 하지 않는다.
+    """
+    global _bot_user_id
+
+    if _bot_user_id is not None:
+        return _bot_user_id
+
+    with _bot_user_lock:
+        if _bot_user_id is not None:
+            return _bot_user_id
+
+        bot_user_id = db.session.query(User.id).filter_by(username=BOT_USERNAME).scalar()
+        if bot_user_id is not None:
+            _bot_user_id = bot_user_id
+            return bot_user_id
+
+        # 봇은 로그인하지 않으므로 어떤 비밀번호와도 일치하지 않는 값 사용 (해시 계산 없음)
+        insert_ignore(User, [{
+            "student_id": BOT_STUDENT_ID,
+            "name": BOT_NAME,
+            "email": BOT_EMAIL,
+            "username": BOT_USERNAME,
+            "password_hash": UNUSABLE_PASSWORD_HASH,
+            "user_type": "bot",
+            "created_at": utcnow(),
+        }])
+        # 방금 만든 행은 아직 commit 전이라 롤백될 수 있으므로 기억하지 않는다
+        return db.session.query(User.id).filter_by(username=BOT_USERNAME).scalar()
+
+
+def reset_bot_user_cache():
+    global _bot_user_id
+    _bot_user_id = None
 
 # 공통 시간 파싱 함수
 def parse_time_str(time_str):
@@ -166,11 +193,11 @@ def check_all_members_submitted(team_id):
     """
     team_members = TeamRecruitmentMember.query.filter_by(recruitment_id=team_id).all()
     if not team_members:
-        print(f"[DEBUG] 팀 {team_id} 멤버가 없음")
+        logger.debug("팀 %s 멤버가 없음", team_id)
         return False
 
     member_ids = [m.user_id for m in team_members]
-    print(f"[DEBUG] 팀 {team_id} 멤버 수: {len(member_ids)}, 멤버 IDs: {member_ids}")
+    logger.debug("팀 %s 멤버 수: %d, 멤버 IDs: %s", team_id, len(member_ids), member_ids)
 
     # 이 팀에 대해 제출을 완료한 멤버 목록
     submissions = TeamAvailabilitySubmission.query.filter(
@@ -180,23 +207,20 @@ def check_all_members_submitted(team_id):
     submitted_user_ids = {s.user_id for s in submissions}
 
     # 각 멤버가 최소 1번이라도 제출 버튼을 눌렀는지 확인
-    all_submitted = True
-    for member_id in member_ids:
-        user = User.query.get(member_id)
-        user_name = user.name if user else f"User{member_id}"
-        is_submitted = member_id in submitted_user_ids
-        print(f"[DEBUG]   - 멤버 {user_name} (ID: {member_id}): 팀 제출 여부 = {is_submitted}")
-        if not is_submitted:
-            all_submitted = False
-
-    print(f"[DEBUG] 팀 {team_id} 모든 멤버 제출 완료 여부: {all_submitted}")
+    all_submitted = all(member_id in submitted_user_ids for member_id in member_ids)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "팀 %s 모든 멤버 제출 완료 여부: %s (미제출 IDs: %s)",
+            team_id, all_submitted, [mid for mid in member_ids if mid not in submitted_user_ids],
+        )
     return all_submitted
 
+@timed(AUTO_RECOMMEND_DURATION, trigger="submit")
 def create_auto_recommend_post(team_id):
     """자동 추천 게시글 생성 (내부 함수)"""
     team_recruitment = TeamRecruitment.query.get(team_id)
     if not team_recruitment:
-        print(f"[DEBUG] 팀을 찾을 수 없음: team_id={team_id}")
+        logger.debug("팀을 찾을 수 없음: team_id=%s", team_id)
         return None
     
     # 이미 같은 제목의 게시글이 있는지 확인 (중복 방지)
@@ -210,13 +234,13 @@ def create_auto_recommend_post(team_id):
     
     if existing_post:
         # 이미 게시글이 있으면 생성하지 않음
-        print(f"[DEBUG] 이미 게시글이 존재함: team_id={team_id}, post_id={existing_post.id}")
+        logger.debug("이미 게시글이 존재함: team_id=%s, post_id=%s", team_id, existing_post.id)
         return None
     
     # 팀 공통 시간 계산
     team_members = TeamRecruitmentMember.query.filter_by(recruitment_id=team_id).all()
     if not team_members:
-        print(f"[DEBUG] 팀 멤버가 없음: team_id={team_id}")
+        logger.debug("팀 멤버가 없음: team_id=%s", team_id)
         return None
     
     member_ids = [m.user_id for m in team_members]
@@ -240,16 +264,6 @@ def create_auto_recommend_post(team_id):
         AvailableTime.team_id.is_(None)  # team_id가 None인 것 (대시보드용)
     ).all()
     
-    print(f"[DEBUG] 팀 {team_id} 시간 데이터 수집:")
-    print(f"[DEBUG]   - 팀 제출 시간: {len(team_submitted_times)}개")
-    print(f"[DEBUG]   - 대시보드 시간: {len(dashboard_times)}개")
-    for member_id in member_ids:
-        member_team_times = [t for t in team_submitted_times if t.user_id == member_id]
-        member_dashboard_times = [t for t in dashboard_times if t.user_id == member_id]
-        user = User.query.get(member_id)
-        user_name = user.name if user else f"User{member_id}"
-        print(f"[DEBUG]   - {user_name} (ID: {member_id}): 팀 시간 {len(member_team_times)}개, 대시보드 시간 {len(member_dashboard_times)}개")
-    
     # 각 멤버별로 팀 제출 시간 또는 대시보드 시간 매핑
     team_user_times = defaultdict(list)
     dashboard_user_times = defaultdict(list)
@@ -260,12 +274,14 @@ def create_auto_recommend_post(team_id):
     for time_slot in dashboard_times:
         dashboard_user_times[time_slot.user_id].append(time_slot)
     
-    print(f"[DEBUG] 팀 멤버 수: {len(team_members)}, 팀 제출 시간 수: {len(team_submitted_times)}, 대시보드 시간 수: {len(dashboard_times)}")
-    print(f"[DEBUG] 제출한 멤버 수: {len(submitted_user_ids)}, 제출한 멤버 IDs: {submitted_user_ids}")
+    logger.debug(
+        "팀 %s 시간 데이터 수집: 멤버 %d명, 팀 제출 시간 %d개, 대시보드 시간 %d개, 제출한 멤버 IDs: %s",
+        team_id, len(team_members), len(team_submitted_times), len(dashboard_times), submitted_user_ids,
+    )
     
     # 모든 멤버가 제출했는지 확인
     all_members_submitted = len(submitted_user_ids) == len(member_ids) and all(mid in submitted_user_ids for mid in member_ids)
-    print(f"[DEBUG] 모든 멤버 제출 여부: {all_members_submitted}")
+    logger.debug("모든 멤버 제출 여부: %s", all_members_submitted)
     
     member_slot_sets = []
     for member in team_members:
@@ -288,36 +304,41 @@ def create_auto_recommend_post(team_id):
         
         slot_set = build_time_slots(times_for_user)
         member_slot_sets.append(slot_set)
-        print(f"[DEBUG] 멤버 {user.name} (ID: {user.id})의 시간 슬롯 수: {len(slot_set)}, 시간 소스: {time_source}, 제출 여부: {member.user_id in submitted_user_ids}, 대시보드 시간: {len(dashboard_user_times.get(user.id, []))}, 팀 시간: {len(team_user_times.get(user.id, []))}")
+        logger.debug(
+            "멤버 %s (ID: %s)의 시간 슬롯 수: %d, 시간 소스: %s, 제출 여부: %s",
+            user.name, user.id, len(slot_set), time_source, member.user_id in submitted_user_ids,
+        )
     
     if len(member_slot_sets) == 0:
-        print(f"[DEBUG] 멤버 슬롯 세트가 없음: team_id={team_id}")
+        logger.debug("멤버 슬롯 세트가 없음: team_id=%s", team_id)
         return None
     
     # 시간이 있는 멤버만 필터링 (시간이 없는 멤버는 제외하고 공통 시간 계산)
     member_slot_sets_with_time = [s for s in member_slot_sets if len(s) > 0]
     
-    print(f"[DEBUG] 전체 멤버 슬롯 세트 수: {len(member_slot_sets)}, 시간이 있는 멤버 슬롯 세트 수: {len(member_slot_sets_with_time)}")
-    
     if len(member_slot_sets_with_time) == 0:
-        print(f"[DEBUG] 시간이 있는 멤버가 없음: team_id={team_id}")
+        logger.debug("시간이 있는 멤버가 없음: team_id=%s", team_id)
         return None
     
     if len(member_slot_sets_with_time) < len(member_slot_sets):
-        print(f"[DEBUG] ⚠️ 일부 멤버({len(member_slot_sets) - len(member_slot_sets_with_time)}명)에게 시간 데이터가 없음. 시간이 있는 멤버들만으로 공통 시간 계산 진행.")
+        logger.debug(
+            "일부 멤버(%d명)에게 시간 데이터가 없음. 시간이 있는 멤버들만으로 공통 시간 계산 진행.",
+            len(member_slot_sets) - len(member_slot_sets_with_time),
+        )
     
     # 공통 시간 계산 (시간이 있는 멤버들 간의 공통 시간)
     member_slot_sets_with_time.sort(key=len)
     base_slots = member_slot_sets_with_time[0]
-    print(f"[DEBUG] 기준 슬롯 세트 크기: {len(base_slots)}")
     
     optimal_slots = {slot for slot in base_slots if all(slot in slots for slots in member_slot_sets_with_time)}
-    
-    print(f"[DEBUG] 공통 시간 슬롯 수: {len(optimal_slots)}")
+    logger.debug("팀 %s 공통 시간 슬롯 수: %d (기준 슬롯 세트 크기: %d)", team_id, len(optimal_slots), len(base_slots))
     
     if len(optimal_slots) == 0:
-        print(f"[DEBUG] 공통 시간이 없음: team_id={team_id}")
-        print(f"[DEBUG] 각 멤버의 슬롯 세트 크기: {[len(s) for s in member_slot_sets_with_time]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "공통 시간이 없음: team_id=%s, 각 멤버의 슬롯 세트 크기: %s",
+                team_id, [len(s) for s in member_slot_sets_with_time],
+            )
         return None
     
     daily_blocks = build_daily_blocks_from_slots(optimal_slots)
@@ -325,15 +346,12 @@ def create_auto_recommend_post(team_id):
     # 1시간 연속 가능한 시간 찾기
     two_hour_slots = find_2hour_continuous_slots(daily_blocks)
     
-    print(f"[DEBUG] 1시간 연속 가능한 시간 수: {len(two_hour_slots)}")
-    
     if not two_hour_slots:
-        print(f"[DEBUG] 1시간 연속 가능한 시간이 없음: team_id={team_id}")
+        logger.debug("1시간 연속 가능한 시간이 없음: team_id=%s", team_id)
         return None
     
     # 게시글 작성자: 봇 계정 사용
-    bot_user = get_or_create_bot_user()
-    post_author_id = bot_user.id
+    post_author_id = get_bot_user_id()
     
     # 게시글 제목 및 내용 생성
     course = Course.query.filter_by(code=team_recruitment.course_id).first()
@@ -395,20 +413,27 @@ def create_auto_recommend_post(team_id):
         db.session.add(poll_option)
     
     # 팀 멤버들에게 알림 전송 (모든 멤버에게)
-    for member in team_members:
-        notification = Notification(
-            user_id=member.user_id,
-            type="team_post",
-            content=f"[{course_title}] 팀게시판-{team_recruitment.team_board_name} 자동 추천 게시글이 작성되었습니다: {title}",
-            related_id=post.id,
-            course_id=team_recruitment.course_id
-        )
-        db.session.add(notification)
-    
-    db.session.commit()
-    
+    enqueue_notification(
+        [member.user_id for member in team_members],
+        type="team_post",
+        content=f"[{course_title}] 팀게시판-{team_recruitment.team_board_name} 자동 추천 게시글이 작성되었습니다: {title}",
+        related_id=post.id,
+        course_id=team_recruitment.course_id
+    )
+    bump_versions(f"board:{team_recruitment.course_id}")
+
+    # commit 은 호출한 라우트에서 (제출 이력과 한 트랜잭션)
+
     return post
 
+def bump_user_team_versions(user_id):
+    """사용자가 속한 모든 팀의 공통 시간 ETag 갱신 (대시보드 시간도 팀 계산에 쓰이므로)"""
+    team_ids = [
+        recruitment_id for (recruitment_id,) in db.session.query(TeamRecruitmentMember.recruitment_id)
+        .filter(TeamRecruitmentMember.user_id == int(user_id))
+    ]
+    bump_versions(*(f"team:{team_id}" for team_id in team_ids))
+
 # 가능한 시간 추가
 @available_bp.route("/", methods=["POST"])
 @jwt_required()
@@ -438,7 +463,7 @@ def add_available_time():
 
     is_new_time = False
     if existing:
-        print(f"[DEBUG] 이미 같은 시간이 존재함 (ID: {existing.id}, team_id: {team_id_int})")
+        logger.debug("이미 같은 시간이 존재함 (ID: %s, team_id: %s)", existing.id, team_id_int)
         response_msg = "이미 같은 시간이 존재합니다."
     else:
         new_time = AvailableTime(
@@ -449,32 +474,25 @@ def add_available_time():
             end_time=parse_time_str(data["end_time"]),
         )
         db.session.add(new_time)
+        bump_user_team_versions(user_id)
         db.session.commit()  # 먼저 커밋하여 시간이 저장되도록 함
         is_new_time = True
         response_msg = "시간 저장 완료"
 
     created_posts = []
 
-    # team_id 가 있는 경우에만 "팀 게시판용 제출"로 간주하고,
-    # 이 팀에 대한 제출 여부를 기록한 후 자동 추천 여부를 판단한다.
-    if team_id_int is not None:
-        # 사용자가 이 팀의 멤버인지 확인
+    # 시간 추가 시에는 제출 이력을 기록하지 않음
+    # 제출 이력은 "제출" 버튼을 눌렀을 때만 기록됨
+    # (멤버 여부 확인은 로그용이므로 DEBUG 레벨일 때만 조회)
+    if team_id_int is not None and logger.isEnabledFor(logging.DEBUG):
         is_member = (
             TeamRecruitmentMember.query.filter_by(
                 recruitment_id=team_id_int, user_id=user_id
             ).first()
             is not None
         )
-        print(f"[DEBUG] team_id={team_id_int} 에 대한 제출, 팀 멤버 여부: {is_member}")
-
-        if is_member:
-            # 시간 추가 시에는 제출 이력을 기록하지 않음
-            # 제출 이력은 "제출" 버튼을 눌렀을 때만 기록됨
-            print(f"[DEBUG] team_id={team_id_int} 시간 추가 완료 (제출 이력은 제출 버튼 클릭 시 기록됨)")
-        else:
-            print(
-                f"[DEBUG] team_id={team_id_int} 에 대해 제출 요청이 왔지만, 사용자 {user_id} 는 이 팀의 멤버가 아님"
-            )
+        if not is_member:
+            logger.debug("team_id=%s 에 대해 제출 요청이 왔지만, 사용자 %s 는 이 팀의 멤버가 아님", team_id_int, user_id)
 
     if created_posts:
         response_msg += f" (자동 추천 게시글 {len(created_posts)}개 생성됨)"
@@ -516,12 +534,14 @@ def delete_available_time(time_id):
         return jsonify({"msg": "해당 시간이 존재하지 않거나 권한이 없습니다."}), 404
 
     db.session.delete(time)
+    bump_user_team_versions(user_id)
     db.session.commit()
     return jsonify({"msg": "시간이 삭제되었습니다."}), 200
 
 # 팀 전체의 공통 가능한 시간대 계산
 @available_bp.route("/team/<int:team_id>", methods=["GET"])
 @jwt_required()
+@versioned_etag(lambda user_id, team_id: [f"team:{team_id}", USERS_KEY])
 def get_team_common_times(team_id):
     team_recruitment = TeamRecruitment.query.get(team_id)
     if not team_recruitment:
@@ -642,6 +662,7 @@ def get_team_common_times(team_id):
 # 1시간 연속 가능한 시간을 자동 추천하고 봇이 게시글 올리기
 @available_bp.route("/team/<int:team_id>/auto-recommend", methods=["POST"])
 @jwt_required()
+@timed(AUTO_RECOMMEND_DURATION, trigger="manual")
 def auto_recommend_and_post(team_id):
     user_id = get_jwt_identity()
     team_recruitment = TeamRecruitment.query.get(team_id)
@@ -698,8 +719,7 @@ def auto_recommend_and_post(team_id):
         return jsonify({"msg": "1시간 연속으로 만날 수 있는 시간이 없습니다."}), 400
     
     # 게시글 작성자: 봇 계정 사용
-    bot_user = get_or_create_bot_user()
-    post_author_id = bot_user.id
+    post_author_id = get_bot_user_id()
     
     # 게시글 제목 및 내용 생성
     course = Course.query.filter_by(code=team_recruitment.course_id).first()
@@ -761,16 +781,15 @@ def auto_recommend_and_post(team_id):
         db.session.add(poll_option)
     
     # 팀 멤버들에게 알림 전송 (모든 멤버에게)
-    for member in team_members:
-        notification = Notification(
-            user_id=member.user_id,
-            type="team_post",
-            content=f"[{course_title}] 팀게시판-{team_recruitment.team_board_name} 자동 추천 게시글이 작성되었습니다: {title}",
-            related_id=post.id,
-            course_id=team_recruitment.course_id
-        )
-        db.session.add(notification)
+    enqueue_notification(
+        [member.user_id for member in team_members],
+        type="team_post",
+        content=f"[{course_title}] 팀게시판-{team_recruitment.team_board_name} 자동 추천 게시글이 작성되었습니다: {title}",
+        related_id=post.id,
+        course_id=team_recruitment.course_id
+    )
     
+    bump_versions(f"board:{team_recruitment.course_id}")
     db.session.commit()
     
     return jsonify({
@@ -805,13 +824,11 @@ def submit_team_availability(team_id):
     
     if not existing_submission:
         submission = TeamAvailabilitySubmission(
-            team_id=team_id, user_id=user_id
+            team_id=team_id, user_id=int(user_id)  # flush 후 같은 트랜잭션에서 비교하므로 int 로 저장
         )
         db.session.add(submission)
-        db.session.commit()
-        print(f"[DEBUG] 팀 {team_id} 에 대한 제출 이력 생성 (user_id={user_id})")
-    else:
-        print(f"[DEBUG] 팀 {team_id} 에 대한 제출 이력 이미 존재 (user_id={user_id})")
+        db.session.flush()
+        logger.debug("팀 %s 에 대한 제출 이력 생성 (user_id=%s)", team_id, user_id)
     
     # 이 팀에 대해 모든 멤버가 제출을 완료했는지 확인
     team_recruitment = TeamRecruitment.query.get(team_id)
@@ -820,25 +837,25 @@ def submit_team_availability(team_id):
     )
     
     all_submitted = check_all_members_submitted(team_id)
-    print(f"[DEBUG] 팀 {team_id} ({team_name}) 모든 멤버 제출 여부: {all_submitted}")
     
     created_posts = []
     
     # 모든 멤버가 제출했으면 게시글 생성 시도
     if all_submitted:
-        print(f"[DEBUG] 팀 {team_id} 자동 추천 게시글 생성 시도...")
         post = create_auto_recommend_post(team_id)
         if post:
-            print(f"[DEBUG] ✅ 팀 {team_id} 자동 추천 게시글 생성 성공! post_id={post.id}")
+            logger.info("팀 %s (%s) 자동 추천 게시글 생성: post_id=%s", team_id, team_name, post.id)
             created_posts.append({
                 "team_id": team_id,
                 "post_id": post.id,
                 "team_name": team_name,
             })
         else:
-            print(f"[DEBUG] ❌ 팀 {team_id} 자동 추천 게시글 생성 실패 (create_auto_recommend_post가 None 반환)")
-    else:
-        print(f"[DEBUG] ⏳ 팀 {team_id} 아직 모든 멤버가 시간을 제출하지 않음")
+            logger.debug("팀 %s 자동 추천 게시글을 만들지 않음 (기존 게시글 있음 또는 공통 시간 없음)", team_id)
+    
+    # 제출 이력 + 자동 추천 게시글/알림을 한 번에 commit
+    bump_versions(f"team:{team_id}")
+    db.session.commit()
     
     return jsonify({
         "msg": "시간이 제출되었습니다.",
@@ -1,12 +1,20 @@
 import os
 import json
+import logging
 from werkzeug.utils import secure_filename
 from flask import Blueprint, request, jsonify, send_from_directory
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import joinedload
+from attachments import UPLOAD_FOLDER, attachment_filenames, remove_attachments
 from extensions import db
-from models import CourseBoardPost, CourseBoardComment, CourseBoardLike, CourseBoardCommentLike, User, Course, Enrollment, Notification, TeamRecruitment, TeamRecruitmentMember, Poll, PollOption, PollVote
+from models import CourseBoardPost, CourseBoardComment, CourseBoardLike, CourseBoardCommentLike, Course, Enrollment, TeamRecruitment, TeamRecruitmentMember, Poll, PollOption
+from outbox import enqueue_notification
+from poll_service import build_poll_result, cast_vote, get_option_voters, invalidate_tallies, VOTERS_PER_PAGE
+from resource_version import bump_versions, versioned_etag, USERS_KEY
+from user_cache import current_user
 
 board_bp = Blueprint("board", __name__, url_prefix="/board")
+logger = logging.getLogger(__name__)
 
 # =====================================================
 # 게시물 존재 확인 (알림용)
@@ -29,7 +37,6 @@ def check_comment_exists(comment_id):
     return jsonify({"exists": comment is not None}), 200
 
 # 파일 업로드 설정
-UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
 ALLOWED_EXTENSIONS = {
     'image': {'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg'},
     'video': {'mp4', 'avi', 'mov', 'wmv', 'flv', 'webm', 'mkv'},
@@ -190,8 +197,6 @@ def create_post():
                     text=opt["text"].strip()
                 )
                 db.session.add(poll_option)
-    
-    db.session.commit()
 
     # 🔔 공지사항인 경우 수강생 전원에게 알림
     if data["category"] == "notice":
@@ -200,18 +205,14 @@ def create_post():
         if course:
             enrollments = Enrollment.query.filter_by(course_id=course.id).all()
             
-            # 각 학생에게 알림 전송
-            for enrollment in enrollments:
-                notification = Notification(
-                    user_id=enrollment.student_id,
-                    type="notice",
-                    content=f"[{course.title}] 새로운 공지사항이 등록되었습니다: {data['title']}",
-                    related_id=post.id,
-                    course_id=data["course_id"]
-                )
-                db.session.add(notification)
-            
-            db.session.commit()
+            # 수강생 전원에게 하나의 아웃박스 이벤트로 알림 전송
+            enqueue_notification(
+                [enrollment.student_id for enrollment in enrollments],
+                type="notice",
+                content=f"[{course.title}] 새로운 공지사항이 등록되었습니다: {data['title']}",
+                related_id=post.id,
+                course_id=data["course_id"]
+            )
 
     # 🔔 팀 게시판인 경우 팀 멤버들에게만 알림
     if data["category"] == "team" and data.get("team_board_name"):
@@ -232,18 +233,17 @@ def create_post():
             course_title = course.title if course else data["course_id"]
             
             # 각 팀 멤버에게 알림 전송 (작성자 본인 제외)
-            for member in team_members:
-                if member.user_id != int(user_id):  # 작성자 본인은 제외
-                    notification = Notification(
-                        user_id=member.user_id,
-                        type="team_post",
-                        content=f"[{course_title}] {data['team_board_name']} 새 글이 작성되었습니다: {data['title']}",
-                        related_id=post.id,
-                        course_id=data["course_id"]
-                    )
-                    db.session.add(notification)
-            
-            db.session.commit()
+            enqueue_notification(
+                [member.user_id for member in team_members if member.user_id != int(user_id)],
+                type="team_post",
+                content=f"[{course_title}] {data['team_board_name']} 새 글이 작성되었습니다: {data['title']}",
+                related_id=post.id,
+                course_id=data["course_id"]
+            )
+
+    # 게시글 + 투표 + 알림 이벤트를 한 번에 commit
+    bump_versions(f"board:{post.course_id}")
+    db.session.commit()
 
     return jsonify({"msg": "글 작성 완료", "post": post.to_dict(user_id=int(user_id))}), 201
 
@@ -251,14 +251,17 @@ def create_post():
 # 글 목록 조회
 @board_bp.route("/course/<string:course_id>", methods=["GET"])
 @jwt_required()
+@versioned_etag(lambda user_id, course_id: [f"board:{course_id}", USERS_KEY])
 def get_posts(course_id):
     user_id = get_jwt_identity()
     # 고정된 게시물을 먼저, 그 다음 최신순으로 정렬
-    posts = CourseBoardPost.query.filter_by(course_id=course_id).order_by(
+    posts = CourseBoardPost.query.options(joinedload(CourseBoardPost.author)).filter_by(course_id=course_id).order_by(
         CourseBoardPost.is_pinned.desc(),  # 고정된 게시물이 먼저
         CourseBoardPost.id.desc()  # 그 다음 최신순
     ).all()
-    return jsonify([p.to_dict(user_id=int(user_id)) for p in posts])
+    # 좋아요/댓글 수, 투표는 페이지 전체를 한 번에 조회 (게시글 수와 관계없이 쿼리 수 일정)
+    extras = CourseBoardPost.load_list_extras(posts, int(user_id))
+    return jsonify([p.to_dict(user_id=int(user_id), extras=extras) for p in posts])
 
 
 # 글 수정 및 삭제 (같은 경로, 다른 메서드)
@@ -277,35 +280,19 @@ def update_or_delete_post(post_id):
     
     # DELETE 메서드인 경우
     if request.method == "DELETE":
-        # 첨부파일 삭제
-        if post.files:
-            try:
-                files_data = json.loads(post.files)
-                for file_info in files_data:
-                    filename = file_info.get('filename')
-                    if filename:
-                        file_path = os.path.join(UPLOAD_FOLDER, filename)
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                            print(f"파일 삭제됨: {filename}")
-            except Exception as e:
-                print(f"파일 삭제 중 오류: {e}")
-                # 파일 삭제 실패해도 게시글은 삭제 진행
-
-        # 관련된 댓글과 좋아요 먼저 삭제
-        CourseBoardComment.query.filter_by(post_id=post_id).delete()
-        CourseBoardLike.query.filter_by(post_id=post_id).delete()
-        
-        # Poll 관련 데이터 삭제
-        poll = Poll.query.filter_by(post_id=post_id).first()
-        if poll:
-            PollVote.query.filter_by(poll_id=poll.id).delete()
-            PollOption.query.filter_by(poll_id=poll.id).delete()
-            db.session.delete(poll)
-        
-        # 게시글 삭제
-        db.session.delete(post)
+        # 첨부파일과 투표 집계 캐시는 commit 후 정리
+        filenames = attachment_filenames(post.files)
+        poll_ids = [poll_id for (poll_id,) in db.session.query(Poll.id).filter_by(post_id=post_id)]
+        course_id = post.course_id
+
+        # 게시글 삭제 (댓글/답글/좋아요/투표는 FK ON DELETE CASCADE 로 DB 가 함께 삭제)
+        CourseBoardPost.query.filter_by(id=post_id).delete()
+        bump_versions(f"board:{course_id}", f"post:{post_id}")
         db.session.commit()
+
+        for poll_id in poll_ids:
+            invalidate_tallies(poll_id)
+        remove_attachments(filenames)
         return jsonify({"msg": "삭제 완료"})
     
     # PUT 메서드인 경우 (수정)
@@ -342,9 +329,9 @@ def update_or_delete_post(post_id):
                 # 기존 Poll 업데이트
                 existing_poll.question = poll_data["question"]
                 existing_poll.expires_at = expires_at
-                # 기존 옵션 삭제 후 새로 추가
-                PollVote.query.filter_by(poll_id=existing_poll.id).delete()
+                # 기존 옵션 삭제 후 새로 추가 (표는 CASCADE 로 함께 삭제)
                 PollOption.query.filter_by(poll_id=existing_poll.id).delete()
+                invalidate_tallies(existing_poll.id)
             else:
                 # 새 Poll 생성
                 existing_poll = Poll(
@@ -365,11 +352,11 @@ def update_or_delete_post(post_id):
                     )
                     db.session.add(poll_option)
         elif existing_poll:
-            # Poll 제거
-            PollVote.query.filter_by(poll_id=existing_poll.id).delete()
-            PollOption.query.filter_by(poll_id=existing_poll.id).delete()
-            db.session.delete(existing_poll)
+            # Poll 제거 (선택지/표는 CASCADE 로 함께 삭제)
+            Poll.query.filter_by(id=existing_poll.id).delete()
+            invalidate_tallies(existing_poll.id)
     
+    bump_versions(f"board:{post.course_id}")
     db.session.commit()
     
     return jsonify({"message": "글 수정 완료", "post": post.to_dict(user_id=int(user_id))}), 200
@@ -378,6 +365,7 @@ def update_or_delete_post(post_id):
 # 댓글 목록 조회
 @board_bp.route("/post/<int:post_id>/comments", methods=["GET"])
 @jwt_required()
+@versioned_etag(lambda user_id, post_id: [f"post:{post_id}", USERS_KEY])
 def get_comments(post_id):
     user_id = int(get_jwt_identity())
     comments = CourseBoardComment.query.filter_by(post_id=post_id).order_by(CourseBoardComment.created_at.asc()).all()
@@ -408,10 +396,9 @@ def create_comment(post_id):
     )
     
     db.session.add(comment)
-    db.session.commit()
+    db.session.flush()  # comment.id를 얻기 위해 flush
     
-    # 🔔 알림 생성
-    current_user = User.query.get(user_id)
+    # 🔔 알림 생성 (아웃박스 → 댓글과 같은 트랜잭션으로 commit)
     course = Course.query.filter_by(code=post.course_id).first()
     course_title = course.title if course else post.course_id
     
@@ -442,44 +429,42 @@ def create_comment(post_id):
 
         # 1) 원 댓글 작성자에게 알림 (본인 제외)
         if parent_comment and parent_comment.author_id != int(user_id):
-            notification = Notification(
-                user_id=parent_comment.author_id,
+            enqueue_notification(
+                [parent_comment.author_id],
                 type="reply",
                 content=f"[{course_title}] {category_korean} \"{post.title[:20]}{'...' if len(post.title) > 20 else ''}\" 게시글의 댓글에 답글이 달렸어요: {comment_preview}",
                 related_id=post_id,
                 comment_id=comment.id,
                 course_id=post.course_id
             )
-            db.session.add(notification)
 
         # 2) 게시글 작성자에게도 알림 (작성자가 답글 작성자가 아니고,
         #    이미 위에서 알림을 받은 댓글 작성자와도 다를 때)
         post_author_id = int(post.author_id)
         if post_author_id != int(user_id) and (not parent_comment or post_author_id != parent_comment.author_id):
-            notification_for_post_author = Notification(
-                user_id=post_author_id,
+            enqueue_notification(
+                [post_author_id],
                 type="reply",
                 content=f"[{course_title}] {category_korean} \"{post.title[:20]}{'...' if len(post.title) > 20 else ''}\" 게시글의 댓글에 새로운 답글이 달렸어요: {comment_preview}",
                 related_id=post_id,
                 comment_id=comment.id,
                 course_id=post.course_id
             )
-            db.session.add(notification_for_post_author)
-
-        db.session.commit()
     else:
         # 일반 댓글인 경우 - 게시글 작성자에게 알림 (본인 제외)
         if post.author_id != int(user_id):
-            notification = Notification(
-                user_id=post.author_id,
+            enqueue_notification(
+                [post.author_id],
                 type="comment",
                 content=f"[{course_title}] {category_korean} \"{post.title[:20]}{'...' if len(post.title) > 20 else ''}\" 게시글에 댓글이 달렸어요: {comment_preview}",
                 related_id=post_id,
                 comment_id=comment.id,
                 course_id=post.course_id
             )
-            db.session.add(notification)
-            db.session.commit()
+    
+    # 게시글 목록의 댓글 수도 바뀜
+    bump_versions(f"board:{post.course_id}", f"post:{post_id}")
+    db.session.commit()
     
     return jsonify({
         "message": "댓글 작성 완료",
@@ -500,15 +485,11 @@ def delete_comment(comment_id):
     if comment.author_id != int(user_id):
         return jsonify({"message": "본인의 댓글만 삭제할 수 있습니다."}), 403
     
-    # 관련된 좋아요 먼저 삭제
-    CourseBoardCommentLike.query.filter_by(comment_id=comment_id).delete()
-    
-    # 답글도 함께 삭제
-    CourseBoardComment.query.filter_by(parent_comment_id=comment_id).delete()
-    
+    # 답글(하위 답글 포함)과 좋아요는 FK ON DELETE CASCADE 로 DB 가 함께 삭제
     # 알림은 삭제하지 않음 (사용자가 "삭제된 댓글" 메시지를 볼 수 있도록)
-    
-    db.session.delete(comment)
+    version_keys = (f"board:{comment.post.course_id}" if comment.post else None, f"post:{comment.post_id}")
+    CourseBoardComment.query.filter_by(id=comment_id).delete()
+    bump_versions(*version_keys)
     db.session.commit()
     
     return jsonify({"message": "댓글 삭제 완료"}), 200
@@ -531,6 +512,7 @@ def toggle_like(post_id):
     if existing_like:
         # 좋아요 취소
         db.session.delete(existing_like)
+        bump_versions(f"board:{post.course_id}")
         db.session.commit()
         likes_count = CourseBoardLike.query.filter_by(post_id=post_id).count()
         return jsonify({
@@ -542,6 +524,7 @@ def toggle_like(post_id):
         # 좋아요 추가
         new_like = CourseBoardLike(post_id=post_id, user_id=user_id)
         db.session.add(new_like)
+        bump_versions(f"board:{post.course_id}")
         db.session.commit()
         
         likes_count = CourseBoardLike.query.filter_by(post_id=post_id).count()
@@ -571,6 +554,7 @@ def toggle_comment_like(comment_id):
     if existing_like:
         # 좋아요 취소
         db.session.delete(existing_like)
+        bump_versions(f"post:{comment.post_id}")
         db.session.commit()
         likes_count = CourseBoardCommentLike.query.filter_by(comment_id=comment_id).count()
         return jsonify({
@@ -582,6 +566,7 @@ def toggle_comment_like(comment_id):
         # 좋아요 추가
         new_like = CourseBoardCommentLike(comment_id=comment_id, user_id=user_id)
         db.session.add(new_like)
+        bump_versions(f"post:{comment.post_id}")
         db.session.commit()
         likes_count = CourseBoardCommentLike.query.filter_by(comment_id=comment_id).count()
         return jsonify({
@@ -621,74 +606,37 @@ def vote_poll(post_id):
     if poll.expires_at and poll.expires_at < datetime.now(timezone.utc):
         return jsonify({"message": "마감된 투표입니다."}), 400
     
-    # 이미 투표했는지 확인
-    existing_vote = PollVote.query.filter_by(poll_id=poll.id, user_id=user_id).first()
-    if existing_vote:
-        # 기존 투표 수정
-        existing_vote.option_id = option_id
-        db.session.commit()
-    else:
-        # 새 투표 추가
-        new_vote = PollVote(
-            poll_id=poll.id,
-            option_id=option_id,
-            user_id=user_id
-        )
-        db.session.add(new_vote)
-        db.session.commit()
+    # 투표 (처음이면 추가, 이미 투표했으면 옵션만 변경 - upsert 한 번)
+    cast_vote(poll.id, option.id, user_id)
+    bump_versions(f"board:{post.course_id}")
+    db.session.commit()
+    invalidate_tallies(poll.id)
     
-    # 업데이트된 투표 결과 반환
-    options_data = []
-    total_votes = 0
-    for opt in poll.options_relation:
-        votes = PollVote.query.filter_by(option_id=opt.id).all()
-        votes_count = len(votes)
-        total_votes += votes_count
-        
-        # 투표한 사용자 정보
-        voters = []
-        for vote in votes:
-            user = User.query.get(vote.user_id)
-            if user:
-                # 교수 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
-                author_student_id = None
-                if getattr(user, "user_type", None) == "student":
-                    author_student_id = user.student_id
-                
-                is_professor = getattr(user, "user_type", None) == "professor"
-                
-                voters.append({
-                    "id": user.id,
-                    "name": user.name,
-                    "student_id": author_student_id,
-                    "is_professor": is_professor,
-                    "profile_image": user.profile_image
-                })
-        
-        options_data.append({
-            "id": opt.id,
-            "text": opt.text,
-            "votes": votes_count,
-            "voters": voters
-        })
-    
-    vote = PollVote.query.filter_by(poll_id=poll.id, user_id=user_id).first()
-    user_vote = vote.option_id if vote else None
-    
-    poll_result = {
-        "id": poll.id,
-        "question": poll.question,
-        "options": options_data,
-        "total_votes": total_votes,
-        "user_vote": user_vote,
-        "expires_at": poll.expires_at.isoformat() if poll.expires_at else None
-    }
+    # 업데이트된 투표 결과 반환 (투표자 목록은 /voters 에서 따로 조회)
+    poll_result = build_poll_result(poll, user_id, user_vote=option.id)
     
     return jsonify({
         "message": "투표 완료",
         "poll": poll_result
     }), 200
 
+# 투표 옵션별 투표자 목록 (페이지 단위)
+@board_bp.route("/post/<int:post_id>/poll/options/<int:option_id>/voters", methods=["GET"])
+@jwt_required()
+def get_poll_voters(post_id, option_id):
+    poll = Poll.query.filter_by(post_id=post_id).first()
+    if not poll:
+        return jsonify({"message": "투표가 존재하지 않습니다."}), 404
+    
+    option = PollOption.query.filter_by(id=option_id, poll_id=poll.id).first()
+    if not option:
+        return jsonify({"message": "유효하지 않은 투표 옵션입니다."}), 400
+    
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", VOTERS_PER_PAGE, type=int)
+    
+    return jsonify(get_option_voters(option_id, page=page, per_page=per_page)), 200
+
 # 게시물 고정/고정 해제
 @board_bp.route("/post/<int:post_id>/pin", methods=["POST"])
 @jwt_required()
@@ -706,11 +654,11 @@ def toggle_pin_post(post_id):
         #     return jsonify({"message": "강의를 찾을 수 없습니다."}), 404
         
         # 사용자 정보 가져오기
-        current_user = User.query.get(user_id)
-        if not current_user:
+        user = current_user()
+        if not user:
             return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
         
-        user_type = getattr(current_user, "user_type", None)
+        user_type = user.user_type
         
         # 카테고리별 권한 체크
         # 교수: notice(공지), community(커뮤니티)만 고정 가능
@@ -740,10 +688,11 @@ def toggle_pin_post(post_id):
             # 다른 고정된 게시물들 모두 고정 해제 (계정 상관 없이)
             for other_post in other_pinned_posts:
                 other_post.is_pinned = False
-                print(f"게시물 {other_post.id} 고정 해제됨 (새 게시물 {post_id} 고정으로 인해)")
+                logger.debug("게시물 %s 고정 해제됨 (새 게시물 %s 고정으로 인해)", other_post.id, post_id)
         
         # 현재 게시물 고정 상태 토글
         post.is_pinned = not post.is_pinned
+        bump_versions(f"board:{post.course_id}")
         db.session.commit()
         
         return jsonify({
@@ -753,7 +702,5 @@ def toggle_pin_post(post_id):
         }), 200
     except Exception as e:
         db.session.rollback()
-        import traceback
-        print(f"게시물 고정 오류: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("게시물 %s 고정 오류", post_id)
         return jsonify({"message": f"게시물 고정 중 오류가 발생했습니다: {str(e)}"}), 500
\ No newline at end of file
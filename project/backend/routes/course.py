@@ -1,7 +1,22 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import joinedload
+from attachments import attachment_filenames, remove_attachments
+from course_catalog import CATALOG_PAGE_SIZE, get_catalog_page
+from enrollment_service import (
+    RosterError,
+    enroll_students,
+    enrolled_version_key,
+    list_enrolled_courses,
+    parse_roster,
+    resolve_students,
+)
 from extensions import db
-from models import Course, User, Enrollment, Notification
+from models import Course, CourseBoardPost, Enrollment, Poll, TeamRecruitment
+from outbox import enqueue_notification
+from poll_service import invalidate_tallies
+from resource_version import bump_versions, versioned_etag, COURSES_KEY, USERS_KEY
+from user_cache import current_user
 
 course_bp = Blueprint("course", __name__, url_prefix="/course")
 
@@ -10,7 +25,7 @@ course_bp = Blueprint("course", __name__, url_prefix="/course")
 @jwt_required()
 def get_my_courses():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user()
     
     if not user or user.user_type != 'professor':
         return jsonify({"message": "교수만 접근 가능합니다."}), 403
@@ -24,7 +39,7 @@ def get_my_courses():
 @jwt_required()
 def create_course():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user()
     
     if not user or user.user_type != 'professor':
         return jsonify({"message": "교수만 강의를 생성할 수 있습니다."}), 403
@@ -49,6 +64,7 @@ def create_course():
     )
     
     db.session.add(new_course)
+    bump_versions(COURSES_KEY)
     db.session.commit()
     
     return jsonify({
@@ -70,29 +86,65 @@ def delete_course(course_id):
     if course.professor_id != int(user_id):
         return jsonify({"message": "본인의 강의만 삭제할 수 있습니다."}), 403
     
-    # 강의에 연결된 수강 신청 데이터를 먼저 삭제
-    Enrollment.query.filter_by(course_id=course_id).delete()
-    
-    db.session.delete(course)
+    code = course.code
+
+    # 게시글 첨부파일과 투표 집계 캐시는 commit 후 정리
+    filenames = [
+        filename
+        for (files,) in db.session.query(CourseBoardPost.files).filter(
+            CourseBoardPost.course_id == code, CourseBoardPost.files.isnot(None)
+        )
+        for filename in attachment_filenames(files)
+    ]
+    poll_ids = [
+        poll_id
+        for (poll_id,) in db.session.query(Poll.id).join(CourseBoardPost, Poll.post_id == CourseBoardPost.id)
+        .filter(CourseBoardPost.course_id == code)
+    ]
+    team_ids = [team_id for (team_id,) in db.session.query(TeamRecruitment.id).filter_by(course_id=code)]
+
+    # 게시글/팀 모집글은 강의 코드(문자열)로 연결되어 FK 가 없으므로 직접 삭제한다.
+    # 그 아래 댓글/좋아요/투표/참여자와 수강 신청은 FK ON DELETE CASCADE 로 DB 가 함께 삭제
+    CourseBoardPost.query.filter_by(course_id=code).delete()
+    TeamRecruitment.query.filter_by(course_id=code).delete()
+    Course.query.filter_by(id=course_id).delete()
+    bump_versions(COURSES_KEY, f"board:{code}", f"recruit:{code}", *(f"team:{team_id}" for team_id in team_ids))
     db.session.commit()
+
+    for poll_id in poll_ids:
+        invalidate_tallies(poll_id)
+    remove_attachments(filenames)
     
     return jsonify({"message": "강의가 삭제되었습니다."}), 200
 
 
-# 모든 강의 조회 (학생이 강의 참여할 때 사용)
+# 모든 강의 조회 (이전 클라이언트 호환용, 새 코드는 /catalog 사용)
 @course_bp.route("/all", methods=["GET"])
 @jwt_required()
 def get_all_courses():
-    courses = Course.query.order_by(Course.created_at.desc()).all()
+    courses = Course.query.options(joinedload(Course.professor)).order_by(Course.created_at.desc()).all()
     return jsonify([c.to_dict() for c in courses]), 200
 
 
+# 강의 카탈로그 (학생이 강의 참여할 때 사용, 검색 + keyset 페이지네이션)
+@course_bp.route("/catalog", methods=["GET"])
+@jwt_required()
+@versioned_etag(lambda user_id: [COURSES_KEY, USERS_KEY])
+def get_course_catalog():
+    page = get_catalog_page(
+        q=request.args.get("q"),
+        cursor=request.args.get("cursor", type=int),
+        limit=request.args.get("limit", CATALOG_PAGE_SIZE, type=int),
+    )
+    return jsonify(page), 200
+
+
 # 강의 참여 (학생)
 @course_bp.route("/enroll/<int:course_id>", methods=["POST"])
 @jwt_required()
 def enroll_course(course_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user()
     
     if not user or user.user_type != 'student':
         return jsonify({"message": "학생만 강의에 참여할 수 있습니다."}), 403
@@ -102,45 +154,80 @@ def enroll_course(course_id):
     if not course:
         return jsonify({"message": "존재하지 않는 강의입니다."}), 404
     
-    # 이미 수강 중인지 확인
-    existing = Enrollment.query.filter_by(student_id=user_id, course_id=course_id).first()
-    if existing:
+    # 수강 신청 (이미 수강 중이면 아무것도 넣지 않음, 동시 요청도 유니크 인덱스로 한 번만 등록)
+    if not enroll_students(course_id, [user_id]):
         return jsonify({"message": "이미 수강 중인 강의입니다."}), 400
     
-    # 수강 신청
-    enrollment = Enrollment(student_id=user_id, course_id=course_id)
-    db.session.add(enrollment)
-    db.session.commit()
-    
-    # 🔔 교수에게 알림 전송
-    notification = Notification(
-        user_id=course.professor_id,
+    # 🔔 교수에게 알림 전송 (아웃박스 → 같은 트랜잭션으로 commit)
+    enqueue_notification(
+        [course.professor_id],
         type="enrollment",
         content=f"[{course.title}] {user.name}({user.student_id})님이 강의에 참여했습니다.",
         related_id=course_id,
         course_id=course.code
     )
-    db.session.add(notification)
     db.session.commit()
     
+    enrollment = Enrollment.query.filter_by(student_id=user_id, course_id=course_id).first()
     return jsonify({
         "message": "강의 참여 완료!",
         "enrollment": enrollment.to_dict()
     }), 201
 
 
+# 수강생 일괄 등록 (교수 본인 강의, JSON 또는 CSV 명단)
+@course_bp.route("/<int:course_id>/enrollments/bulk", methods=["POST"])
+@jwt_required()
+def bulk_enroll(course_id):
+    user_id = int(get_jwt_identity())
+    course = Course.query.get(course_id)
+
+    if not course:
+        return jsonify({"message": "존재하지 않는 강의입니다."}), 404
+
+    if course.professor_id != user_id:
+        return jsonify({"message": "본인의 강의에만 수강생을 등록할 수 있습니다."}), 403
+
+    try:
+        student_numbers = parse_roster(request)
+    except RosterError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # 학번 → 사용자 (쿼리 1번), 등록 (executemany 1번), 요약 알림 1건, commit 1번
+    found, missing = resolve_students(student_numbers)
+    enrolled_ids = enroll_students(course_id, [uid for user_ids in found.values() for uid in user_ids])
+
+    if enrolled_ids:
+        enqueue_notification(
+            [course.professor_id],
+            type="enrollment",
+            content=f"[{course.title}] 수강생 {len(enrolled_ids)}명이 일괄 등록되었습니다.",
+            related_id=course_id,
+            course_id=course.code
+        )
+    db.session.commit()
+
+    enrolled = set(enrolled_ids)
+    already = [number for number, user_ids in found.items() if not enrolled.intersection(user_ids)]
+    return jsonify({
+        "message": f"{len(enrolled_ids)}명을 등록했습니다.",
+        "enrolled_count": len(enrolled_ids),
+        "already_enrolled": already,
+        "not_found": missing,
+    }), 200
+
+
 # 학생의 수강 강의 목록 조회
 @course_bp.route("/enrolled", methods=["GET"])
 @jwt_required()
+@versioned_etag(lambda user_id: [enrolled_version_key(user_id), COURSES_KEY, USERS_KEY])
 def get_enrolled_courses():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user()
     
     if not user or user.user_type != 'student':
         return jsonify({"message": "학생만 접근 가능합니다."}), 403
     
-    enrollments = Enrollment.query.filter_by(student_id=user_id).order_by(Enrollment.enrolled_at.desc()).all()
-    courses = [e.course.to_dict() for e in enrollments if e.course]
-    
-    return jsonify(courses), 200
+    # 강의 + 교수 이름 JOIN 한 번 (학생별 캐시)
+    return jsonify(list_enrolled_courses(user_id)), 200
 
@@ -2,12 +2,14 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
 from models import Notification
+from resource_version import bump_versions, versioned_etag
 
 notification_bp = Blueprint("notification", __name__, url_prefix="/notification")
 
 # 내 알림 목록 조회
 @notification_bp.route("/", methods=["GET"])
 @jwt_required()
+@versioned_etag(lambda user_id: [f"notifications:{user_id}"])
 def get_notifications():
     user_id = get_jwt_identity()
     
@@ -31,6 +33,7 @@ def mark_as_read(notification_id):
         return jsonify({"error": "알림을 찾을 수 없습니다"}), 404
     
     notification.is_read = True
+    bump_versions(f"notifications:{user_id}")
     db.session.commit()
     
     return jsonify({"message": "알림을 읽음 처리했습니다"}), 200
@@ -43,6 +46,7 @@ def mark_all_as_read():
     
     Notification.query.filter_by(user_id=user_id, is_read=False)\
         .update({"is_read": True})
+    bump_versions(f"notifications:{user_id}")
     db.session.commit()
     
     return jsonify({"message": "모든 알림을 읽음 처리했습니다"}), 200
@@ -58,6 +62,7 @@ def delete_notification(notification_id):
         return jsonify({"error": "알림을 찾을 수 없습니다"}), 404
     
     db.session.delete(notification)
+    bump_versions(f"notifications:{user_id}")
     db.session.commit()
     
     return jsonify({"message": "알림이 삭제되었습니다"}), 200
@@ -1,20 +1,12 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from extensions import db, bcrypt
-from models import (
-    User,
-    AvailableTime,
-    Enrollment,
-    Course,
-    CourseBoardPost,
-    CourseBoardComment,
-    CourseBoardLike,
-    CourseBoardCommentLike,
-    TeamRecruitment,
-    TeamRecruitmentMember,
-    Schedule,
-    Notification,
-)
+from account_deletion import delete_account_data, schedule_account_deletion, should_delete_in_background
+from extensions import db
+from models import User, Course
+from password_service import hash_password, verify_password
+from resource_version import bump_versions, USERS_KEY
+from token_service import issue_tokens, revoke_user_tokens
+from user_cache import invalidate_user
 
 profile_bp = Blueprint("profile", __name__, url_prefix="/profile")
 
@@ -53,7 +45,10 @@ def update_profile():
     if "profileImage" in data: 
         user.profile_image = data["profileImage"]
 
+    # 게시글/댓글/모집 목록에 표시되는 이름·프로필 이미지가 바뀜
+    bump_versions(USERS_KEY)
     db.session.commit()
+    invalidate_user(user_id)
 
     return jsonify({"message": "프로필이 수정되었습니다.", "profile": user.to_dict()})
 
@@ -77,14 +72,18 @@ def change_password():
         return jsonify({"error": "비밀번호를 모두 입력해주세요."}), 400
 
     # 현재 비밀번호 검증(bcrypt)
-    if not bcrypt.check_password_hash(user.password_hash, current_pw):
+    if not verify_password(user.password_hash, current_pw):
         return jsonify({"error": "현재 비밀번호가 올바르지 않습니다."}), 400
 
     # 새 비밀번호 해시 후 저장(bcrypt)
-    user.password_hash = bcrypt.generate_password_hash(new_pw).decode("utf-8")
+    user.password_hash = hash_password(new_pw)
+    # 다른 기기(또는 탈취된) 리프레시 토큰은 모두 무효, 현재 세션에는 새 토큰을 준다
+    revoke_user_tokens(user.id)
+    tokens = issue_tokens(user.id, user.token_version)
     db.session.commit()
+    invalidate_user(user_id)
 
-    return jsonify({"message": "비밀번호가 성공적으로 변경되었습니다."})
+    return jsonify({"message": "비밀번호가 성공적으로 변경되었습니다.", **tokens})
 
 
 # -----------------------------------------
@@ -111,7 +110,7 @@ def delete_account():
         return jsonify({"error": "아이디 또는 이메일이 현재 계정 정보와 일치하지 않습니다."}), 400
 
     # 비밀번호 검증
-    if not bcrypt.check_password_hash(user.password_hash, password):
+    if not verify_password(user.password_hash, password):
         return jsonify({"error": "비밀번호가 올바르지 않습니다."}), 400
 
     # 교수 계정인 경우: 담당 강의가 남아 있으면 탈퇴 불가 처리
@@ -122,48 +121,13 @@ def delete_account():
                 "error": "담당 중인 강의가 있어 탈퇴할 수 없습니다. 강의를 먼저 삭제한 후 다시 시도해주세요."
             }), 400
 
-    # ------------------------------
-    # 연관 데이터 정리
-    # ------------------------------
-    # 알림
-    Notification.query.filter_by(user_id=user_id).delete()
+    # 작성한 글/댓글이 많은 계정은 로그인만 막고 백그라운드에서 나눠 삭제
+    if should_delete_in_background(user_id, current_app.config):
+        schedule_account_deletion(current_app._get_current_object(), user)
+        return jsonify({"message": "회원탈퇴가 접수되었습니다. 작성한 데이터는 잠시 후 모두 삭제됩니다."}), 202
 
-    # 가능한 시간
-    AvailableTime.query.filter_by(user_id=user_id).delete()
-
-    # 개인 일정
-    Schedule.query.filter_by(user_id=user_id).delete()
-
-    # 수강 정보(학생)
-    Enrollment.query.filter_by(student_id=user_id).delete()
-
-    # 팀 모집 참여자
-    TeamRecruitmentMember.query.filter_by(user_id=user_id).delete()
-
-    # 내가 작성한 팀 모집 글과 그 참여자
-    my_recruits = TeamRecruitment.query.filter_by(author_id=user_id).all()
-    for recruit in my_recruits:
-        TeamRecruitmentMember.query.filter_by(recruitment_id=recruit.id).delete()
-        db.session.delete(recruit)
-
-    # 내가 누른 댓글 좋아요
-    CourseBoardCommentLike.query.filter_by(user_id=user_id).delete()
-
-    # 내가 누른 게시글 좋아요
-    CourseBoardLike.query.filter_by(user_id=user_id).delete()
-
-    # 내가 작성한 댓글
-    CourseBoardComment.query.filter_by(author_id=user_id).delete()
-
-    # 내가 작성한 게시글(관련 댓글/좋아요 포함)
-    my_posts = CourseBoardPost.query.filter_by(author_id=user_id).all()
-    for post in my_posts:
-        CourseBoardComment.query.filter_by(post_id=post.id).delete()
-        CourseBoardLike.query.filter_by(post_id=post.id).delete()
-        db.session.delete(post)
-
-    # 마지막으로 사용자 삭제
-    db.session.delete(user)
-    db.session.commit()
+    # 연관 데이터 정리 (테이블마다 집합 단위 DELETE) 후 사용자 삭제
+    # (발급된 리프레시 토큰은 사용자 행이 없어지면서 무효)
+    delete_account_data(user_id)
 
     return jsonify({"message": "회원탈퇴가 완료되었습니다."}), 200
\ No newline at end of file
@@ -1,7 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import update, delete
+from sqlalchemy.exc import IntegrityError
 from extensions import db
-from models import TeamRecruitment, TeamRecruitmentMember, User, Notification, Course, CourseBoardPost
+from models import TeamRecruitment, TeamRecruitmentMember, Course, CourseBoardPost
+from outbox import enqueue_notification
+from resource_version import bump_versions, versioned_etag, USERS_KEY
+from user_cache import current_user
 
 recruit_bp = Blueprint("recruit", __name__, url_prefix="/recruit")
 
@@ -9,10 +14,11 @@ recruit_bp = Blueprint("recruit", __name__, url_prefix="/recruit")
 # 모집 글 목록 조회
 @recruit_bp.route("/<string:course_id>", methods=["GET"])
 @jwt_required()
+@versioned_etag(lambda user_id, course_id: [f"recruit:{course_id}", USERS_KEY])
 def list_recruitments(course_id):
     user_id = int(get_jwt_identity())
     recruitments = (
-        TeamRecruitment.query.filter_by(course_id=course_id)
+        TeamRecruitment.eager_query().filter_by(course_id=course_id)
         .order_by(TeamRecruitment.id.desc())
         .all()
     )
@@ -27,7 +33,7 @@ def create_recruitment():
     data = request.get_json() or {}
 
     # 교수는 모집글 작성 불가
-    user = User.query.get(user_id)
+    user = current_user()
     if user and user.user_type == "professor":
         return jsonify({"message": "교수는 모집글을 작성할 수 없습니다."}), 403
 
@@ -55,13 +61,15 @@ def create_recruitment():
         description=description,
         team_board_name=team_board_name,
         max_members=max_members,
+        member_count=1,  # 작성자 본인
     )
     db.session.add(recruitment)
-    db.session.commit()
+    db.session.flush()  # recruitment.id를 얻기 위해 flush
 
     # 작성자는 자동으로 멤버로 추가
     member = TeamRecruitmentMember(recruitment_id=recruitment.id, user_id=user_id)
     db.session.add(member)
+    bump_versions(f"recruit:{recruitment.course_id}")
     db.session.commit()
 
     return (
@@ -88,15 +96,55 @@ def delete_recruitment(recruitment_id):
     if recruitment.author_id != user_id:
         return jsonify({"message": "본인의 모집글만 삭제할 수 있습니다."}), 403
 
-    # 참여자 먼저 삭제
-    TeamRecruitmentMember.query.filter_by(recruitment_id=recruitment_id).delete()
-
-    db.session.delete(recruitment)
+    # 참여자/팀 가능 시간/제출 기록은 FK ON DELETE CASCADE 로 DB 가 함께 삭제
+    course_id = recruitment.course_id
+    TeamRecruitment.query.filter_by(id=recruitment_id).delete()
+    bump_versions(f"recruit:{course_id}", f"team:{recruitment_id}")
     db.session.commit()
 
     return jsonify({"message": "모집글 삭제 완료"}), 200
 
 
+def _increment_member_count(recruitment_id):
+    """정원이 남아 있을 때만 member_count 를 1 늘리고 늘어난 인원을 반환 (가득 찼으면 None)"""
+    stmt = (
+        update(TeamRecruitment)
+        .where(
+            TeamRecruitment.id == recruitment_id,
+            TeamRecruitment.member_count < TeamRecruitment.max_members,
+        )
+        .values(member_count=TeamRecruitment.member_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if db.engine.dialect.update_returning:
+        return db.session.execute(stmt.returning(TeamRecruitment.member_count)).scalar()
+
+    # RETURNING 을 지원하지 않는 DB: 같은 트랜잭션(쓰기 잠금 보유 중)에서 다시 읽기
+    if not db.session.execute(stmt).rowcount:
+        return None
+    return db.session.query(TeamRecruitment.member_count).filter_by(id=recruitment_id).scalar()
+
+
+def _activate_board(recruitment_id, close=False):
+    """아직 비활성화 상태일 때만 팀 게시판을 활성화 (이번 호출이 활성화했으면 True)
+
+    close=True 면 같은 UPDATE 에서 정원을 현재 인원으로 줄여 모집을 마감한다.
+    (DB 의 member_count 를 그대로 쓰므로 동시에 들어온 참여와 어긋나지 않음)
+    """
+    values = {"is_board_activated": True}
+    if close:
+        values["max_members"] = TeamRecruitment.member_count
+    return db.session.execute(
+        update(TeamRecruitment)
+        .where(
+            TeamRecruitment.id == recruitment_id,
+            TeamRecruitment.is_board_activated == False,
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+
 # 모집 참여 / 취소 토글
 @recruit_bp.route("/<int:recruitment_id>/join", methods=["POST"])
 @jwt_required()
@@ -117,69 +165,71 @@ def toggle_join(recruitment_id):
         if recruitment.is_board_activated:
             return jsonify({"message": "팀 게시판이 활성화되어 참여 취소할 수 없습니다."}), 400
         
-        # 참여 취소
-        db.session.delete(existing)
+        # 참여 취소 (실제로 지운 경우에만 인원 감소)
+        removed = db.session.execute(
+            delete(TeamRecruitmentMember).where(
+                TeamRecruitmentMember.recruitment_id == recruitment_id,
+                TeamRecruitmentMember.user_id == user_id,
+            )
+        ).rowcount
+        if removed:
+            db.session.execute(
+                update(TeamRecruitment)
+                .where(TeamRecruitment.id == recruitment_id, TeamRecruitment.member_count > 0)
+                .values(member_count=TeamRecruitment.member_count - 1)
+            )
+            bump_versions(f"recruit:{recruitment.course_id}", f"team:{recruitment_id}")
         db.session.commit()
     else:
-        # 정원 체크
-        current_count = TeamRecruitmentMember.query.filter_by(
-            recruitment_id=recruitment_id
-        ).count()
-        if current_count >= recruitment.max_members:
+        # 정원 체크 + 인원 증가를 조건부 UPDATE 한 번으로 처리
+        # (동시에 여러 명이 참여해도 member_count 가 max_members 를 넘지 않음)
+        new_count = _increment_member_count(recruitment_id)
+        if new_count is None:
+            db.session.rollback()
             return jsonify({"message": "이미 인원이 가득 찼습니다."}), 400
 
         new_member = TeamRecruitmentMember(
             recruitment_id=recruitment_id, user_id=user_id
         )
         db.session.add(new_member)
-        db.session.commit()
+        try:
+            db.session.flush()
+        except IntegrityError:
+            # 같은 사용자의 중복 요청 → 인원 증가까지 함께 롤백
+            db.session.rollback()
+            return jsonify({"message": "이미 참여 중인 모집입니다."}), 400
         
         # 🔔 모집 작성자에게 알림 (본인이 아닌 경우에만)
+        course = Course.query.filter_by(code=recruitment.course_id).first()
+        course_title = course.title if course else recruitment.course_id
         if recruitment.author_id != int(user_id):
-            joiner = User.query.get(user_id)
-            course = Course.query.filter_by(code=recruitment.course_id).first()
-            course_title = course.title if course else recruitment.course_id
+            joiner = current_user()
             
-            notification = Notification(
-                user_id=recruitment.author_id,
+            enqueue_notification(
+                [recruitment.author_id],
                 type="recruitment_join",
                 content=f"[{course_title}] 모집 \"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}\" 에 {joiner.name}님이 참여했습니다.",
                 related_id=recruitment_id,
                 course_id=recruitment.course_id
             )
-            db.session.add(notification)
-            db.session.commit()
-        
-        # ✨ 인원이 다 차면 자동으로 팀 게시판 활성화
-        current_count = TeamRecruitmentMember.query.filter_by(
-            recruitment_id=recruitment_id
-        ).count()
         
-        if current_count >= recruitment.max_members and not recruitment.is_board_activated:
-            # 팀 게시판 자동 활성화
-            recruitment.is_board_activated = True
-            db.session.commit()
-            
+        # ✨ 인원이 다 차면 자동으로 팀 게시판 활성화 (UPDATE 결과로 판단, 한 요청만 활성화에 성공)
+        if new_count >= recruitment.max_members and _activate_board(recruitment_id):
             # 🔔 팀원 전체에게 활성화 알림 전송
-            course = Course.query.filter_by(code=recruitment.course_id).first()
-            course_title = course.title if course else recruitment.course_id
-            
-            # 모든 팀원에게 알림 전송
             all_members = TeamRecruitmentMember.query.filter_by(
                 recruitment_id=recruitment_id
             ).all()
             
-            for member in all_members:
-                notification = Notification(
-                    user_id=member.user_id,
-                    type="team_board_activated",
-                    content=f"[{course_title}] 모집 \"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}\"의 인원이 마감되어 팀 게시판이 활성화되었습니다!",
-                    related_id=recruitment_id,
-                    course_id=recruitment.course_id
-                )
-                db.session.add(notification)
-            
-            db.session.commit()
+            enqueue_notification(
+                [member.user_id for member in all_members],
+                type="team_board_activated",
+                content=f"[{course_title}] 모집 \"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}\"의 인원이 마감되어 팀 게시판이 활성화되었습니다!",
+                related_id=recruitment_id,
+                course_id=recruitment.course_id
+            )
+        
+        bump_versions(f"recruit:{recruitment.course_id}", f"team:{recruitment_id}")
+        db.session.commit()
 
     # 최신 상태 다시 계산해서 내려주기
     updated = TeamRecruitment.query.get(recruitment_id)
@@ -201,20 +251,18 @@ def list_team_boards(course_id):
     """현재 사용자가 참여한 활성화된 팀 게시판 목록 반환"""
     user_id = int(get_jwt_identity())
     
-    # 사용자가 참여한 모집글의 ID들 가져오기
-    member_recruitments = (
-        TeamRecruitmentMember.query.filter_by(user_id=user_id)
-        .with_entities(TeamRecruitmentMember.recruitment_id)
-        .all()
+    # 사용자가 참여한 모집글의 ID들 (서브쿼리로 한 번에 조회)
+    recruitment_ids = (
+        db.session.query(TeamRecruitmentMember.recruitment_id)
+        .filter(TeamRecruitmentMember.user_id == user_id)
     )
-    recruitment_ids = [m.recruitment_id for m in member_recruitments]
     
     # 활성화되고 사용자가 참여한 팀 게시판만 조회
     team_boards = (
-        TeamRecruitment.query.filter(
+        TeamRecruitment.eager_query().filter(
             TeamRecruitment.course_id == course_id,
             TeamRecruitment.is_board_activated == True,
-            TeamRecruitment.id.in_(recruitment_ids)
+            TeamRecruitment.id.in_(recruitment_ids.scalar_subquery())
         )
         .order_by(TeamRecruitment.id.desc())
         .all()
@@ -243,16 +291,11 @@ def activate_team_board(recruitment_id):
     if recruitment.is_board_activated:
         return jsonify({"message": "이미 활성화된 팀 게시판입니다."}), 400
 
-    # 현재 참여 인원수 계산
-    current_members_count = TeamRecruitmentMember.query.filter_by(
-        recruitment_id=recruitment_id
-    ).count()
-    
     # 팀 게시판 활성화 시 자동으로 마감 처리 (max_members를 현재 인원수로 설정)
-    recruitment.max_members = current_members_count
-    recruitment.is_board_activated = True
-    
-    db.session.commit()
+    # 조건부 UPDATE 한 번으로 처리해서 동시 참여/자동 활성화와 겹쳐도 알림은 한 번만 보낸다
+    if not _activate_board(recruitment_id, close=True):
+        db.session.rollback()
+        return jsonify({"message": "이미 활성화된 팀 게시판입니다."}), 400
     
     # 🔔 팀원 전체에게 활성화 알림 전송 (수동 활성화)
     course = Course.query.filter_by(code=recruitment.course_id).first()
@@ -263,16 +306,15 @@ def activate_team_board(recruitment_id):
         recruitment_id=recruitment_id
     ).all()
     
-    for member in all_members:
-        notification = Notification(
-            user_id=member.user_id,
-            type="team_board_activated",
-            content=f"[{course_title}] 모집 \"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}\"의 팀 게시판이 활성화되었습니다!",
-            related_id=recruitment_id,
-            course_id=recruitment.course_id
-        )
-        db.session.add(notification)
+    enqueue_notification(
+        [member.user_id for member in all_members],
+        type="team_board_activated",
+        content=f"[{course_title}] 모집 \"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}\"의 팀 게시판이 활성화되었습니다!",
+        related_id=recruitment_id,
+        course_id=recruitment.course_id
+    )
     
+    bump_versions(f"recruit:{recruitment.course_id}", f"team:{recruitment_id}")
     db.session.commit()
 
     return (
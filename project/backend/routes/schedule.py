@@ -1,29 +1,83 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
-from models import Schedule
+from models import Schedule, User
+from schedule_service import feed_token, iter_ics, parse_date_range, range_query, user_id_from_feed_token
 
 schedule_bp = Blueprint("schedule", __name__, url_prefix="/schedule")
 
 
-# 사용자의 모든 일정 조회 (년/월 필터링)
+# 사용자의 모든 일정 조회 (년/월 필터링 또는 from/to 기간 조회)
 @schedule_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_schedules():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     year = request.args.get("year", type=int)
     month = request.args.get("month", type=int)
     
-    query = Schedule.query.filter_by(user_id=user_id)
-    
-    if year and month:
-        query = query.filter_by(year=year, month=month)
-    
-    schedules = query.all()
+    if request.args.get("from") or request.args.get("to"):
+        # 여러 달에 걸친 기간 (YYYY-MM-DD ~ YYYY-MM-DD)
+        try:
+            start, end = parse_date_range(request.args)
+        except ValueError:
+            return jsonify({"message": "from/to 는 YYYY-MM-DD 형식이어야 하고 from 이 to 보다 늦을 수 없습니다."}), 400
+        schedules = db.session.scalars(range_query(user_id, start, end)).all()
+    else:
+        query = Schedule.query.filter_by(user_id=user_id)
+        
+        if year and month:
+            query = query.filter_by(year=year, month=month)
+        
+        schedules = query.all()
     return jsonify([s.to_dict() for s in schedules]), 200
 
 
+def _ics_response(user_id, filename=None):
+    try:
+        start, end = parse_date_range(request.args)
+    except ValueError:
+        return jsonify({"message": "from/to 는 YYYY-MM-DD 형식이어야 하고 from 이 to 보다 늦을 수 없습니다."}), 400
+
+    response = Response(
+        stream_with_context(iter_ics(user_id, request.host, start, end)),
+        mimetype="text/calendar",
+    )
+    response.headers["Cache-Control"] = "private, no-cache"
+    if filename:
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# 일정 내보내기 (.ics 파일 다운로드, from/to 기간 지정 가능)
+@schedule_bp.route("/export.ics", methods=["GET"])
+@jwt_required()
+def export_schedules():
+    return _ics_response(int(get_jwt_identity()), filename="schedules.ics")
+
+
+# 캘린더 앱 구독 주소 발급
+@schedule_bp.route("/feed", methods=["GET"])
+@jwt_required()
+def get_feed_url():
+    user = User.query.get(int(get_jwt_identity()))
+    if not user:
+        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
+    
+    url = url_for("schedule.schedule_feed", token=feed_token(user), _external=True)
+    return jsonify({"url": url}), 200
+
+
+# 캘린더 앱 구독 (토큰 주소, Authorization 헤더 없이 접근)
+@schedule_bp.route("/feed/<token>.ics", methods=["GET"])
+def schedule_feed(token):
+    user_id = user_id_from_feed_token(token)
+    if user_id is None:
+        return jsonify({"message": "유효하지 않은 구독 주소입니다."}), 404
+    
+    return _ics_response(user_id)
+
+
 # 일정 생성
 @schedule_bp.route("/", methods=["POST"])
 @jwt_required()
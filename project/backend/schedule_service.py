@@ -0,0 +1,149 @@
+"""
+개인 일정 기간 조회와 iCalendar(.ics) 내보내기
+
+GET /schedule/?from=2025-03-01&to=2025-06-30
+- 여러 달에 걸친 기간을 한 번에 조회한다. (year, month, date) 행 값 비교로 범위를 걸어서
+  ix_schedules_user_date (user_id, year, month, date) 인덱스 범위 스캔 + 정렬 없이 읽는다.
+
+GET /schedule/export.ics, GET /schedule/feed/<토큰>.ics
+- 일정을 종일 일정(VEVENT)으로 한 줄씩 만들어 스트리밍한다. 전체 목록을 메모리에 쌓지 않고
+  DB 에서도 ICS_FETCH_SIZE 행씩 나눠 읽는다. (text/calendar 는 compression.py 에서 청크 단위로 압축)
+- 캘린더 앱(구글/애플 캘린더 구독)은 Authorization 헤더를 보낼 수 없으므로 구독 주소에는
+  서명된 피드 토큰을 넣는다. 토큰에는 비밀번호 해시 지문이 들어 있어서
+  비밀번호를 바꾸면 예전 구독 주소는 더 이상 동작하지 않는다.
+
+- ICS_FETCH_SIZE: 내보내기 시 한 번에 읽을 일정 행 수 (기본 500)
+"""
+import hashlib
+import os
+from datetime import date, timedelta
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import select, tuple_
+
+from extensions import db
+from models import Schedule, User
+
+FEED_TOKEN_SALT = "schedule-ics-feed"
+ICS_LINE_LIMIT = 75  # RFC 5545: 한 줄 최대 75 옥텟, 넘으면 접어서 이어 쓴다
+
+
+def parse_date_range(args):
+    """from/to 쿼리 파라미터(YYYY-MM-DD) → (시작일, 종료일), 없는 쪽은 None. 형식이 틀리면 ValueError"""
+    start = date.fromisoformat(args["from"]) if args.get("from") else None
+    end = date.fromisoformat(args["to"]) if args.get("to") else None
+    if start and end and start > end:
+        raise ValueError("from 이 to 보다 늦습니다.")
+    return start, end
+
+
+def range_query(user_id, start=None, end=None):
+    """사용자 일정 select (기간 조건 포함, 날짜순)"""
+    ymd = tuple_(Schedule.year, Schedule.month, Schedule.date)
+    stmt = select(Schedule).where(Schedule.user_id == user_id)
+    if start:
+        stmt = stmt.where(ymd >= tuple_(start.year, start.month, start.day))
+    if end:
+        stmt = stmt.where(ymd <= tuple_(end.year, end.month, end.day))
+    return stmt.order_by(Schedule.year, Schedule.month, Schedule.date, Schedule.id)
+
+
+def _escape(text):
+    return (
+        (text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """75 옥텟마다 CRLF + 공백으로 접기 (UTF-8 글자 중간에서 자르지 않음)"""
+    out = []
+    current = ""
+    size = 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > ICS_LINE_LIMIT:
+            out.append(current)
+            current = " "
+            size = 1
+        current += char
+        size += width
+    out.append(current)
+    return "\r\n".join(out) + "\r\n"
+
+
+def _event(schedule, host):
+    try:
+        day = date(schedule.year, schedule.month, schedule.date)
+    except ValueError:
+        # 잘못 저장된 날짜(2월 31일 등)는 건너뛴다
+        return ""
+
+    stamp = schedule.created_at.strftime("%Y%m%dT%H%M%SZ") if schedule.created_at else day.strftime("%Y%m%dT000000Z")
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:schedule-{schedule.id}@{host}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{_escape(schedule.title)}",
+    ]
+    if schedule.category:
+        lines.append(f"CATEGORIES:{_escape(schedule.category)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def iter_ics(user_id, host, start=None, end=None):
+    """iCalendar 본문을 일정 하나씩 yield (stream_with_context 안에서 사용)"""
+    yield "".join(_fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{host}//schedule//KO",
+        "CALSCALE:GREGORIAN",
+        "X-WR-CALNAME:내 일정",
+    ])
+
+    fetch_size = current_app.config["ICS_FETCH_SIZE"]
+    result = db.session.execute(range_query(user_id, start, end).execution_options(yield_per=fetch_size))
+    for schedule in result.scalars():
+        event = _event(schedule, host)
+        if event:
+            yield event
+
+    yield "END:VCALENDAR\r\n"
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config["JWT_SECRET_KEY"], salt=FEED_TOKEN_SALT)
+
+
+def _fingerprint(password_hash):
+    return hashlib.sha256((password_hash or "").encode("utf-8")).hexdigest()[:12]
+
+
+def feed_token(user):
+    """캘린더 구독 주소용 토큰"""
+    return _serializer().dumps([user.id, _fingerprint(user.password_hash)])
+
+
+def user_id_from_feed_token(token):
+    """피드 토큰 → user id (잘못됐거나 비밀번호가 바뀐 토큰이면 None)"""
+    try:
+        user_id, fingerprint = _serializer().loads(token)
+    except (BadSignature, TypeError, ValueError):
+        return None
+
+    password_hash = db.session.scalar(select(User.password_hash).where(User.id == user_id))
+    if password_hash is None or _fingerprint(password_hash) != fingerprint:
+        return None
+    return user_id
+
+
+def init_schedule_service(app):
+    app.config.setdefault("ICS_FETCH_SIZE", int(os.getenv("ICS_FETCH_SIZE", "500")))
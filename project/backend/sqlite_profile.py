@@ -0,0 +1,101 @@
+"""
+SQLite 연결 튜닝 프로필
+
+gunicorn 워커 여러 개가 같은 SQLite 파일을 쓰면 기본 설정(rollback journal)에서는
+쓰기 중에 읽기까지 막혀 "database is locked" 가 자주 난다.
+새 연결이 만들어질 때마다 SQLAlchemy connect 이벤트로 PRAGMA 를 적용한다.
+
+foreign_keys=ON 은 프로필과 관계없이 항상 켠다. SQLite 는 연결마다 켜야 FK 검사와
+ondelete="CASCADE" 가 동작하고, 게시글/댓글/강의 삭제가 자식 행 정리를 DB 에 맡기기 때문이다.
+
+- SQLITE_PROFILE: production(기본) / default(성능 PRAGMA 적용 안 함)
+- SQLITE_PRAGMA_<NAME>: 개별 값 덮어쓰기 (예: SQLITE_PRAGMA_BUSY_TIMEOUT=10000)
+"""
+import logging
+import os
+
+from sqlalchemy import event
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+# 프로필과 관계없이 항상 적용 (게시글/댓글/강의 삭제의 CASCADE 가 이 설정에 의존)
+REQUIRED_PRAGMAS = {"foreign_keys": "ON"}
+
+# 적용 순서가 의미 있음: busy_timeout 을 먼저 걸어야 journal_mode 변경이 잠금에 막혀도 기다린다
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "busy_timeout": 5000,            # ms, 잠금 시 바로 실패하지 않고 대기
+        "journal_mode": "WAL",           # 읽기와 쓰기가 서로 막지 않음
+        "synchronous": "NORMAL",         # WAL 에서는 NORMAL 도 커밋 내구성 유지, fsync 횟수 감소
+        "mmap_size": 256 * 1024 * 1024,  # 256MB 메모리 맵 읽기
+        "cache_size": -20000,            # 음수 = KiB 단위 (약 20MB 페이지 캐시)
+        "temp_store": "MEMORY",          # 정렬/임시 테이블을 메모리에서 처리
+    },
+}
+
+
+def load_sqlite_pragmas():
+    """환경 변수 기준으로 적용할 PRAGMA 목록을 만든다"""
+    profile_name = os.getenv("SQLITE_PROFILE", "production")
+    pragmas = dict(REQUIRED_PRAGMAS)
+    pragmas.update(SQLITE_PROFILES.get(profile_name, SQLITE_PROFILES["production"]))
+
+    for name in SQLITE_PROFILES["production"]:
+        override = os.getenv(f"SQLITE_PRAGMA_{name.upper()}")
+        if override:
+            pragmas[name] = override
+    return pragmas
+
+
+def init_sqlite_profile(app):
+    """앱 엔진에 connect 이벤트 등록 (SQLite 가 아니면 아무것도 하지 않음)
+
+    app_context 안에서, 엔진이 첫 연결을 만들기 전에 호출해야 한다.
+    """
+    pragmas = app.config.setdefault("SQLITE_PRAGMAS", load_sqlite_pragmas())
+    engine = db.engine
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def report_sqlite_settings(app):
+    """실제로 적용된 PRAGMA 값을 확인해서 출력 (기동 시 자가 점검용)"""
+    engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return {}
+
+    pragmas = app.config.get("SQLITE_PRAGMAS", {})
+    effective = {}
+    with engine.connect() as conn:
+        for name in (*REQUIRED_PRAGMAS, *SQLITE_PROFILES["production"]):
+            effective[name] = conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+    # synchronous / temp_store 는 숫자로 돌려주므로 이름으로 바꿔서 비교
+    synchronous_names = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+    temp_store_names = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+    effective["synchronous"] = synchronous_names.get(effective["synchronous"], effective["synchronous"])
+    effective["temp_store"] = temp_store_names.get(effective["temp_store"], effective["temp_store"])
+    effective["foreign_keys"] = "ON" if effective["foreign_keys"] else "OFF"
+
+    mismatched = [
+        name for name, expected in pragmas.items()
+        if str(effective.get(name)).upper() != str(expected).upper()
+    ]
+
+    summary = ", ".join(f"{name}={value}" for name, value in effective.items())
+    logger.info("SQLite 설정: %s", summary)
+    if mismatched:
+        logger.warning("SQLite 설정이 요청한 값과 다릅니다: %s", ", ".join(mismatched))
+    return effective
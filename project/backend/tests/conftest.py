@@ -0,0 +1,22 @@
+"""
+pytest 공통 설정 (backend 디렉터리에서 python -m pytest 로 실행)
+
+app.py 는 import 할 때 모듈 레벨에서 앱을 만들기 때문에
+기본 instance/project.db 를 건드리지 않도록 import 전에 임시 SQLite 파일을 DATABASE_URL 로 지정한다.
+
+- TEST_POSTGRES_URL: 지정하면 PostgreSQL 테스트도 실행 (테스트가 스키마를 지우고 다시 만들므로 빈 테스트 DB 사용)
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+_session_dir = tempfile.mkdtemp(prefix="allmeet-test-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_session_dir, "import.db")
+# 테스트에서는 백그라운드 스레드/프로세스 없이 실행
+os.environ.setdefault("OUTBOX_DISPATCHER_ENABLED", "0")
+os.environ.setdefault("PASSWORD_HASH_POOL_SIZE", "0")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
@@ -0,0 +1,173 @@
+"""
+DATABASE_URL 백엔드 설정과 마이그레이션 경로 테스트
+
+SQLite 임시 파일로는 항상 실행하고, TEST_POSTGRES_URL 이 있으면 같은 테스트를 PostgreSQL 로도 실행한다.
+"""
+import os
+
+import pytest
+import sqlalchemy as sa
+from alembic.runtime.migration import MigrationContext
+from flask_migrate import downgrade, upgrade
+
+import database
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL", "").strip()
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def database_url(request, tmp_path, monkeypatch):
+    if request.param == "sqlite":
+        url = "sqlite:///" + str(tmp_path / "project.db")
+    else:
+        if not POSTGRES_URL:
+            pytest.skip("TEST_POSTGRES_URL 이 없어서 PostgreSQL 테스트를 건너뜀")
+        url = POSTGRES_URL
+        # 이전 실행이 남긴 스키마를 지우고 빈 DB 에서 시작
+        engine = sa.create_engine(database.get_database_uri() if url.startswith("postgres://") else url)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+            conn.exec_driver_sql("CREATE SCHEMA public")
+        engine.dispose()
+
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setattr(database, "MIGRATION_LOCK_PATH", str(tmp_path / "migrate.lock"))
+    monkeypatch.setenv("AUTO_MIGRATE", "1")
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    return url
+
+
+@pytest.fixture
+def app(database_url):
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    app.config["TESTING"] = True
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _schema_revisions(app):
+    from extensions import db
+
+    current, heads = database.get_schema_versions(app, db.engine)
+    return current, heads
+
+
+def test_database_uri_defaults_to_instance_sqlite(tmp_path, monkeypatch):
+    default_path = tmp_path / "instance" / "project.db"
+    monkeypatch.setattr(database, "DEFAULT_SQLITE_PATH", str(default_path))
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+
+    assert database.get_database_uri() == f"sqlite:///{default_path}"
+    assert default_path.parent.is_dir()
+
+
+def test_database_uri_rewrites_postgres_scheme(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgres://user:pw@db.example.com:5432/allmeet")
+    assert database.get_database_uri() == "postgresql://user:pw@db.example.com:5432/allmeet"
+
+
+def test_engine_options_pool_only_for_server_databases(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "12")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "900")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "0")
+
+    assert database.get_engine_options("sqlite:///project.db") == {}
+    assert database.get_engine_options("postgresql://localhost/allmeet") == {
+        "pool_size": 7,
+        "max_overflow": 3,
+        "pool_timeout": 12,
+        "pool_recycle": 900,
+        "pool_pre_ping": False,
+    }
+
+
+def test_app_uses_database_url_and_pool_options(app, database_url):
+    from extensions import db
+
+    assert app.config["SQLALCHEMY_DATABASE_URI"] == database.get_database_uri()
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == "sqlite":
+            assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == {}
+            assert engine.url.database == database_url[len("sqlite:///"):]
+        else:
+            assert engine.pool.size() == 3
+            assert engine.pool._max_overflow == 2
+            assert engine.pool._recycle == 600
+            assert engine.pool._pre_ping
+
+
+def test_startup_upgrades_empty_database_to_head(app):
+    from extensions import db
+
+    with app.app_context():
+        current, heads = _schema_revisions(app)
+        assert current == heads
+        tables = set(sa.inspect(db.engine).get_table_names())
+        assert {"user", "courses", "enrollments", "notification_outbox", "resource_versions"} <= tables
+
+
+def test_startup_upgrades_stale_schema(app):
+    from extensions import db
+
+    with app.app_context():
+        downgrade(revision="-1")
+        db.engine.dispose()
+        current, heads = _schema_revisions(app)
+        assert current != heads
+
+        assert database.ensure_schema_version(app, db.engine)
+        assert _schema_revisions(app)[0] == heads
+
+
+def test_stale_schema_is_left_alone_without_auto_migrate(app, monkeypatch):
+    from extensions import db
+
+    monkeypatch.setenv("AUTO_MIGRATE", "0")
+    with app.app_context():
+        downgrade(revision="-1")
+        assert not database.ensure_schema_version(app, db.engine)
+        upgrade()
+
+
+def test_migrations_downgrade_to_base_and_back(app):
+    from extensions import db
+
+    with app.app_context():
+        downgrade(revision="base")
+        with db.engine.connect() as conn:
+            assert MigrationContext.configure(conn).get_current_heads() == ()
+
+        upgrade()
+        current, heads = _schema_revisions(app)
+        assert current == heads
+
+
+def test_register_and_login_round_trip(app):
+    client = app.test_client()
+    body = {
+        "studentId": "20250001",
+        "name": "테스트",
+        "email": "test@example.com",
+        "username": "tester",
+        "password": "pw-1234",
+        "userType": "student",
+    }
+    assert client.post("/auth/register", json=body).status_code == 201
+
+    response = client.post("/auth/login", json={"email": "tester", "password": "pw-1234"})
+    assert response.status_code == 200
+    token = response.get_json()["access_token"]
+
+    response = client.get("/course/enrolled", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.get_json() == []
@@ -0,0 +1,134 @@
+"""
+액세스/리프레시 토큰 발급과 폐기
+
+로그인하면 짧은 액세스 토큰(기본 1시간)과 긴 리프레시 토큰(기본 14일)을 함께 준다.
+액세스 토큰이 만료되면 프론트엔드는 /auth/refresh 로 새 토큰 쌍을 받는다 (bcrypt 검증 없음).
+
+- 리프레시 토큰은 한 번 쓰면 폐기하고 새로 발급한다 (회전).
+  폐기 기록은 조건부 INSERT 로 남기므로 같은 토큰으로 동시에 두 번 요청해도 한 쪽만 성공한다.
+- 리프레시 토큰에는 발급 당시 사용자의 토큰 세대(User.token_version)를 ver 클레임으로 넣는다.
+  비밀번호 변경/재설정과 회원 탈퇴는 revoke_user_tokens() 로 세대를 올려서
+  이미 발급된 리프레시 토큰을 한 번에 무효로 만든다 (탈취된 토큰으로 계속 회전하는 것 방지).
+- 폐기 목록(revoked_tokens)과 세대는 리프레시 토큰만 확인한다 (쿼리 1번).
+  탈퇴했거나 탈퇴 처리 중('!' 해시)인 사용자의 리프레시 토큰도 여기서 거절한다.
+  액세스 토큰 검증에는 DB 조회가 없으므로 이미 발급된 액세스 토큰은 만료(기본 1시간)까지 유효하다.
+- 원래 만료 시각이 지난 폐기 기록은 워커마다 REVOKED_TOKEN_PURGE_INTERVAL 마다 삭제한다.
+
+- JWT_ACCESS_TOKEN_MINUTES: 액세스 토큰 유효 시간(분) (기본 60)
+- JWT_REFRESH_TOKEN_DAYS: 리프레시 토큰 유효 시간(일) (기본 14)
+- REVOKED_TOKEN_PURGE_INTERVAL: 만료된 폐기 기록 정리 주기(초) (기본 3600)
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import select, update
+
+from extensions import db, jwt
+from models import RevokedToken, User, utcnow
+from password_service import UNUSABLE_PASSWORD_HASH
+from upsert import insert_ignore
+
+logger = logging.getLogger(__name__)
+
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+
+def issue_tokens(user_id, token_version=0):
+    """새 액세스 토큰 + 리프레시 토큰 (token_version: 사용자의 현재 토큰 세대)"""
+    identity = str(user_id)
+    return {
+        "access_token": create_access_token(identity=identity),
+        "refresh_token": create_refresh_token(identity=identity, additional_claims={"ver": token_version}),
+    }
+
+
+def revoke_user_tokens(user_id):
+    """사용자의 리프레시 토큰 전부 폐기 (세대 +1, commit 은 호출한 쪽에서)
+
+    세션에 읽어 둔 User 의 token_version 도 새 값으로 갱신된다.
+    """
+    db.session.execute(
+        update(User)
+        .where(User.id == int(user_id))
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def revoke_token(jwt_payload):
+    """토큰 폐기 (commit 은 호출한 쪽에서)
+
+    반환값: 이번 호출로 폐기했으면 True, 이미 폐기된 토큰이면 False
+    """
+    revoked = insert_ignore(
+        RevokedToken,
+        [{
+            "jti": jwt_payload["jti"],
+            "user_id": int(jwt_payload["sub"]),
+            "expires_at": datetime.fromtimestamp(jwt_payload["exp"], timezone.utc),
+        }],
+        index_elements=[RevokedToken.jti],
+    ) == 1
+
+    _purge_expired_if_due()
+    return revoked
+
+
+def _purge_expired_if_due():
+    global _last_purge
+
+    interval = current_app.config["REVOKED_TOKEN_PURGE_INTERVAL"]
+    now = time.monotonic()
+    with _purge_lock:
+        if now - _last_purge < interval:
+            return
+        _last_purge = now
+
+    deleted = RevokedToken.query.filter(RevokedToken.expires_at < utcnow()).delete(synchronize_session=False)
+    if deleted:
+        logger.info("만료된 폐기 토큰 %d개 정리", deleted)
+
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(jwt_header, jwt_payload):
+    # 액세스 토큰은 수명이 짧으므로 폐기 목록을 조회하지 않는다
+    if jwt_payload.get("type") != "refresh":
+        return False
+
+    # 사용자 세대/해시 + 폐기 목록을 한 번에 조회
+    row = db.session.execute(
+        select(
+            User.token_version,
+            User.password_hash,
+            select(RevokedToken.jti).where(RevokedToken.jti == jwt_payload["jti"]).exists(),
+        ).where(User.id == int(jwt_payload["sub"]))
+    ).first()
+    if row is None:
+        # 탈퇴한 사용자
+        return True
+    token_version, password_hash, used = row
+    # '!' 로 시작하는 해시: 로그인할 수 없는 계정 (탈퇴 처리 중, 봇)
+    if password_hash.startswith(UNUSABLE_PASSWORD_HASH):
+        return True
+    return used or jwt_payload.get("ver", 0) != token_version
+
+
+def init_token_service(app):
+    app.config.setdefault(
+        "JWT_ACCESS_TOKEN_EXPIRES",
+        timedelta(minutes=int(os.getenv("JWT_ACCESS_TOKEN_MINUTES", "60"))),
+    )
+    app.config.setdefault(
+        "JWT_REFRESH_TOKEN_EXPIRES",
+        timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_DAYS", "14"))),
+    )
+    app.config.setdefault(
+        "REVOKED_TOKEN_PURGE_INTERVAL",
+        float(os.getenv("REVOKED_TOKEN_PURGE_INTERVAL", "3600")),
+    )
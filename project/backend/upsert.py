@@ -0,0 +1,112 @@
+"""
+DB 종류에 맞춘 INSERT ... ON CONFLICT
+
+PostgreSQL 과 SQLite 는 INSERT ... ON CONFLICT 한 문장으로 처리한다.
+DATABASE_URL 로 그 밖의 DB(MySQL 등)를 지정하면 ON CONFLICT 문법이 없으므로
+행마다 SAVEPOINT 안에서 INSERT 하고 유니크 위반(IntegrityError)이면 이미 있는 행으로 본다.
+
+- insert_ignore(): 이미 있는 행은 건너뛴다 (ON CONFLICT DO NOTHING)
+- upsert(): 이미 있는 행은 set_ 으로 갱신한다 (ON CONFLICT DO UPDATE)
+
+commit 은 모두 호출한 쪽에서.
+"""
+from sqlalchemy import and_, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+
+# upsert(set_=...) 에서 "INSERT 하려던 행의 값으로 덮어쓰기" 를 뜻하는 표시
+EXCLUDED = object()
+
+
+def _dialect_insert():
+    """ON CONFLICT 를 지원하는 DB 의 insert 생성자 (지원하지 않으면 None)"""
+    dialect = db.engine.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def _insert_in_savepoint(model, row, returning):
+    """INSERT 한 행 (유니크 위반이면 None), returning 이 있으면 그 컬럼 값"""
+    stmt = insert(model).values(**row)
+    if returning is not None:
+        stmt = stmt.returning(returning)
+    try:
+        with db.session.begin_nested():
+            result = db.session.execute(stmt)
+            return result.scalar_one() if returning is not None else result.rowcount
+    except IntegrityError:
+        return None
+
+
+def insert_ignore(model, rows, index_elements=None, returning=None):
+    """행 목록 INSERT, 유니크 충돌하는 행은 건너뜀
+
+    index_elements: 충돌 판단에 쓸 유니크 컬럼 (None 이면 모든 유니크 제약)
+    returning: 실제로 INSERT 된 행에서 돌려받을 컬럼 (동시 요청과 겹친 행은 빠진다)
+    반환값: returning 이 있으면 INSERT 된 행의 값 목록, 없으면 INSERT 된 행 수
+    """
+    rows = list(rows)
+    if not rows:
+        return [] if returning is not None else 0
+
+    dialect_insert = _dialect_insert()
+    if dialect_insert is None:
+        inserted = [_insert_in_savepoint(model, row, returning) for row in rows]
+        inserted = [value for value in inserted if value is not None]
+        return inserted if returning is not None else sum(inserted)
+
+    stmt = dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    if returning is not None:
+        # 파라미터 목록을 넘기면 여러 행 INSERT ... RETURNING 으로 묶어서 실행된다
+        return list(db.session.scalars(stmt.returning(returning), rows))
+    if len(rows) == 1:
+        return db.session.execute(stmt.values(**rows[0])).rowcount
+    return db.session.execute(stmt, rows).rowcount
+
+
+def upsert(model, rows, index_elements, set_):
+    """행 목록 INSERT, 유니크 충돌하는 행은 UPDATE
+
+    set_: {컬럼 이름: 값} - 값은 SQL 식(model.version + 1 등)이거나
+          EXCLUDED (INSERT 하려던 행의 값으로 덮어쓰기)
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    dialect_insert = _dialect_insert()
+    if dialect_insert is None:
+        for row in rows:
+            _upsert_without_on_conflict(model, row, index_elements, set_)
+        return
+
+    stmt = dialect_insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={
+            name: stmt.excluded[name] if value is EXCLUDED else value
+            for name, value in set_.items()
+        },
+    )
+    db.session.execute(stmt)
+
+
+def _upsert_without_on_conflict(model, row, index_elements, set_):
+    values = {name: row[name] if value is EXCLUDED else value for name, value in set_.items()}
+    condition = and_(*(column == row[column.key] for column in index_elements))
+
+    def update_existing():
+        return db.session.execute(
+            update(model).where(condition).values(**values).execution_options(synchronize_session=False)
+        ).rowcount
+
+    if update_existing():
+        return
+    if _insert_in_savepoint(model, row, None) is None:
+        # 동시 요청이 먼저 INSERT 함 (유니크 인덱스) → 그 행을 갱신
+        update_existing()
@@ -0,0 +1,89 @@
+"""
+JWT 인증 요청용 사용자 캐시
+
+대부분의 보호된 라우트는 get_jwt_identity() 다음에 User.query.get() 으로
+user_type(교수/학생) 만 확인한다. 권한 판단에 필요한 필드만 담은 스냅샷을
+요청 단위(g) + 워커 프로세스 단위(짧은 TTL)로 캐시해서 DB 왕복을 줄인다.
+
+- 스냅샷은 읽기 전용 CachedUser 이다. 수정이 필요한 라우트(프로필 수정 등)는 User 를 직접 조회한다.
+- update_profile / change_password / delete_account 는 commit 후 invalidate_user() 를 호출한다.
+  다른 워커 프로세스의 캐시는 TTL 이 지나야 갱신되므로 TTL 은 짧게 둔다.
+
+- USER_CACHE_TTL: 프로세스 캐시 유지 시간(초) (기본 30, 0 이면 요청 단위 캐시만 사용)
+- USER_CACHE_MAX_SIZE: 프로세스 캐시 최대 사용자 수 (기본 10000)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import current_app, g, has_app_context
+from flask_jwt_extended import get_jwt_identity
+
+from extensions import db
+from models import User
+
+CachedUser = namedtuple("CachedUser", ["id", "name", "student_id", "user_type", "profile_image"])
+
+_cache = OrderedDict()  # user_id -> (만료 시각, CachedUser)
+_cache_lock = threading.Lock()
+
+
+def _load(user_id):
+    row = db.session.query(
+        User.id, User.name, User.student_id, User.user_type, User.profile_image
+    ).filter(User.id == user_id).first()
+    return CachedUser(*row) if row else None
+
+
+def get_cached_user(user_id):
+    """사용자 스냅샷 (없는 사용자면 None)"""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    ttl = current_app.config["USER_CACHE_TTL"]
+    now = time.monotonic()
+
+    if ttl > 0:
+        with _cache_lock:
+            entry = _cache.get(user_id)
+            if entry is not None and entry[0] > now:
+                _cache.move_to_end(user_id)
+                return entry[1]
+
+    user = _load(user_id)
+
+    # 없는 사용자는 캐시하지 않는다 (가입 직후 조회 등)
+    if ttl > 0 and user is not None:
+        with _cache_lock:
+            _cache[user_id] = (now + ttl, user)
+            _cache.move_to_end(user_id)
+            while len(_cache) > current_app.config["USER_CACHE_MAX_SIZE"]:
+                _cache.popitem(last=False)
+    return user
+
+
+def current_user():
+    """현재 JWT 사용자 스냅샷 (@jwt_required() 라우트 안에서 사용, 요청 안에서는 한 번만 조회)"""
+    if "current_user" not in g:
+        g.current_user = get_cached_user(get_jwt_identity())
+    return g.current_user
+
+
+def invalidate_user(user_id):
+    with _cache_lock:
+        _cache.pop(int(user_id), None)
+    if has_app_context():
+        g.pop("current_user", None)
+
+
+def clear_user_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def init_user_cache(app):
+    app.config.setdefault("USER_CACHE_TTL", float(os.getenv("USER_CACHE_TTL", "30")))
+    app.config.setdefault("USER_CACHE_MAX_SIZE", int(os.getenv("USER_CACHE_MAX_SIZE", "10000")))
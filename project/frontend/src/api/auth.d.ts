@@ -26,6 +26,7 @@ export interface ResetPasswordData {
 export interface AuthResponse {
   status: number;
   access_token?: string;
+  refresh_token?: string;
   user?: any;
   message?: string;
   username?: string;
@@ -36,4 +37,6 @@ export function register(userData: UserData): Promise<AuthResponse>;
 export function login(credentials: LoginCredentials): Promise<AuthResponse>;
 export function findId(findIdData: FindIdData): Promise<AuthResponse>;
 export function resetPassword(resetData: ResetPasswordData): Promise<AuthResponse>;
+export function refreshTokens(refreshToken: string): Promise<AuthResponse>;
+export function logoutSession(refreshToken: string): Promise<void>;
 
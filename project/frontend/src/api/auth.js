@@ -127,4 +127,36 @@ export async function resetPassword(resetData) {
     console.error("비밀번호 찾기 API 오류:", error);
     return { message: "서버 오류가 발생했습니다.", status: 500 };
   }
-}
\ No newline at end of file
+}
+
+// ✅ 토큰 갱신 (리프레시 토큰으로 새 액세스/리프레시 토큰 발급, 비밀번호 불필요)
+export async function refreshTokens(refreshToken) {
+  try {
+    const res = await fetch(`${API_URL}/refresh`, {
+      method: "POST",
+      headers: { Authorization: `Bearer ${refreshToken}` },
+    });
+
+    const data = await res.json().catch(() => ({}));
+    return {
+      status: res.status,
+      ...data,
+    };
+  } catch (error) {
+    console.error("토큰 갱신 API 오류:", error);
+    return { message: "서버 오류가 발생했습니다.", status: 500 };
+  }
+}
+
+// ✅ 로그아웃 (리프레시 토큰 폐기)
+export async function logoutSession(refreshToken) {
+  try {
+    await fetch(`${API_URL}/logout`, {
+      method: "POST",
+      headers: { Authorization: `Bearer ${refreshToken}` },
+    });
+  } catch (error) {
+    // 서버에 알리지 못해도 로컬 로그아웃은 진행
+    console.error("로그아웃 API 오류:", error);
+  }
+}
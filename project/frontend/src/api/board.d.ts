@@ -55,5 +55,11 @@ export function deleteComment(comment_id: number): Promise<any>;
 export function toggleLike(post_id: number): Promise<any>;
 export function toggleCommentLike(comment_id: number): Promise<any>;
 export function votePoll(post_id: number, option_id: number): Promise<any>;
+export function getPollVoters(
+  post_id: number,
+  option_id: number,
+  page?: number,
+  per_page?: number
+): Promise<any>;
 export function togglePinPost(post_id: number): Promise<any>;
 
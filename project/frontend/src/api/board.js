@@ -220,6 +220,18 @@ export async function votePoll(post_id, option_id) {
   return res.json();
 }
 
+// 투표 옵션별 투표자 목록 (페이지 단위)
+export async function getPollVoters(post_id, option_id, page = 1, per_page = 20) {
+  const token = localStorage.getItem("accessToken") || localStorage.getItem("token");
+
+  const res = await fetch(`${BOARD_URL}/post/${post_id}/poll/options/${option_id}/voters?page=${page}&per_page=${per_page}`, {
+    method: "GET",
+    headers: { Authorization: `Bearer ${token}` }
+  });
+
+  return res.json();
+}
+
 // 게시물 고정/고정 해제
 export async function togglePinPost(post_id) {
   const token = localStorage.getItem("accessToken") || localStorage.getItem("token");
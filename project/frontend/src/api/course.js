@@ -107,6 +107,36 @@ export async function getAllCourses() {
   }
 }
 
+// 강의 카탈로그 조회 (검색 + 페이지 단위, 다음 페이지는 next_cursor 로 요청)
+export async function getCourseCatalog({ q = "", cursor = null, limit = 20 } = {}) {
+  const token = localStorage.getItem("accessToken") || localStorage.getItem("token");
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (q) params.set("q", q);
+  if (cursor) params.set("cursor", String(cursor));
+
+  try {
+    const res = await fetch(`${API_URL}/catalog?${params}`, {
+      method: "GET",
+      headers: {
+        Authorization: `Bearer ${token}`,
+        "Content-Type": "application/json",
+      },
+    });
+
+    if (!res.ok) {
+      if (res.status === 401) {
+        return { courses: [], next_cursor: null };
+      }
+      throw new Error(`HTTP ${res.status}`);
+    }
+
+    return await res.json();
+  } catch (err) {
+    console.error("강의 카탈로그 조회 실패:", err);
+    return { courses: [], next_cursor: null };
+  }
+}
+
 // 강의 참여 (학생)
 export async function enrollCourse(courseId) {
   const token = localStorage.getItem("accessToken") || localStorage.getItem("token");
@@ -132,6 +162,38 @@ export async function enrollCourse(courseId) {
   }
 }
 
+// 수강생 일괄 등록 (교수) - 학번 배열 또는 CSV 파일
+export async function bulkEnroll(courseId, roster) {
+  const token = localStorage.getItem("accessToken") || localStorage.getItem("token");
+  const isFile = typeof File !== "undefined" && roster instanceof File;
+  let body;
+  if (isFile) {
+    body = new FormData();
+    body.append("file", roster);
+  } else {
+    body = JSON.stringify({ student_ids: roster });
+  }
+
+  try {
+    const res = await fetch(`${API_URL}/${courseId}/enrollments/bulk`, {
+      method: "POST",
+      headers: isFile
+        ? { Authorization: `Bearer ${token}` }
+        : { Authorization: `Bearer ${token}`, "Content-Type": "application/json" },
+      body,
+    });
+
+    const data = await res.json();
+    if (!res.ok) {
+      throw new Error(data.message || `HTTP ${res.status}`);
+    }
+    return data;
+  } catch (err) {
+    console.error("수강생 일괄 등록 실패:", err);
+    throw err;
+  }
+}
+
 // 학생의 수강 강의 목록 조회
 export async function getEnrolledCourses() {
   const token = localStorage.getItem("accessToken") || localStorage.getItem("token");
@@ -66,6 +66,11 @@ export async function changePassword(currentPassword: string, newPassword: strin
     });
 
     const data = await res.json();
+    // 이전 리프레시 토큰은 모두 폐기되므로 새로 받은 토큰으로 교체
+    if (data.access_token && data.refresh_token) {
+      localStorage.setItem("accessToken", data.access_token);
+      localStorage.setItem("refreshToken", data.refresh_token);
+    }
     return data;
   } catch (error) {
     console.error("비밀번호 변경 오류:", error);
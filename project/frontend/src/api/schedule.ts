@@ -33,6 +33,34 @@ export const getSchedules = async (year: number | null = null, month: number | n
   }
 };
 
+// 기간 일정 조회 (여러 달, "YYYY-MM-DD")
+export const getSchedulesInRange = async (from: string, to: string) => {
+  try {
+    const params = new URLSearchParams({ from, to });
+    const response = await axios.get(`${SCHEDULE_URL}/?${params}`, {
+      headers: getAuthHeader(),
+    });
+    const data = response.data;
+    return Array.isArray(data) ? data : [];
+  } catch (error: any) {
+    console.error("기간 일정 조회 실패:", error);
+    return [];
+  }
+};
+
+// 캘린더 앱 구독 주소 (.ics)
+export const getScheduleFeedUrl = async () => {
+  try {
+    const response = await axios.get(`${SCHEDULE_URL}/feed`, {
+      headers: getAuthHeader(),
+    });
+    return response.data.url as string;
+  } catch (error) {
+    console.error("캘린더 구독 주소 조회 실패:", error);
+    throw error;
+  }
+};
+
 // 일정 생성
 export const createSchedule = async (scheduleData: {
   title: string;
@@ -1,6 +1,7 @@
 // src/contexts/AuthContext.tsx
 import { createContext, useContext, useEffect, useState, ReactNode } from "react";
 import { getProfile } from "../api/profile";
+import { refreshTokens, logoutSession } from "../api/auth";
 import { writeProfileImageToStorage, notifyProfileImageUpdated } from "../utils/profileImage";
 
 export interface LoggedInUser {
@@ -17,12 +18,63 @@ interface AuthContextValue {
   user: LoggedInUser | null;
   token: string | null;
   isLoading: boolean;
-  login: (user: LoggedInUser, token: string) => void;
+  login: (user: LoggedInUser, token: string, refreshToken?: string) => void;
   logout: () => void;
 }
 
 const AuthContext = createContext<AuthContextValue | undefined>(undefined);
 
+// 액세스 토큰 만료(exp) 이 시간 전에 미리 갱신 (유효 시간은 서버 설정을 따름)
+const TOKEN_REFRESH_MARGIN_MS = 5 * 60 * 1000;
+// 만료 시각을 읽을 수 없거나 갱신에 실패했을 때 다시 시도하는 간격
+const TOKEN_REFRESH_RETRY_MS = 60 * 1000;
+// setTimeout 최대 지연 (약 24.8일, 넘으면 바로 실행되므로 잘라서 예약)
+const MAX_TIMEOUT_MS = 2 ** 31 - 1;
+
+// 🔹 JWT 의 exp(초) → 만료 시각(ms), 읽을 수 없으면 null
+function getTokenExpiresAt(token: string): number | null {
+  try {
+    const payload = token.split(".")[1].replace(/-/g, "+").replace(/_/g, "/");
+    const { exp } = JSON.parse(atob(payload));
+    return typeof exp === "number" ? exp * 1000 : null;
+  } catch {
+    return null;
+  }
+}
+
+// 🔹 보낸 리프레시 토큰이 아직 저장되어 있을 때만 삭제 (그 사이 다른 탭이 회전시킨 토큰은 유지)
+function removeRefreshTokenIfUnchanged(sentToken: string | null) {
+  if (sentToken && localStorage.getItem("refreshToken") === sentToken) {
+    localStorage.removeItem("refreshToken");
+  }
+}
+
+// 🔹 리프레시 토큰으로 새 토큰 쌍 발급 (성공하면 새 액세스 토큰 반환)
+async function refreshSession(): Promise<string | null> {
+  const refreshToken = localStorage.getItem("refreshToken");
+  if (!refreshToken) {
+    return null;
+  }
+
+  const data = await refreshTokens(refreshToken);
+  if (!data.access_token || !data.refresh_token) {
+    // 만료/폐기된 리프레시 토큰은 더 이상 쓸 수 없음
+    if (data.status === 401 || data.status === 422) {
+      // 다른 탭이 먼저 회전시켰으면 (보낸 토큰이 이미 폐기됨) 그 탭이 저장한 새 토큰을 사용
+      const storedToken = localStorage.getItem("refreshToken");
+      if (storedToken && storedToken !== refreshToken) {
+        return localStorage.getItem("accessToken");
+      }
+      removeRefreshTokenIfUnchanged(refreshToken);
+    }
+    return null;
+  }
+
+  localStorage.setItem("accessToken", data.access_token);
+  localStorage.setItem("refreshToken", data.refresh_token);
+  return data.access_token;
+}
+
 export function AuthProvider({ children }: { children: ReactNode }) {
   const [user, setUser] = useState<LoggedInUser | null>(null);
   const [token, setToken] = useState<string | null>(null);
@@ -34,6 +86,8 @@ export function AuthProvider({ children }: { children: ReactNode }) {
       // 먼저 currentUser를 확인하고, 없으면 user 키도 확인 (기존 호환성)
       let savedUser = localStorage.getItem("currentUser");
       let savedToken = localStorage.getItem("accessToken");
+      // 이 탭이 마지막으로 쓴 리프레시 토큰 (정리할 때 다른 탭이 회전시킨 토큰은 지우지 않도록)
+      let savedRefreshToken = localStorage.getItem("refreshToken");
 
       // currentUser가 없으면 user 키 확인
       if (!savedUser) {
@@ -53,7 +107,17 @@ export function AuthProvider({ children }: { children: ReactNode }) {
           const userData = JSON.parse(savedUser);
           
           // 🔹 백엔드에서 토큰 유효성 검증
-          const profileData = await getProfile();
+          let profileData = await getProfile();
+
+          // 액세스 토큰이 만료되었으면 리프레시 토큰으로 갱신 후 다시 확인 (재로그인 없이)
+          if (profileData.error === "UNAUTHORIZED") {
+            const refreshedToken = await refreshSession();
+            if (refreshedToken) {
+              savedToken = refreshedToken;
+              savedRefreshToken = localStorage.getItem("refreshToken");
+              profileData = await getProfile();
+            }
+          }
           
           // 에러가 발생하면 (토큰 무효, 네트워크 오류 등) 로그아웃 처리
           if (profileData.error) {
@@ -61,6 +125,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
             // 인증 관련 localStorage 모두 정리
             localStorage.removeItem("currentUser");
             localStorage.removeItem("accessToken");
+            removeRefreshTokenIfUnchanged(savedRefreshToken);
             localStorage.removeItem("user");
             localStorage.removeItem("token");
             localStorage.removeItem("pendingCourseJoin");
@@ -97,6 +162,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
           console.error("저장된 사용자 정보를 읽을 수 없습니다.", e);
           localStorage.removeItem("currentUser");
           localStorage.removeItem("accessToken");
+          removeRefreshTokenIfUnchanged(savedRefreshToken);
           localStorage.removeItem("user");
           localStorage.removeItem("token");
         }
@@ -109,11 +175,50 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     validateSession();
   }, []);
 
-  const login = (userData: LoggedInUser, token: string) => {
+  // 🔹 로그인 상태에서는 액세스 토큰이 만료되기 전에 갱신 (토큰의 exp 기준으로 예약)
+  useEffect(() => {
+    if (!user || !token) {
+      return;
+    }
+
+    let cancelled = false;
+    let timer: ReturnType<typeof setTimeout>;
+    const schedule = (delay: number) => {
+      timer = setTimeout(run, Math.min(Math.max(0, delay), MAX_TIMEOUT_MS));
+    };
+    const run = async () => {
+      const refreshedToken = await refreshSession();
+      if (cancelled) {
+        return;
+      }
+      if (refreshedToken && refreshedToken !== token) {
+        // 새 토큰으로 바뀌면 이 effect 가 다시 실행되어 다음 갱신을 예약한다
+        setToken(refreshedToken);
+      } else {
+        // 네트워크 오류 등으로 실패하면 잠시 후 다시 시도
+        schedule(TOKEN_REFRESH_RETRY_MS);
+      }
+    };
+
+    const expiresAt = getTokenExpiresAt(token);
+    schedule(expiresAt === null ? TOKEN_REFRESH_RETRY_MS : expiresAt - Date.now() - TOKEN_REFRESH_MARGIN_MS);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [user, token]);
+
+  const login = (userData: LoggedInUser, token: string, refreshToken?: string) => {
     setUser(userData);
     setToken(token);
     localStorage.setItem("currentUser", JSON.stringify(userData));
     localStorage.setItem("accessToken", token);
+    if (refreshToken) {
+      localStorage.setItem("refreshToken", refreshToken);
+    } else {
+      localStorage.removeItem("refreshToken");
+    }
     
     // 프로필 이미지 localStorage에 저장 및 이벤트 발송
     if (userData.profile_image) {
@@ -132,11 +237,18 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   };
 
   const logout = () => {
+    // 서버에 리프레시 토큰 폐기 요청 (응답을 기다리지 않음)
+    const refreshToken = localStorage.getItem("refreshToken");
+    if (refreshToken) {
+      logoutSession(refreshToken);
+    }
+
     setUser(null);
     setToken(null);
     // 인증 관련 localStorage 모두 정리
     localStorage.removeItem("currentUser");
     localStorage.removeItem("accessToken");
+    localStorage.removeItem("refreshToken");
     localStorage.removeItem("token");
     localStorage.removeItem("user");
     localStorage.removeItem("pendingCourseJoin");
@@ -48,7 +48,7 @@ export default function CourseJoinLoginPage({
         console.log("✅ 로그인 성공:", data);
         
         // AuthContext에 저장
-        saveLogin(data.user, data.access_token);
+        saveLogin(data.user, data.access_token, data.refresh_token);
         
         // 사용자 타입 확인 - 학생만 강의 참여 가능
         const userType = data.user.user_type;
@@ -74,7 +74,7 @@ export default function LoginPage({ onNavigate, returnToCourseJoin = false }: Lo
     if (data.access_token) {
       console.log("✅ 로그인 성공:", data);
 
-      saveLogin(data.user, data.access_token);
+      saveLogin(data.user, data.access_token, data.refresh_token);
       
       // 사용자 이름 기억하기 처리
       if (rememberMe) {